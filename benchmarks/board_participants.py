@@ -0,0 +1,115 @@
+"""
+Бенчмарк обновления участников доски: пересоздание всего списка (прежняя реализация
+BoardWithParticipantsSerializer.update) против синхронизации по разнице.
+
+Запуск (нужен PostgreSQL из настроек проекта, данные создаются во временной тестовой БД):
+    python -m benchmarks.board_participants --participants 500 5000
+"""
+import argparse
+import random
+import time
+
+from benchmarks.utils import setup_django, test_database
+
+setup_django()
+
+from django.db import connection, transaction  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from core.models import User  # noqa: E402
+from goals.models import Board, BoardParticipant  # noqa: E402
+from goals.serializers import BoardWithParticipantsSerializer  # noqa: E402
+
+
+def recreate_participants(board: Board, participants: list[dict], user: User) -> None:
+    BoardParticipant.objects.filter(board=board).exclude(user=user).delete()
+    BoardParticipant.objects.bulk_create(
+        [BoardParticipant(board=board, user=item['user'], role=item['role']) for item in participants],
+        ignore_conflicts=True,
+    )
+
+
+def seed_board(size: int) -> tuple[Board, User, list[User]]:
+    """
+    Доска с владельцем и size читателями, плюс столько же пользователей вне доски.
+    """
+    prefix = f'bench_{size}_'
+    User.objects.bulk_create(User(username=f'{prefix}{index}', password='') for index in range(2 * size + 1))
+    users = list(User.objects.filter(username__startswith=prefix).order_by('id'))
+    owner, members = users[0], users[1:]
+    board = Board.objects.create(title=f'Board {size}')
+    BoardParticipant.objects.create(board=board, user=owner, role=BoardParticipant.Role.owner)
+    BoardParticipant.objects.bulk_create(
+        BoardParticipant(board=board, user=member, role=BoardParticipant.Role.reader) for member in members[:size]
+    )
+    return board, owner, members
+
+
+def scenarios(members: list[User], size: int) -> dict[str, list[dict]]:
+    current = [{'user': member, 'role': BoardParticipant.Role.reader} for member in members[:size]]
+    step = max(size // 100, 1)
+
+    role_change = [dict(item) for item in current]
+    for item in role_change[::100]:
+        item['role'] = BoardParticipant.Role.writer
+
+    # 10% участников заменяются новыми
+    churn = current[size // 10:] + [
+        {'user': member, 'role': BoardParticipant.Role.reader} for member in members[size:size + size // 10]
+    ]
+    random.shuffle(churn)
+
+    return {
+        'title only': current,
+        f'{len(role_change[::100])} role changes': role_change,
+        f'{size // 10} replaced': churn,
+        f'{step} added': current + [{'user': member, 'role': 3} for member in members[size:size + step]],
+    }
+
+
+def measure(update, board: Board, owner: User, participants: list[dict]) -> tuple[float, int, int]:
+    """
+    Замер одного обновления с откатом транзакции, чтобы все варианты начинались с одного состояния.
+    :return: Время, количество запросов и количество участников с новым created.
+    """
+    with transaction.atomic():
+        before = dict(BoardParticipant.objects.filter(board=board).values_list('user_id', 'created'))
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            update(board, participants, owner)
+            elapsed = time.perf_counter() - start
+        after = dict(BoardParticipant.objects.filter(board=board).values_list('user_id', 'created'))
+        transaction.set_rollback(True)
+
+    churned = sum(1 for user_id, created in after.items() if before.get(user_id) != created)
+    return elapsed, len(context.captured_queries), churned
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--participants', type=int, nargs='+', default=[500, 5000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    implementations = {
+        'recreate': recreate_participants,
+        'diff': BoardWithParticipantsSerializer.update_participants,
+    }
+
+    with test_database():
+        for size in args.participants:
+            board, owner, members = seed_board(size)
+            print(f'\n=== {size} participants')
+            for scenario, participants in scenarios(members, size).items():
+                for name, update in implementations.items():
+                    results = [measure(update, board, owner, participants) for _ in range(args.repeat)]
+                    elapsed = min(result[0] for result in results)
+                    _, queries, churned = results[0]
+                    print(
+                        f'{scenario:>18} {name:>8}: {elapsed * 1000:8.1f} ms, '
+                        f'{queries:3d} queries, {churned:5d} rows with new "created"'
+                    )
+
+
+if __name__ == '__main__':
+    main()
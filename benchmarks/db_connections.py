@@ -0,0 +1,76 @@
+"""
+Бенчмарк стоимости соединения с БД на запрос: новое соединение на каждый запрос (CONN_MAX_AGE=0),
+постоянное соединение потока (CONN_MAX_AGE > 0) и общий пул потоков (POSTGRES_POOL_SIZE).
+
+Запуск (нужен PostgreSQL из настроек проекта, используется временная тестовая БД):
+    python -m benchmarks.db_connections --requests 500 --threads 8
+"""
+import argparse
+import threading
+import time
+from statistics import median
+
+from benchmarks.utils import setup_django, test_database
+
+setup_django()
+
+from django.db import connection  # noqa: E402
+from django.db.backends.postgresql.base import DatabaseWrapper  # noqa: E402
+
+from todolist.db.base import DatabaseWrapper as PooledDatabaseWrapper  # noqa: E402
+from todolist.db.pool import close_pool  # noqa: E402
+
+
+def run(wrapper_class, settings_dict: dict, requests: int, threads: int) -> list[float]:
+    """
+    Имитация запросов: каждый поток выполняет SELECT 1 и закрывает соединение как в конце HTTP-запроса.
+    :return: Время запросов в секундах.
+    """
+    timings, lock = [], threading.Lock()
+
+    def worker() -> None:
+        wrapper = wrapper_class(settings_dict, alias='bench')
+        local = []
+        for _ in range(requests // threads):
+            start = time.perf_counter()
+            with wrapper.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            wrapper.close_if_unusable_or_obsolete()
+            local.append(time.perf_counter() - start)
+        wrapper.close()
+        with lock:
+            timings.extend(local)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    close_pool('bench')
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    with test_database():
+        base = {**connection.settings_dict, 'CONN_HEALTH_CHECKS': True}
+        variants = {
+            'new connection': (DatabaseWrapper, {**base, 'CONN_MAX_AGE': 0}),
+            'persistent': (DatabaseWrapper, {**base, 'CONN_MAX_AGE': 60}),
+            f'pool of {max(args.threads // 2, 1)}': (
+                PooledDatabaseWrapper, {**base, 'CONN_MAX_AGE': 0, 'POOL_SIZE': max(args.threads // 2, 1)}
+            ),
+        }
+        connection.close()
+        for name, (wrapper_class, settings_dict) in variants.items():
+            timings = run(wrapper_class, settings_dict, args.requests, args.threads)
+            throughput = len(timings) / sum(timings) * args.threads
+            print(f'{name:>16}: p50 {median(timings) * 1000:6.2f} ms, {throughput:8.0f} req/s')
+
+
+if __name__ == '__main__':
+    main()
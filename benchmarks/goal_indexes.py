@@ -0,0 +1,90 @@
+"""
+Бенчмарк индексов goals: планы запросов списков с индексами из Meta.indexes и без них.
+
+Запуск (нужен PostgreSQL из настроек проекта, данные создаются во временной тестовой БД):
+    python -m benchmarks.goal_indexes --goals 1000000 [--keepdb] [--verbose]
+"""
+import argparse
+import re
+
+from benchmarks.utils import seed_goals, setup_django, test_database, timer
+
+setup_django()
+
+from django.db import connection, transaction  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment  # noqa: E402
+
+PLAN_NODE = re.compile(r'(Scan|Sort|Limit|Nested Loop|Hash Join|Execution Time)')
+
+
+def query_shapes() -> dict:
+    """
+    Запросы в том виде, в котором их выполняют представления goals.
+    """
+    owners = BoardParticipant.objects.filter(role=BoardParticipant.Role.owner).order_by('user_id')
+    user_id = owners.values_list('user_id', flat=True)[owners.count() // 2]
+    board_ids = list(BoardParticipant.objects.filter(user_id=user_id).values_list('board_id', flat=True))
+    category_id = GoalCategory.objects.filter(board_id__in=board_ids, is_deleted=False).values_list('id', flat=True)[0]
+    goal_id = GoalComment.objects.filter(goal__category_id=category_id).values_list('goal_id', flat=True)[0]
+
+    goals = Goal.objects.select_related('user').filter(
+        category__board_id__in=board_ids, category__is_deleted=False
+    ).exclude(status=Goal.Status.archived)
+
+    return {
+        'board roles': BoardParticipant.objects.filter(user_id=user_id).values_list('board_id', 'role'),
+        'board list': Board.objects.filter(id__in=board_ids).exclude(is_deleted=True).order_by('title', 'id')[:20],
+        'category list': GoalCategory.objects.filter(board_id__in=board_ids).exclude(is_deleted=True)
+        .order_by('title', 'id')[:20],
+        'goal list': goals.order_by('title', 'id')[:20],
+        'goal list by category': goals.filter(category_id=category_id).order_by('title', 'id')[:20],
+        'goal list by status': goals.filter(category_id=category_id, status__in=[1, 2], priority__in=[3, 4])[:20],
+        'overdue goals': goals.filter(due_date__lt=timezone.now().date()).order_by('due_date')[:20],
+        'comment list': GoalComment.objects.select_related('user').filter(goal_id=goal_id)
+        .order_by('-created', '-id')[:20],
+    }
+
+
+def explain_all(verbose: bool) -> None:
+    for name, queryset in query_shapes().items():
+        plan = queryset.explain(analyze=True)
+        lines = plan.splitlines() if verbose else [line for line in plan.splitlines() if PLAN_NODE.search(line)]
+        print(f'-- {name}')
+        print('\n'.join(lines))
+
+
+def drop_indexes() -> None:
+    with connection.schema_editor(atomic=False) as schema_editor:
+        for model in (Board, BoardParticipant, GoalCategory, Goal, GoalComment):
+            for index in model._meta.indexes:
+                schema_editor.remove_index(model, index)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--goals', type=int, default=1_000_000)
+    parser.add_argument('--keepdb', action='store_true', help='Reuse a previously seeded test database.')
+    parser.add_argument('--verbose', action='store_true', help='Print full query plans.')
+    args = parser.parse_args()
+
+    with test_database(keepdb=args.keepdb):
+        if not Goal.objects.exists():
+            with timer(f'Seeding ~{args.goals} goals'):
+                seed_goals(args.goals)
+        print(f'Goals: {Goal.objects.count()}, comments: {GoalComment.objects.count()}')
+
+        # DDL в PostgreSQL транзакционный: индексы удаляются только на время замера
+        with transaction.atomic():
+            drop_indexes()
+            print('\n=== Without indexes')
+            explain_all(args.verbose)
+            transaction.set_rollback(True)
+
+        print('\n=== With indexes')
+        explain_all(args.verbose)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Бенчмарк сериализации страницы списка целей: GoalWithUserSerializer по объектам моделей
+(с пустым кешем представлений) против ValuesReader по строкам .values() без кеша и с заполненным кешем представлений.
+
+Запуск (нужен PostgreSQL из настроек проекта, данные создаются во временной тестовой БД):
+    python -m benchmarks.list_serialization --goals 10000
+"""
+import argparse
+import time
+
+from benchmarks.utils import seed_goals, setup_django, test_database
+
+setup_django()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from goals.cache import representation_cache  # noqa: E402
+from goals.models import Goal  # noqa: E402
+from goals.readers import get_values_reader  # noqa: E402
+from goals.serializers import GoalWithUserSerializer  # noqa: E402
+
+
+def with_serializer(queryset) -> list[dict]:
+    representation_cache.clear()
+    return GoalWithUserSerializer(queryset.select_related('user'), many=True).data
+
+
+def with_reader(queryset) -> list[dict]:
+    reader = get_values_reader(GoalWithUserSerializer)
+    return [reader.to_representation(row) for row in reader.values(queryset)]
+
+
+def with_cached_reader(queryset) -> list[dict]:
+    reader = get_values_reader(GoalWithUserSerializer)
+    return [reader.cached_representation(row) for row in reader.values(queryset)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--goals', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with test_database():
+        seed_goals(args.goals)
+        queryset = Goal.objects.order_by('id')[:args.goals]
+        rendered = {}
+        variants = (
+            ('serializer', with_serializer), ('values reader', with_reader), ('cached reader', with_cached_reader),
+        )
+        for name, read in variants:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                data = read(queryset)
+                timings.append(time.perf_counter() - start)
+            rendered[name] = JSONRenderer().render(data)
+            elapsed = min(timings)
+            print(f'{name:>14}: {len(data)} rows, {elapsed * 1000:8.1f} ms, {len(data) / elapsed:10.0f} rows/s')
+
+        print('Output identical:', len(set(rendered.values())) == 1)
+
+
+if __name__ == '__main__':
+    main()
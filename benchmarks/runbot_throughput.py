@@ -0,0 +1,150 @@
+"""
+Бенчмарк пропускной способности runbot на локальном фейковом сервере Telegram API.
+Сравнивается последовательная обработка обновлений и ChatDispatcher с разным числом потоков.
+
+Запуск (нужен PostgreSQL из настроек проекта, данные создаются во временной тестовой БД):
+    python -m benchmarks.runbot_throughput --chats 50 --messages 4 --latency 0.05 --workers 1 4 16
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.utils import setup_django, test_database
+
+setup_django()
+
+from bot.dispatcher import ChatDispatcher  # noqa: E402
+from bot.management.commands.runbot import Command  # noqa: E402
+from bot.models import TgUser  # noqa: E402
+from bot.outbox import OutboundQueue  # noqa: E402
+from bot.tg.client import TgClient  # noqa: E402
+from goals.models import Board, BoardParticipant, Goal, GoalCategory  # noqa: E402
+from tests.factories import UserFactory  # noqa: E402
+
+TOKEN = 'bench'
+
+
+class FakeTelegram(ThreadingHTTPServer):
+    """
+    Фейковый Telegram API: отдает заранее подготовленные обновления и отвечает на sendMessage с задержкой.
+    """
+    daemon_threads = True
+
+    def __init__(self, latency: float):
+        super().__init__(('127.0.0.1', 0), FakeTelegramHandler)
+        self.latency = latency
+        self.updates: list[dict] = []
+        self.replies: list[int] = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_port}'
+
+
+class FakeTelegramHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server: FakeTelegram
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        method = url.path.rsplit('/', 1)[-1]
+
+        if method == 'getUpdates':
+            offset = int(params.get('offset', 0))
+            body = {'ok': True, 'result': [item for item in self.server.updates if item['update_id'] >= offset]}
+        else:
+            time.sleep(self.server.latency)
+            chat_id = int(params['chat_id'])
+            with self.server.lock:
+                self.server.replies.append(chat_id)
+            body = {'ok': True, 'result': {'message_id': 1, 'chat': {'id': chat_id}, 'text': params['text']}}
+
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def seed_chats(chats: int) -> None:
+    for chat_id in range(1, chats + 1):
+        user = UserFactory()
+        board = Board.objects.create(title=f'Board {chat_id}')
+        BoardParticipant.objects.create(user=user, board=board, role=BoardParticipant.Role.owner)
+        category = GoalCategory.objects.create(title='Category', user=user, board=board)
+        Goal.objects.bulk_create(Goal(title=f'Goal {i}', user=user, category=category) for i in range(10))
+        TgUser.objects.create(chat_id=chat_id, username=f'chat{chat_id}', user=user)
+
+
+def make_updates(chats: int, messages: int) -> list[dict]:
+    updates = []
+    for index in range(messages):
+        for chat_id in range(1, chats + 1):
+            update_id = len(updates) + 1
+            updates.append({
+                'update_id': update_id,
+                'message': {'message_id': update_id, 'chat': {'id': chat_id}, 'text': '/goals'},
+            })
+    return updates
+
+
+def run(server: FakeTelegram, workers: int | None) -> float:
+    server.replies.clear()
+    command = Command()
+    command.tg_client = TgClient(token=TOKEN, api_url=server.url, pool_size=workers or 1)
+    # Без ограничений частоты: измеряется обработка, а не лимиты Telegram
+    command.outbox = OutboundQueue(command.tg_client, workers=workers or 1, global_rate=0, chat_interval=0)
+
+    start = time.perf_counter()
+    updates = command.tg_client.get_updates(offset=0)
+    if workers is None:
+        for item in updates.result:
+            command.handle_message(item.message)
+    else:
+        dispatcher = ChatDispatcher(command.handle_message, workers=workers)
+        for item in updates.result:
+            dispatcher.submit(item.message)
+        dispatcher.shutdown()
+    command.outbox.close()
+    elapsed = time.perf_counter() - start
+
+    # Ответы одному чату, накопившиеся в очереди, склеиваются в одно сообщение
+    chats = {item['message']['chat']['id'] for item in server.updates}
+    assert set(server.replies) == chats, 'Not every chat got a reply'
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chats', type=int, default=50)
+    parser.add_argument('--messages', type=int, default=4, help='Messages per chat.')
+    parser.add_argument('--latency', type=float, default=0.05, help='sendMessage latency, seconds.')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16])
+    args = parser.parse_args()
+
+    server = FakeTelegram(latency=args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.updates = make_updates(args.chats, args.messages)
+
+    with test_database():
+        seed_chats(args.chats)
+        total = len(server.updates)
+        for label, workers in [('sequential', None)] + [(f'{n} workers', n) for n in args.workers]:
+            elapsed = run(server, workers)
+            print(f'{label:>12}: {total} updates in {elapsed:.2f}s, {total / elapsed:.1f} updates/s')
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""
+Нагрузочный бенчмарк API: запросов в секунду и задержки при запуске через runserver и через gunicorn
+(gunicorn.conf.py) с разным числом процессов и потоков.
+
+Запуск (нужен PostgreSQL из настроек проекта, данные создаются во временной тестовой БД):
+    python -m benchmarks.serving --goals 10000 --concurrency 16 --duration 10 --gunicorn 1x1 4x1 4x4
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from statistics import quantiles
+
+import requests
+
+from benchmarks.utils import seed_goals, setup_django, test_database
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY  # noqa: E402
+from django.contrib.sessions.backends.db import SessionStore  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from core.models import User  # noqa: E402
+
+URLS = ['/goals/goal/list?limit=20', '/goals/board/list', '/goals/goal_category/list?limit=20']
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def create_session(user: User) -> str:
+    session = SessionStore()
+    session[SESSION_KEY] = str(user.pk)
+    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[-1]
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.save()
+    return session.session_key
+
+
+def start_server(name: str, port: int) -> subprocess.Popen:
+    """
+    Запуск сервера на тестовой БД: дочерний процесс получает ее имя через POSTGRES_DB.
+    :param name: runserver или WORKERSxTHREADS для gunicorn.
+    :param port:
+    :return:
+    """
+    env = {**os.environ, 'POSTGRES_DB': connection.settings_dict['NAME'], 'GUNICORN_ACCESS_LOG': ''}
+    if name == 'runserver':
+        command = [sys.executable, 'manage.py', 'runserver', f'127.0.0.1:{port}', '--noreload']
+    else:
+        workers, threads = name.split('x')
+        command = [
+            sys.executable, '-m', 'gunicorn', 'todolist.wsgi:application',
+            '--bind', f'127.0.0.1:{port}', '--workers', workers, '--threads', threads,
+        ]
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f'http://127.0.0.1:{port}/goals/board/list', timeout=10)
+            return process
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f'{name} did not start')
+
+
+def load(port: int, session_key: str, concurrency: int, duration: float) -> tuple[int, int, list[float]]:
+    """
+    Нагрузка сервера concurrency клиентами с keep-alive в течение duration секунд.
+    :return: Успешные ответы, ошибки и задержки успешных ответов.
+    """
+    deadline = time.monotonic() + duration
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def client(index: int) -> None:
+        session = requests.Session()
+        session.cookies.set(settings.SESSION_COOKIE_NAME, session_key)
+        local, failed, number = [], 0, index
+        while time.monotonic() < deadline:
+            url = f'http://127.0.0.1:{port}{URLS[number % len(URLS)]}'
+            number += 1
+            start = time.perf_counter()
+            try:
+                ok = session.get(url, timeout=30).status_code == 200
+            except requests.RequestException:
+                ok = False
+            if ok:
+                local.append(time.perf_counter() - start)
+            else:
+                failed += 1
+        with lock:
+            latencies.extend(local)
+            errors.append(failed)
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(latencies), sum(errors), latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--goals', type=int, default=10000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--gunicorn', nargs='+', default=['1x1', '4x1', '4x4'], help='WORKERSxTHREADS')
+    args = parser.parse_args()
+
+    with test_database():
+        seed_goals(args.goals)
+        session_key = create_session(User.objects.get(username='bench_user_1'))
+        # Серверы открывают свои соединения с тестовой БД, ее нельзя будет удалить при открытом соединении
+        connection.close()
+
+        for name in ['runserver', *args.gunicorn]:
+            port = free_port()
+            process = start_server(name, port)
+            try:
+                load(port, session_key, args.concurrency, 1)
+                done, failed, latencies = load(port, session_key, args.concurrency, args.duration)
+            finally:
+                process.terminate()
+                process.wait(timeout=60)
+            p50, p95 = (0, 0)
+            if len(latencies) > 1:
+                p50, p95 = (quantiles(latencies, n=20)[index] * 1000 for index in (9, 18))
+            label = name if name == 'runserver' else f'gunicorn {name}'
+            print(
+                f'{label:>16}: {done / args.duration:8.1f} req/s, p50 {p50:6.1f} ms, p95 {p95:6.1f} ms, '
+                f'{failed} errors'
+            )
+
+
+if __name__ == '__main__':
+    main()
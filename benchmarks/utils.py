@@ -0,0 +1,109 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+import django
+
+
+def setup_django() -> None:
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
+    django.setup()
+    # Логи запросов (DEBUG=True) искажают замеры
+    logging.disable(logging.INFO)
+
+
+@contextmanager
+def test_database(keepdb: bool = False):
+    """
+    Временная тестовая БД на сервере из настроек проекта: рабочие данные бенчмарк не затрагивает.
+    :param keepdb: Не удалять БД после запуска, чтобы повторные запуски не заполняли ее заново.
+    """
+    from django.test.utils import setup_databases, teardown_databases
+
+    old_config = setup_databases(verbosity=1, interactive=False, keepdb=keepdb)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=1, keepdb=keepdb)
+
+
+@contextmanager
+def timer(label: str):
+    start = time.perf_counter()
+    yield
+    print(f'{label}: {time.perf_counter() - start:.2f}s')
+
+
+def seed_goals(goals: int, categories_per_board: int = 10, goals_per_category: int = 100) -> None:
+    """
+    Заполнение БД пользователями, досками, категориями, целями и комментариями средствами SQL (PostgreSQL).
+    Каждый пользователь владеет одной доской и читает девять соседних.
+    :param goals: Примерное количество целей.
+    :param categories_per_board:
+    :param goals_per_category:
+    """
+    from django.db import connection
+
+    from core.models import User
+    from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+
+    boards = max(goals // (categories_per_board * goals_per_category), 1)
+    tables = {
+        'user': User._meta.db_table,
+        'board': Board._meta.db_table,
+        'participant': BoardParticipant._meta.db_table,
+        'category': GoalCategory._meta.db_table,
+        'goal': Goal._meta.db_table,
+        'comment': GoalComment._meta.db_table,
+    }
+    numbered = 'SELECT id, row_number() OVER (ORDER BY id) AS rn FROM {table}'
+
+    statements = [
+        f"""
+        INSERT INTO {tables['user']}
+            (password, is_superuser, username, first_name, last_name, email, is_staff, is_active, date_joined)
+        SELECT '', false, 'bench_user_' || i, '', '', '', false, true, now()
+        FROM generate_series(1, {boards}) AS i
+        """,
+        f"""
+        INSERT INTO {tables['board']} (title, is_deleted, created, updated)
+        SELECT 'Board ' || i, i % 20 = 0, now(), now()
+        FROM generate_series(1, {boards}) AS i
+        """,
+        f"""
+        INSERT INTO {tables['participant']} (board_id, user_id, role, created, updated)
+        SELECT b.id, u.id, CASE WHEN b.rn = u.rn THEN 1 ELSE 3 END, now(), now()
+        FROM ({numbered.format(table=tables['board'])}) AS b
+        JOIN ({numbered.format(table=tables['user'])}) AS u ON b.rn BETWEEN u.rn AND u.rn + 9
+        """,
+        f"""
+        INSERT INTO {tables['category']} (board_id, user_id, title, is_deleted, created, updated)
+        SELECT p.board_id, p.user_id, 'Category ' || i, i % 10 = 0, now(), now()
+        FROM {tables['participant']} AS p
+        CROSS JOIN generate_series(1, {categories_per_board}) AS i
+        WHERE p.role = 1
+        """,
+        f"""
+        INSERT INTO {tables['goal']}
+            (category_id, user_id, title, description, due_date, status, priority, created, updated)
+        SELECT c.id, c.user_id, 'Goal ' || (random() * 10000)::int, '',
+               CASE WHEN i % 3 = 0 THEN NULL ELSE current_date + (i % 90 - 45) END,
+               1 + i % 4, 1 + (i / 4) % 4, now() - random() * interval '365 days', now()
+        FROM {tables['category']} AS c
+        CROSS JOIN generate_series(1, {goals_per_category}) AS i
+        """,
+        f"""
+        INSERT INTO {tables['comment']} (goal_id, user_id, text, created, updated)
+        SELECT g.id, g.user_id, 'Comment ' || i, now() - random() * interval '365 days', now()
+        FROM {tables['goal']} AS g
+        CROSS JOIN generate_series(1, 3) AS i
+        WHERE random() < 0.2
+        """,
+    ]
+
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+        for table in tables.values():
+            cursor.execute(f'ANALYZE {table}')
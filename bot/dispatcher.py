@@ -0,0 +1,75 @@
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from django.db import InterfaceError, OperationalError, close_old_connections, connection
+
+from bot.tg.schemas import Message
+
+logger = logging.getLogger(__name__)
+
+
+class ChatDispatcher:
+    """
+    Диспетчер обработки сообщений в пуле потоков.
+    Сообщения разных чатов обрабатываются параллельно, сообщения одного чата - строго по очереди.
+    """
+
+    def __init__(self, handler: Callable[[Message], None], workers: int = 8):
+        self.handler = handler
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='runbot')
+        self.pending: dict[int, deque[Message]] = {}
+        self.lock = threading.Lock()
+
+    def submit(self, message: Message) -> None:
+        """
+        Метод постановки сообщения в очередь его чата.
+        Если чат уже обрабатывается, сообщение будет взято тем же потоком после текущего.
+        :param message:
+        :return:
+        """
+        chat_id = message.chat.id
+        with self.lock:
+            if chat_id in self.pending:
+                self.pending[chat_id].append(message)
+                return
+            self.pending[chat_id] = deque()
+        self.executor.submit(self._process_chat, chat_id, message)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Метод остановки диспетчера.
+        :param wait: Дождаться обработки всех принятых сообщений.
+        :return:
+        """
+        self.executor.shutdown(wait=wait)
+
+    def _process_chat(self, chat_id: int, message: Message) -> None:
+        while True:
+            try:
+                self._handle(message)
+            except Exception:
+                logger.exception('Failed to handle message %s from chat %s', message.message_id, chat_id)
+            finally:
+                close_old_connections()
+
+            with self.lock:
+                queue = self.pending[chat_id]
+                if not queue:
+                    del self.pending[chat_id]
+                    return
+                message = queue.popleft()
+
+    def _handle(self, message: Message) -> None:
+        try:
+            self.handler(message)
+        except (InterfaceError, OperationalError):
+            if connection.connection is not None and connection.is_usable():
+                raise
+            # Соединение потока с БД разорвано (например, PostgreSQL перезапущен, пока бот ждал сообщений):
+            # оно закрывается, и сообщение обрабатывается повторно с новым соединением
+            logger.warning('Database connection lost, retrying message %s', message.message_id)
+            connection.close()
+            self.handler(message)
@@ -1,9 +1,11 @@
-import json
-
+from django.conf import settings
 from django.core.management import BaseCommand
 from django.db import IntegrityError
 
+from bot.dispatcher import ChatDispatcher
 from bot.models import TgUser
+from bot.outbox import OutboundQueue
+from bot.state import get_state_store
 from bot.tg.client import TgClient
 from bot.tg.schemas import Message
 from goals.models import Goal, GoalCategory, BoardParticipant
@@ -11,19 +13,39 @@ from goals.serializers import GoalSerializer, GoalCategorySerializer
 
 
 class Command(BaseCommand):
+    # Обработчики, которые можно сохранить в состоянии диалога как следующий шаг
+    dialog_handlers = ('choose_category', 'create_goal')
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.tg_client = TgClient()
-        self.users_data = {}
+        # Клиент и очередь создаются в handle, если их не передали заранее (тесты, бенчмарки)
+        self.tg_client: TgClient | None = None
+        self.outbox: OutboundQueue | None = None
+        self.state_store = get_state_store()
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=settings.BOT_WORKERS, help='Number of chats processed in parallel.'
+        )
 
     def handle(self, *args, **options):
+        if self.tg_client is None:
+            # Каждому потоку отправки нужно свое соединение в пуле клиента, плюс одно для getUpdates
+            self.tg_client = TgClient(pool_size=max(settings.BOT_OUTBOX_WORKERS, settings.BOT_HTTP_POOL_SIZE) + 1)
+        if self.outbox is None:
+            self.outbox = OutboundQueue(self.tg_client)
+        dispatcher = ChatDispatcher(self.handle_message, workers=options['workers'])
         offset = 0
-        while True:
-            res = self.tg_client.get_updates(offset=offset)
-            for item in res.result:
-                offset = item.update_id + 1
-                self.handle_message(item.message)
+        try:
+            while True:
+                res = self.tg_client.get_updates(offset=offset)
+                for item in res.result:
+                    offset = item.update_id + 1
+                    dispatcher.submit(item.message)
+        finally:
+            dispatcher.shutdown()
+            self.outbox.close(timeout=settings.BOT_HTTP_TIMEOUT)
+            self.tg_client.close()
 
     def handle_message(self, message: Message):
         """
@@ -34,7 +56,7 @@ class Command(BaseCommand):
         tg_user, _ = TgUser.objects.get_or_create(chat_id=message.chat.id, defaults={'username': message.chat.username})
         if not tg_user.is_verified:
             tg_user.update_verification_code()
-            self.tg_client.send_message(message.chat.id, f'Verification code: {tg_user.verification_code}')
+            self.outbox.send(message.chat.id, f'Verification code: {tg_user.verification_code}')
         else:
             self.handle_auth_user(tg_user, message)
 
@@ -50,7 +72,11 @@ class Command(BaseCommand):
 
         goals = (
             Goal.objects.select_related('user')
-            .filter(category__board__participants__user_id=user_id, category__is_deleted=False)
+            .filter(
+                category__board__participants__user_id=user_id,
+                category__board__is_deleted=False,
+                category__is_deleted=False,
+            )
             .exclude(status=Goal.Status.archived)
             .all()
         )
@@ -79,13 +105,12 @@ class Command(BaseCommand):
         response = '\n'.join(message)
         return response
 
-    def show_categories(self, user_id: int, chat_id: int, users_data) -> str:
+    def show_categories(self, user_id: int, chat_id: int) -> str:
         """
         Возвращаем список категорий, в которых пользователь либо владелец, либо редактор.
 
         :param user_id:
         :param chat_id:
-        :param users_data:
         :return:
         """
         categories = (
@@ -93,6 +118,7 @@ class Command(BaseCommand):
             .filter(
                 board__participants__user_id=user_id,
                 board__participants__role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer],
+                board__is_deleted=False,
             )
             .exclude(is_deleted=True)
         )
@@ -110,8 +136,10 @@ class Command(BaseCommand):
             data.append(cat_data)
 
         # Присваиваем численное значение к каждой категории для удобства дальнейшего выбора
-        users_data[chat_id] = {index: item['cat_id'] for index, item in enumerate(data, start=1)}
-        users_data[chat_id]['next_handler'] = self.choose_category
+        self.state_store.set(chat_id, {
+            'next_handler': 'choose_category',
+            'categories': {str(index): item['cat_id'] for index, item in enumerate(data, start=1)},
+        })
 
         message = [f'{index}) {item["title"]}' for index, item in enumerate(data, start=1)]
 
@@ -120,20 +148,19 @@ class Command(BaseCommand):
 
     def choose_category(self, **kwargs) -> str:
         """
-        Принимаем от пользователя category_id и помещаем его в словарь users_data.
+        Принимаем от пользователя category_id и сохраняем его в состоянии диалога.
 
         :param kwargs:
         :return:
         """
         chat_id: int = kwargs.get('chat_id')
         message: str = kwargs.get('message')
-        users_data: dict[int, dict[str | int, ...]] = kwargs.get('users_data')
+        state: dict = kwargs.get('state')
         if message.isdigit():
             value = int(message)
-            category_id = users_data.get(chat_id, {}).get(value)
+            category_id = state.get('categories', {}).get(str(value))
             if category_id is not None:
-                users_data[chat_id]['next_handler'] = self.create_goal
-                users_data[chat_id]['category_id'] = category_id
+                self.state_store.set(chat_id, {'next_handler': 'create_goal', 'category_id': category_id})
                 return f'You chose category {value}. Please, send the title for the goal.'
             else:
                 return f'Invalid category index. Please choose a valid category.'
@@ -150,11 +177,11 @@ class Command(BaseCommand):
         user_id: int = kwargs.get('user_id')
         chat_id: int = kwargs.get('chat_id')
         message: str = kwargs.get('message')
-        users_data: dict[int, dict[str | int, ...]] = kwargs.get('users_data')
+        state: dict = kwargs.get('state')
         try:
-            category_id = users_data.get(chat_id, {}).get('category_id')
+            category_id = state.get('category_id')
             Goal.objects.create(title=message, user_id=user_id, category_id=category_id)
-            users_data.pop(chat_id, None)
+            self.state_store.delete(chat_id)
             return f'Goal "{message}" added!'
         except IntegrityError:
             return 'Something went wrong. Goal not created.'
@@ -174,15 +201,12 @@ class Command(BaseCommand):
                 case '/goals':
                     text = self.get_user_goals(tg_user.user.id)
                 case '/create':
-                    text = self.show_categories(user_id=tg_user.user.id, chat_id=message.chat.id,
-                                                users_data=self.users_data)
+                    text = self.show_categories(user_id=tg_user.user.id, chat_id=message.chat.id)
                 case _:
                     text = 'Unknown command'
-        elif message.chat.id in self.users_data:
-            next_handler = self.users_data[message.chat.id].get('next_handler')
-            text = next_handler(
-                user_id=tg_user.user.id, chat_id=message.chat.id, message=message.text, users_data=self.users_data
-            )
+        elif (state := self.state_store.get(message.chat.id)) and state.get('next_handler') in self.dialog_handlers:
+            next_handler = getattr(self, state['next_handler'])
+            text = next_handler(user_id=tg_user.user.id, chat_id=message.chat.id, message=message.text, state=state)
         else:
             text = 'List of commands:\n/goals - Show your goals\n' '/create - Create a goal'
-        self.tg_client.send_message(chat_id=message.chat.id, text=text)
+        self.outbox.send(chat_id=message.chat.id, text=text)
@@ -0,0 +1,204 @@
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+
+from bot.tg.client import TgClient
+
+logger = logging.getLogger(__name__)
+
+# Максимальная длина сообщения в Telegram
+MAX_MESSAGE_LENGTH = 4096
+
+
+class OutboundQueue:
+    """
+    Очередь исходящих сообщений бота с фоновой отправкой.
+    Соблюдает ограничения Telegram: не чаще одного сообщения в chat_interval секунд в чат
+    и не более global_rate сообщений в секунду всего. Сообщения одного чата, накопившиеся
+    за время ожидания, склеиваются в одно. Повторяются с экспоненциальной задержкой только отправки, которые Telegram
+    точно не принял: ошибка соединения и 429 (с ожиданием retry_after). После таймаута чтения или 5xx сообщение
+    могло быть доставлено, поэтому оно, как и отклоненное ответом 4xx, отбрасывается.
+    """
+
+    def __init__(
+        self,
+        client: TgClient,
+        workers: int | None = None,
+        global_rate: float | None = None,
+        chat_interval: float | None = None,
+        retries: int | None = None,
+        backoff: float | None = None,
+    ):
+        self.client = client
+        self.workers = workers if workers is not None else settings.BOT_OUTBOX_WORKERS
+        global_rate = global_rate if global_rate is not None else settings.BOT_OUTBOX_GLOBAL_RATE
+        self.global_interval = 1 / global_rate if global_rate else 0
+        self.chat_interval = chat_interval if chat_interval is not None else settings.BOT_OUTBOX_CHAT_INTERVAL
+        self.retries = retries if retries is not None else settings.BOT_OUTBOX_RETRIES
+        self.backoff = backoff if backoff is not None else settings.BOT_HTTP_BACKOFF
+
+        self.pending: dict[int, deque[str]] = {}
+        self.attempts: dict[int, int] = {}
+        self.next_send: dict[int, float] = {}
+        self.in_flight: set[int] = set()
+        self.global_next_send = 0.0
+        self.condition = threading.Condition()
+        self.closed = False
+        self.executor: ThreadPoolExecutor | None = None
+        self.thread: threading.Thread | None = None
+
+    def send(self, chat_id: int, text: str) -> None:
+        """
+        Метод постановки сообщения в очередь. Не блокирует вызывающий поток.
+        :param chat_id:
+        :param text:
+        :return:
+        """
+        with self.condition:
+            if self.closed:
+                raise RuntimeError('Outbound queue is closed')
+            self.pending.setdefault(chat_id, deque()).append(text)
+            self._start()
+            self.condition.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Метод ожидания отправки всех сообщений из очереди.
+        :param timeout: Максимальное время ожидания в секундах.
+        :return: True, если очередь опустела.
+        """
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.pending and not self.in_flight, timeout=timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        """
+        Метод остановки очереди: дожидается отправки накопленных сообщений и останавливает фоновые потоки.
+        Сообщения, не отправленные за timeout, отбрасываются и попадают в лог.
+        :param timeout: Максимальное время ожидания отправки и остановки потоков.
+        :return:
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        flushed = self.flush(timeout=timeout)
+        with self.condition:
+            self.closed = True
+            if not flushed:
+                for chat_id, queue in self.pending.items():
+                    logger.error('Dropped %d pending messages to chat %s on close', len(queue), chat_id)
+                for chat_id in self.in_flight:
+                    logger.error('Message to chat %s is still being sent on close and may be lost', chat_id)
+                self.pending.clear()
+            self.condition.notify_all()
+        if self.thread:
+            self.thread.join(timeout=None if deadline is None else max(deadline - time.monotonic(), 0))
+            self.executor.shutdown(wait=flushed, cancel_futures=True)
+
+    def _start(self) -> None:
+        if self.thread is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='outbox')
+            self.thread = threading.Thread(target=self._run, name='outbox-scheduler', daemon=True)
+            self.thread.start()
+
+    def _run(self) -> None:
+        """
+        Цикл планировщика: выбирает готовый к отправке чат и передает его сообщения в пул потоков.
+        """
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                ready, wait = None, None
+                for chat_id in self.pending:
+                    if chat_id in self.in_flight:
+                        continue
+                    at = max(self.next_send.get(chat_id, 0), self.global_next_send)
+                    if at <= now:
+                        ready = chat_id
+                        break
+                    wait = at - now if wait is None else min(wait, at - now)
+
+                if ready is None:
+                    if self.closed and not self.pending:
+                        return
+                    self.condition.wait(timeout=wait)
+                    continue
+
+                text = self._coalesce(ready)
+                self.in_flight.add(ready)
+                self.global_next_send = now + self.global_interval
+                self.executor.submit(self._deliver, ready, text)
+
+    def _coalesce(self, chat_id: int) -> str:
+        """
+        Метод склейки накопленных сообщений чата в одно в пределах максимальной длины сообщения.
+        :param chat_id:
+        :return:
+        """
+        queue = self.pending[chat_id]
+        text = queue.popleft()
+        while queue and len(text) + 1 + len(queue[0]) <= MAX_MESSAGE_LENGTH:
+            text = f'{text}\n{queue.popleft()}'
+        if not queue:
+            del self.pending[chat_id]
+        return text
+
+    def _deliver(self, chat_id: int, text: str) -> None:
+        delivered, retry_after = False, None
+        try:
+            response = self.client.send_message(chat_id=chat_id, text=text)
+        except requests.ConnectionError:
+            logger.warning('Connection error while sending message to chat %s', chat_id, exc_info=True)
+            retry_after = 0
+        except Exception:
+            logger.exception('Failed to send message to chat %s', chat_id)
+        else:
+            if response is not None and response.ok:
+                delivered = True
+            elif response is not None and response.error_code == 429:
+                retry_after = (response.parameters and response.parameters.retry_after) or 0
+            else:
+                description = f'{response.error_code} {response.description}' if response else 'invalid response'
+                logger.error('Telegram rejected message to chat %s: %s', chat_id, description)
+
+        with self.condition:
+            self.in_flight.discard(chat_id)
+            now = time.monotonic()
+            attempt = self.attempts.get(chat_id, 0) + 1
+            if delivered:
+                self.attempts.pop(chat_id, None)
+                self.next_send[chat_id] = now + self.chat_interval
+            elif retry_after is None or attempt > self.retries or self.closed:
+                logger.error('Dropped message to chat %s after %d attempts', chat_id, attempt)
+                self.attempts.pop(chat_id, None)
+                self.next_send[chat_id] = now + self.chat_interval
+            else:
+                self.attempts[chat_id] = attempt
+                self.pending.setdefault(chat_id, deque()).appendleft(text)
+                self.next_send[chat_id] = now + max(retry_after, self.backoff * 2 ** (attempt - 1))
+
+            # Время следующей отправки нужно только чатам с ожидающими сообщениями
+            for key in [key for key, at in self.next_send.items() if at <= now and key not in self.pending]:
+                del self.next_send[key]
+            self.condition.notify_all()
+
+
+_outbox: OutboundQueue | None = None
+_outbox_lock = threading.Lock()
+
+
+def get_outbox() -> OutboundQueue:
+    """
+    Метод получения общей для процесса очереди исходящих сообщений.
+    При завершении процесса очередь дожидается отправки накопленных сообщений.
+    :return:
+    """
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None:
+            _outbox = OutboundQueue(TgClient())
+            atexit.register(_outbox.close, timeout=settings.BOT_HTTP_TIMEOUT)
+        return _outbox
@@ -0,0 +1,97 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class DialogStateStore(ABC):
+    """
+    Хранилище состояния диалога с пользователем по chat_id.
+    Состояние - словарь из простых типов: имя следующего обработчика и его данные.
+    """
+
+    @abstractmethod
+    def get(self, chat_id: int) -> dict | None:
+        pass
+
+    @abstractmethod
+    def set(self, chat_id: int, state: dict) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, chat_id: int) -> None:
+        pass
+
+
+class MemoryStateStore(DialogStateStore):
+    """
+    Хранилище в памяти процесса с ограничением по времени жизни (TTL) и размеру (LRU).
+    Подходит только для одного процесса бота.
+    """
+
+    def __init__(self, ttl: int, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.states: OrderedDict[int, tuple[float, dict]] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, chat_id: int) -> dict | None:
+        with self.lock:
+            item = self.states.get(chat_id)
+            if item is None:
+                return None
+            expires, state = item
+            if expires < time.monotonic():
+                del self.states[chat_id]
+                return None
+            self.states.move_to_end(chat_id)
+            return state
+
+    def set(self, chat_id: int, state: dict) -> None:
+        with self.lock:
+            self.states[chat_id] = (time.monotonic() + self.ttl, state)
+            self.states.move_to_end(chat_id)
+            while len(self.states) > self.max_size:
+                self.states.popitem(last=False)
+
+    def delete(self, chat_id: int) -> None:
+        with self.lock:
+            self.states.pop(chat_id, None)
+
+
+class CacheStateStore(DialogStateStore):
+    """
+    Хранилище в кеше Django: общее для нескольких процессов бота только при общем бэкенде (Redis, Memcached, БД),
+    LocMemCache у каждого процесса свой. Ограничение размера обеспечивает сам бэкенд кеша: у кеша bot_state
+    это MAX_ENTRIES = BOT_STATE_MAX_SIZE, при переполнении сначала удаляются истекшие состояния.
+    """
+
+    def __init__(self, ttl: int, alias: str = 'default'):
+        self.ttl = ttl
+        self.cache = caches[alias]
+
+    @staticmethod
+    def key(chat_id: int) -> str:
+        return f'bot_state:{chat_id}'
+
+    def get(self, chat_id: int) -> dict | None:
+        return self.cache.get(self.key(chat_id))
+
+    def set(self, chat_id: int, state: dict) -> None:
+        self.cache.set(self.key(chat_id), state, self.ttl)
+
+    def delete(self, chat_id: int) -> None:
+        self.cache.delete(self.key(chat_id))
+
+
+def get_state_store() -> DialogStateStore:
+    """
+    Метод создания хранилища состояния диалогов по настройкам BOT_STATE_*.
+    :return:
+    """
+    if settings.BOT_STATE_STORE == 'memory':
+        return MemoryStateStore(ttl=settings.BOT_STATE_TTL, max_size=settings.BOT_STATE_MAX_SIZE)
+    return CacheStateStore(ttl=settings.BOT_STATE_TTL, alias=settings.BOT_STATE_CACHE)
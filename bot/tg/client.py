@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import TypeVar, Type
 
@@ -5,6 +6,8 @@ import requests
 from django.conf import settings
 from pydantic import ValidationError
 from pydantic.main import BaseModel
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from bot.tg.schemas import GetUpdatesResponse, SendMessageResponse
 
@@ -14,9 +17,49 @@ T = TypeVar('T', bound=BaseModel)
 
 
 class TgClient:
-    def __init__(self, token: str | None = None):
+    def __init__(
+        self,
+        token: str | None = None,
+        api_url: str | None = None,
+        pool_size: int | None = None,
+        retries: int | None = None,
+        timeout: float | None = None,
+    ):
         self.__token = token if token else settings.BOT_TOKEN
-        self.__url = f'https://api.telegram.org/bot{self.__token}/'
+        self.__url = f'{api_url if api_url else settings.BOT_API_URL}/bot{self.__token}/'
+        self.timeout = timeout if timeout is not None else settings.BOT_HTTP_TIMEOUT
+        self.session = self.__build_session(
+            pool_size=pool_size if pool_size is not None else settings.BOT_HTTP_POOL_SIZE,
+            retries=retries if retries is not None else settings.BOT_HTTP_RETRIES,
+        )
+
+    def __build_session(self, pool_size: int, retries: int) -> requests.Session:
+        """
+        Метод создания сессии с пулом keep-alive соединений и повторами запросов с экспоненциальной задержкой.
+        getUpdates повторяется при ошибках соединения, таймаутах чтения, 429 и 5xx. sendMessage повторяется
+        только при ошибках соединения и 429, когда сообщение точно не принято: после таймаута чтения или 5xx
+        повтор может отправить сообщение дважды.
+        :param pool_size: Максимальное число соединений в пуле.
+        :param retries: Количество повторов.
+        :return:
+        """
+        retry = Retry(
+            total=retries,
+            backoff_factor=settings.BOT_HTTP_BACKOFF,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=('GET',),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        send_retry = retry.new(read=0, status_forcelist=(429,))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        send_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=send_retry)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        # Сессия выбирает адаптер с самым длинным совпадающим префиксом url
+        session.mount(self.__get_url('sendMessage'), send_adapter)
+        return session
 
     def __get_url(self, method: str) -> str:
         """
@@ -28,13 +71,18 @@ class TgClient:
 
     def get_updates(self, offset: int = 0, timeout: int = 60) -> GetUpdatesResponse:
         url = self.__get_url('getUpdates')
-        response = requests.get(url, params={'timeout': timeout, 'offset': offset, 'allowed_updates': ['message']})
+        # Long polling: сервер держит запрос до timeout секунд, поэтому таймаут чтения больше
+        response = self.session.get(
+            url,
+            params={'timeout': timeout, 'offset': offset, 'allowed_updates': ['message']},
+            timeout=(self.timeout, timeout + self.timeout),
+        )
 
         if response.ok:
             data = response.json()
             return self.__serialize_tg_response(GetUpdatesResponse, data)
         else:
-            logger.error(f'Bad request getUpdates, ', response.status_code)
+            logger.error('Bad request getUpdates, %d', response.status_code)
 
     def send_message(self, chat_id: int, text: str, **kwargs) -> SendMessageResponse:
         """
@@ -47,13 +95,15 @@ class TgClient:
         data = self._get('sendMessage', chat_id=chat_id, text=text, **kwargs)
         return self.__serialize_tg_response(SendMessageResponse, data)
 
+    def close(self) -> None:
+        self.session.close()
+
     def _get(self, method: str, **params) -> dict:
         url = self.__get_url(method)
         params.setdefault('timeout', 10)
-        response = requests.get(url, params=params)
+        response = self.session.get(url, params=params, timeout=self.timeout)
         if not response.ok:
             logger.warning('Invalid status code %d from command %s', response.status_code, method)
-        response.json()
         return response.json()
 
     @staticmethod
@@ -62,3 +112,22 @@ class TgClient:
             return serializer_class(**data)
         except ValidationError:
             logger.error(f'Failed to serialize JSON response: {data}')
+
+
+class AsyncTgClient:
+    """
+    Асинхронный интерфейс к TgClient.
+    Запросы выполняются в пуле потоков asyncio через ту же сессию с пулом соединений.
+    """
+
+    def __init__(self, client: TgClient | None = None, **kwargs):
+        self.client = client if client else TgClient(**kwargs)
+
+    async def get_updates(self, offset: int = 0, timeout: int = 60) -> GetUpdatesResponse:
+        return await asyncio.to_thread(self.client.get_updates, offset=offset, timeout=timeout)
+
+    async def send_message(self, chat_id: int, text: str, **kwargs) -> SendMessageResponse:
+        return await asyncio.to_thread(self.client.send_message, chat_id=chat_id, text=text, **kwargs)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self.client.close)
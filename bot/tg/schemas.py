@@ -22,6 +22,14 @@ class GetUpdatesResponse(BaseModel):
     result: list[Update] = []
 
 
+class ResponseParameters(BaseModel):
+    retry_after: int | None = None
+
+
 class SendMessageResponse(BaseModel):
     ok: bool
-    result: Message
+    result: Message | None = None
+    # Поля ответа с ошибкой (ok = false)
+    error_code: int | None = None
+    description: str | None = None
+    parameters: ResponseParameters | None = None
@@ -4,8 +4,8 @@ from rest_framework.generics import UpdateAPIView
 from rest_framework.response import Response
 
 from bot.models import TgUser
+from bot.outbox import get_outbox
 from bot.serializers import TgUserSerializer
-from bot.tg.client import TgClient
 
 
 class VerificationView(UpdateAPIView):
@@ -24,5 +24,6 @@ class VerificationView(UpdateAPIView):
 
         tg_user.user = request.user
         tg_user.save(update_fields=['user'])
-        TgClient().send_message(chat_id=tg_user.chat_id, text='Bot has been verified')
+        # Сообщение уходит в фоне, чтобы ответ API не ждал Telegram
+        get_outbox().send(chat_id=tg_user.chat_id, text='Bot has been verified')
         return Response(TgUserSerializer(tg_user).data)
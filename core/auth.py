@@ -0,0 +1,91 @@
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.http import HttpRequest
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+from core.models import User
+from todolist.db.router import read_from_replicas
+
+
+def user_cache_key(user_id: int | str) -> str:
+    return f'user:{user_id}'
+
+
+def invalidate_user(user_id: int) -> None:
+    """
+    Метод сброса пользователя в общем кеше.
+    Сброс выполняется сразу и повторно после фиксации транзакции, чтобы в кеш не попали незафиксированные данные.
+    :param user_id:
+    :return:
+    """
+    key = user_cache_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def get_cached_user(user_id: int | str) -> User | None:
+    """
+    Метод получения активного пользователя по id из общего кеша.
+    При промахе пользователь загружается из основной БД и сохраняется в кеш.
+    Без общего кеша (SHARED_CACHE = false) пользователь всегда загружается из БД.
+    :param user_id:
+    :return: None, если пользователь не найден или отключен.
+    """
+    key = user_cache_key(user_id)
+    user = cache.get(key) if settings.SHARED_CACHE else None
+    if user is None:
+        user = User.objects.using(DEFAULT_DB_ALIAS).filter(pk=user_id).first()
+        if user is None:
+            return None
+        if settings.SHARED_CACHE:
+            cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+    return user if user.is_active else None
+
+
+def get_user(request: HttpRequest) -> User | AnonymousUser:
+    """
+    Метод получения пользователя сессии из общего кеша.
+    При промахе пользователь загружается стандартным django.contrib.auth.get_user из основной БД и сохраняется в кеш.
+    Хеш пароля в сессии проверяется и для пользователя из кеша: после смены пароля сессия сбрасывается.
+    Без общего кеша (SHARED_CACHE = false) пользователь загружается из БД на каждый запрос: сброс кеша
+    при выходе и смене пароля не дошел бы до других процессов.
+    :param request:
+    :return:
+    """
+    user_id = request.session.get(SESSION_KEY)
+    cached = (
+        settings.SHARED_CACHE
+        and user_id is not None
+        and request.session.get(BACKEND_SESSION_KEY) in settings.AUTHENTICATION_BACKENDS
+    )
+    user = cache.get(user_cache_key(user_id)) if cached else None
+    if user is None:
+        with read_from_replicas(False):
+            user = auth.get_user(request)
+        if cached and user.is_authenticated:
+            cache.set(user_cache_key(user_id), user, settings.USER_CACHE_TIMEOUT)
+        return user
+
+    session_hash = request.session.get(HASH_SESSION_KEY)
+    hash_verified = session_hash and constant_time_compare(session_hash, user.get_session_auth_hash())
+    if not (user.is_active and hash_verified):
+        request.session.flush()
+        return AnonymousUser()
+    return user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    AuthenticationMiddleware, в котором request.user берется из общего кеша (get_user)
+    вместо запроса к таблице пользователей на каждый HTTP-запрос.
+    """
+
+    def process_request(self, request: HttpRequest) -> None:
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_user(request))
@@ -0,0 +1,18 @@
+from django.core.management import call_command
+from django.db import migrations
+
+
+def create_cache_table(apps, schema_editor):
+    call_command('createcachetable', database=schema_editor.connection.alias, verbosity=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        # Таблицы кешей DatabaseCache (CACHES в todolist/settings.py); команда пропускает уже существующие таблицы
+        migrations.RunPython(create_cache_table, migrations.RunPython.noop),
+    ]
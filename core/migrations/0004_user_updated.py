@@ -0,0 +1,18 @@
+# Generated by Django 4.2.2 on 2026-10-18 21:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_revocations_cache_table'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата последнего обновления'),
+        ),
+    ]
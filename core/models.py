@@ -1,5 +1,9 @@
 from django.contrib.auth.models import AbstractUser
+from django.db import models
 
 
 class User(AbstractUser):
     REQUIRED_FIELDS = []
+
+    # Версия данных пользователя для ETag объектов, в ответ которых он вложен (goals.conditional)
+    updated = models.DateTimeField(verbose_name="Дата последнего обновления", auto_now=True)
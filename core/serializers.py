@@ -51,6 +51,13 @@ class LoginSerializer(serializers.Serializer):
     password = PasswordField(validate=False)
 
 
+class TokenRefreshSerializer(serializers.Serializer):
+    """
+    Сериализатор refresh-токена для получения новой пары токенов и отзыва.
+    """
+    refresh = serializers.CharField(required=True)
+
+
 class UserSerializer(serializers.ModelSerializer):
     """
     Сериализатор объекта пользователя.
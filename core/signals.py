@@ -0,0 +1,21 @@
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.auth import invalidate_user
+from core.models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance: User, **kwargs) -> None:
+    """
+    Сброс кеша пользователя при изменении профиля или пароля и при удалении.
+    """
+    invalidate_user(instance.id)
+
+
+@receiver(user_logged_out)
+def user_logged_out_handler(sender, request, user: User | None, **kwargs) -> None:
+    if user is not None:
+        invalidate_user(user.id)
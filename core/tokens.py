@@ -0,0 +1,152 @@
+import time
+import uuid
+
+import jwt
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.request import Request
+
+from core.auth import get_cached_user
+from core.models import User
+
+ALGORITHM = 'HS256'
+
+
+class TokenRevoked(exceptions.AuthenticationFailed):
+    default_detail = 'Token has been revoked'
+
+    def __init__(self, payload: dict):
+        super().__init__()
+        self.payload = payload
+
+
+def revocations() -> BaseCache:
+    """
+    Метод получения хранилища отозванных токенов, общего для всех процессов API: кеш default, если он общий
+    (SHARED_CACHE), иначе отдельная таблица кеша в БД (revocations). JWT_REVOCATION_CACHE задает псевдоним кеша явно.
+    Хранилище не должно вытеснять записи до истечения токенов: Redis без maxmemory или таблица revocations
+    с JWT_REVOCATION_MAX_ENTRIES больше числа отзывов за время жизни refresh-токена.
+    :return:
+    """
+    return caches[settings.JWT_REVOCATION_CACHE or ('default' if settings.SHARED_CACHE else 'revocations')]
+
+
+def revoked_token_key(jti: str) -> str:
+    return f'token_revoked:{jti}'
+
+
+def revoked_user_key(user_id: int | str) -> str:
+    return f'tokens_revoked_before:{user_id}'
+
+
+def issue_tokens(user: User) -> dict[str, str]:
+    """
+    Метод выдачи пары подписанных токенов: короткоживущего access и refresh для получения новой пары.
+    :param user:
+    :return: {'access': ..., 'refresh': ...}
+    """
+    now = time.time()
+    tokens = {}
+    lifetimes = {'access': settings.JWT_ACCESS_LIFETIME, 'refresh': settings.JWT_REFRESH_LIFETIME}
+    for token_type, lifetime in lifetimes.items():
+        payload = {'sub': str(user.id), 'type': token_type, 'jti': uuid.uuid4().hex, 'iat': now, 'exp': now + lifetime}
+        tokens[token_type] = jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=ALGORITHM)
+    return tokens
+
+
+def decode_token(token: str, token_type: str) -> dict:
+    """
+    Метод проверки токена: подпись, срок действия, тип и отсутствие в списке отозванных.
+    Список отозванных проверяется одним запросом к общему хранилищу (revocations): при общем кеше БД не используется.
+    :param token:
+    :param token_type: access или refresh.
+    :return: Содержимое токена.
+    """
+    try:
+        payload = jwt.decode(
+            token, settings.JWT_SECRET_KEY, algorithms=[ALGORITHM], options={'require': ['sub', 'jti', 'iat', 'exp']}
+        )
+    except jwt.ExpiredSignatureError:
+        raise exceptions.AuthenticationFailed('Token has expired')
+    except jwt.InvalidTokenError:
+        raise exceptions.AuthenticationFailed('Invalid token')
+    if payload.get('type') != token_type:
+        raise exceptions.AuthenticationFailed('Invalid token type')
+
+    revoked = revocations().get_many([revoked_token_key(payload['jti']), revoked_user_key(payload['sub'])])
+    revoked_before = revoked.get(revoked_user_key(payload['sub']))
+    if revoked_token_key(payload['jti']) in revoked or (revoked_before and payload['iat'] < revoked_before):
+        raise TokenRevoked(payload)
+    return payload
+
+
+def revoke_token(payload: dict) -> bool:
+    """
+    Метод отзыва токена до окончания срока его действия.
+    Запись в хранилище живет не дольше самого токена, поэтому список отозванных не растет.
+    Запись добавляется атомарно (cache.add), поэтому из одновременных отзывов одного токена успешен только один.
+    :param payload: Содержимое проверенного токена.
+    :return: False, если токен уже был отозван.
+    """
+    timeout = int(payload['exp'] - time.time()) + 1
+    return timeout > 0 and revocations().add(revoked_token_key(payload['jti']), True, timeout)
+
+
+def revoke_user_tokens(user_id: int | str) -> None:
+    """
+    Метод отзыва всех выданных пользователю токенов: токены, выданные раньше текущего момента, не принимаются.
+    :param user_id:
+    :return:
+    """
+    revocations().set(revoked_user_key(user_id), time.time(), settings.JWT_REFRESH_LIFETIME)
+
+
+def refresh_tokens(token: str) -> dict[str, str]:
+    """
+    Метод обмена refresh-токена на новую пару токенов. Использованный refresh-токен отзывается.
+    Повторное предъявление отозванного refresh-токена означает его утечку: отзываются все токены пользователя.
+    Токен отзывается до выдачи новой пары атомарно, поэтому из одновременных обменов одного токена
+    успешен только первый, а остальные считаются повторным предъявлением.
+    :param token:
+    :return:
+    """
+    try:
+        payload = decode_token(token, 'refresh')
+        if not revoke_token(payload):
+            raise TokenRevoked(payload)
+    except TokenRevoked as error:
+        revoke_user_tokens(error.payload['sub'])
+        raise
+    user = get_cached_user(payload['sub'])
+    if user is None:
+        raise exceptions.AuthenticationFailed('User not found')
+    return issue_tokens(user)
+
+
+class JWTAuthentication(BaseAuthentication):
+    """
+    Аутентификация по заголовку "Authorization: Bearer <access-токен>".
+    Токен проверяется без обращения к БД, пользователь берется из общего кеша.
+    """
+    keyword = 'Bearer'
+
+    def authenticate(self, request: Request) -> tuple[User, dict] | None:
+        header = request.headers.get('Authorization', '').split()
+        if not header or header[0] != self.keyword:
+            return None
+        if len(header) != 2:
+            raise exceptions.AuthenticationFailed('Invalid Authorization header')
+
+        payload = decode_token(header[1], 'access')
+        user = get_cached_user(payload['sub'])
+        if user is None:
+            raise exceptions.AuthenticationFailed('User not found')
+        return user, payload
+
+    def authenticate_header(self, request: Request) -> str | None:
+        # 401 с WWW-Authenticate только для клиентов с токеном: клиенты с сессией по-прежнему получают 403
+        if request.headers.get('Authorization', '').startswith(self.keyword):
+            return self.keyword
+        return None
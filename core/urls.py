@@ -1,10 +1,15 @@
 from django.urls import path
 
-from core.views import SignUpView, LoginView, ProfileView, UpdatePasswordView
+from core.views import (
+    SignUpView, LoginView, ProfileView, UpdatePasswordView, TokenObtainView, TokenRefreshView, TokenRevokeView,
+)
 
 urlpatterns = [
     path('signup', SignUpView.as_view(), name='signup'),
     path('login', LoginView.as_view(), name='login'),
     path('profile', ProfileView.as_view(), name='profile'),
     path('update_password', UpdatePasswordView.as_view(), name='update_password'),
+    path('token', TokenObtainView.as_view(), name='token'),
+    path('token/refresh', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/revoke', TokenRevokeView.as_view(), name='token_revoke'),
 ]
@@ -5,7 +5,12 @@ from rest_framework.response import Response
 from django.contrib.auth import authenticate, login, logout
 
 from core.models import User
-from core.serializers import CreateUserSerializer, LoginSerializer, UserSerializer, UpdatePasswordSerializer
+from core.serializers import (
+    CreateUserSerializer, LoginSerializer, TokenRefreshSerializer, UserSerializer, UpdatePasswordSerializer,
+)
+from core.tokens import (
+    JWTAuthentication, TokenRevoked, decode_token, issue_tokens, refresh_tokens, revoke_token, revoke_user_tokens,
+)
 
 
 class SignUpView(generics.CreateAPIView):
@@ -34,6 +39,64 @@ class LoginView(GenericAPIView):
             return Response({'message': 'Invalid login credentials'}, status=status.HTTP_401_UNAUTHORIZED)
 
 
+class TokenView(GenericAPIView):
+    """
+    Базовое представление токенов: ошибки токена возвращаются с кодом 401 и заголовком WWW-Authenticate.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get_authenticate_header(self, request):
+        return JWTAuthentication.keyword
+
+
+class TokenObtainView(TokenView):
+    """
+    Представление выдачи access- и refresh-токенов по имени пользователя и паролю.
+    """
+    serializer_class = LoginSerializer
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = authenticate(**serializer.validated_data)
+
+        if user is None:
+            return Response({'message': 'Invalid login credentials'}, status=status.HTTP_401_UNAUTHORIZED)
+        return Response(issue_tokens(user), status=status.HTTP_200_OK)
+
+
+class TokenRefreshView(TokenView):
+    """
+    Представление обмена refresh-токена на новую пару токенов.
+    """
+    serializer_class = TokenRefreshSerializer
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(refresh_tokens(serializer.validated_data['refresh']), status=status.HTTP_200_OK)
+
+
+class TokenRevokeView(TokenView):
+    """
+    Представление отзыва refresh-токена и access-токена запроса (выход клиента).
+    """
+    serializer_class = TokenRefreshSerializer
+    authentication_classes = [JWTAuthentication]
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            revoke_token(decode_token(serializer.validated_data['refresh'], 'refresh'))
+        except TokenRevoked:
+            pass
+        if request.auth is not None:
+            revoke_token(request.auth)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class ProfileView(generics.RetrieveUpdateDestroyAPIView):
     """
     Представление профиля пользователя.
@@ -61,5 +124,6 @@ class UpdatePasswordView(generics.GenericAPIView):
 
         request.user.set_password(serializer.validated_data['new_password'])
         request.user.save()
+        revoke_user_tokens(request.user.id)
 
         return Response(serializer.data)
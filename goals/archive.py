@@ -0,0 +1,145 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from core.models import User
+from goals.counters import rebuild_counters
+from goals.events import copy_goal_events
+from goals.models import ArchiveJob, Board, Goal, GoalCategory
+from goals.permission import invalidate_board_roles
+
+logger = logging.getLogger(__name__)
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def archive_board(board: Board, user: User) -> ArchiveJob:
+    """
+    Метод удаления доски. Доска скрывается сразу, ее категории и цели архивируются пакетами.
+    :param board:
+    :param user: Пользователь, удаляющий доску.
+    :return: Задача удаления.
+    """
+    with transaction.atomic():
+        Board.objects.filter(id=board.id).update(is_deleted=True, updated=timezone.now())
+        # Удаленная доска исключается из ролей участников, поэтому сразу пропадает из всех списков
+        invalidate_board_roles(*board.participants.values_list('user_id', flat=True))
+        job = ArchiveJob.objects.create(board=board, user=user, total=count_board_objects(board))
+    return start_job(job)
+
+
+def archive_category(category: GoalCategory, user: User) -> ArchiveJob:
+    """
+    Метод удаления категории. Категория скрывается сразу, ее цели архивируются пакетами.
+    :param category:
+    :param user: Пользователь, удаляющий категорию.
+    :return: Задача удаления.
+    """
+    with transaction.atomic():
+        GoalCategory.objects.filter(id=category.id).update(is_deleted=True, updated=timezone.now())
+        job = ArchiveJob.objects.create(category=category, user=user, total=active_goals(category=category).count())
+    return start_job(job)
+
+
+def active_goals(**filters) -> QuerySet[Goal]:
+    return Goal.objects.filter(**filters).exclude(status=Goal.Status.archived)
+
+
+def count_board_objects(board: Board) -> int:
+    return (
+        active_goals(category__board=board).count()
+        + GoalCategory.objects.filter(board=board, is_deleted=False).count()
+    )
+
+
+def start_job(job: ArchiveJob) -> ArchiveJob:
+    """
+    Метод запуска задачи: небольшие задачи выполняются сразу, крупные - в фоновом потоке после фиксации транзакции.
+    :param job:
+    :return:
+    """
+    if job.total <= settings.GOALS_ARCHIVE_SYNC_LIMIT:
+        run_job(job)
+    else:
+        transaction.on_commit(lambda: get_executor().submit(run_job_in_background, job.id))
+    return job
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='archive')
+        return _executor
+
+
+def run_job_in_background(job_id: int) -> None:
+    try:
+        run_job(ArchiveJob.objects.get(id=job_id))
+    except Exception:
+        logger.exception('Archive job %s failed', job_id)
+    finally:
+        close_old_connections()
+
+
+def run_job(job: ArchiveJob) -> None:
+    """
+    Метод выполнения задачи удаления пакетами по GOALS_ARCHIVE_BATCH_SIZE объектов.
+    Каждый пакет фиксируется отдельной транзакцией вместе с прогрессом, поэтому прерванную задачу
+    можно продолжить повторным запуском.
+    :param job:
+    :return:
+    """
+    job.status = ArchiveJob.Status.running
+    job.save(update_fields=['status', 'updated'])
+    try:
+        if job.board_id:
+            archive_in_batches(job, active_goals(category__board_id=job.board_id), status=Goal.Status.archived)
+            archive_in_batches(
+                job, GoalCategory.objects.filter(board_id=job.board_id, is_deleted=False), is_deleted=True
+            )
+        else:
+            archive_in_batches(job, active_goals(category_id=job.category_id), status=Goal.Status.archived)
+    except Exception:
+        job.status = ArchiveJob.Status.failed
+        job.save(update_fields=['status', 'updated'])
+        raise
+    finally:
+        # QuerySet.update не отправляет сигналы, поэтому счетчики пересчитываются после архивации
+        if job.board_id:
+            rebuild_counters(GoalCategory.objects.filter(board_id=job.board_id).values_list('id', flat=True))
+        else:
+            rebuild_counters([job.category_id])
+
+    job.status = ArchiveJob.Status.done
+    job.save(update_fields=['status', 'updated'])
+
+
+def archive_in_batches(job: ArchiveJob, queryset: QuerySet, **values) -> None:
+    """
+    Метод обновления объектов выборки пакетами в порядке первичного ключа.
+    :param job: Задача, в которой сохраняется прогресс.
+    :param queryset: Объекты, которые еще не удалены.
+    :param values: Новые значения полей.
+    :return:
+    """
+    last_id = 0
+    while True:
+        batch = queryset.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)
+        ids = list(batch[:settings.GOALS_ARCHIVE_BATCH_SIZE])
+        if not ids:
+            return
+        with transaction.atomic():
+            updated = queryset.filter(id__in=ids).update(updated=timezone.now(), **values)
+            if queryset.model is Goal:
+                # QuerySet.update не отправляет сигналы, события пишутся по новому состоянию целей
+                copy_goal_events(ids)
+            job.processed = min(job.processed + updated, job.total)
+            job.save(update_fields=['processed', 'updated'])
+        last_id = ids[-1]
@@ -0,0 +1,119 @@
+import logging
+import threading
+from collections import OrderedDict
+from functools import cached_property
+from typing import Hashable
+
+from django.conf import settings
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+
+class RepresentationCache:
+    """
+    Кеш сериализованных представлений объектов в памяти процесса.
+    Размер ограничен max_size записями, при переполнении вытесняются давно не использованные (LRU).
+    """
+
+    def __init__(self, max_size: int, log_every: int = 0):
+        self.max_size = max_size
+        self.log_every = log_every
+        self.items: OrderedDict[Hashable, dict] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: Hashable) -> dict | None:
+        with self.lock:
+            data = self.items.get(key)
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.items.move_to_end(key)
+            lookups = self.hits + self.misses
+        if self.log_every and lookups % self.log_every == 0:
+            logger.info('Representation cache: %s', self.stats())
+        return data
+
+    def set(self, key: Hashable, data: dict) -> None:
+        with self.lock:
+            self.items[key] = data
+            self.items.move_to_end(key)
+            while len(self.items) > self.max_size:
+                self.items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.items.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            'size': len(self.items),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hit_rate, 4),
+        }
+
+
+representation_cache = RepresentationCache(
+    max_size=settings.REPRESENTATION_CACHE_SIZE, log_every=settings.REPRESENTATION_CACHE_LOG_EVERY
+)
+
+
+class CachedRepresentationMixin:
+    """
+    Примесь к ModelSerializer: представление объекта берется из кеша по ключу
+    (класс сериализатора, pk, updated), поэтому неизмененные объекты не проходят через поля DRF.
+    Вложенные сериализаторы объектов без поля updated входят в ключ значениями своих полей.
+    """
+
+    def to_representation(self, instance):
+        key = self.get_cache_key(instance)
+        if key is None:
+            return super().to_representation(instance)
+        data = representation_cache.get(key)
+        if data is None:
+            data = super().to_representation(instance)
+            representation_cache.set(key, data)
+        # Копия защищает закешированное представление от изменения вызывающим кодом
+        return data.copy()
+
+    def get_cache_key(self, instance) -> tuple | None:
+        updated = getattr(instance, 'updated', None)
+        if instance.pk is None or updated is None or self.nested_sources is None:
+            return None
+        return type(self), instance.pk, updated, *self.get_nested_versions(instance)
+
+    @cached_property
+    def nested_sources(self) -> list[tuple[str, str, list[str]]] | None:
+        """
+        Вложенные сериализаторы и атрибуты, из которых они строят представление.
+        None, если есть вложенный список: его нельзя версионировать без запросов.
+        :return:
+        """
+        nested = []
+        for name, field in self.fields.items():
+            if isinstance(field, serializers.ListSerializer):
+                return None
+            if isinstance(field, serializers.BaseSerializer) and not field.write_only:
+                nested.append((name, field.source, [child.source for child in field.fields.values()]))
+        return nested
+
+    def get_nested_versions(self, instance) -> list[tuple]:
+        versions = []
+        for name, source, attributes in self.nested_sources:
+            related = getattr(instance, source, None)
+            if related is None:
+                versions.append((name,))
+            else:
+                versions.append((name, *(getattr(related, attribute) for attribute in attributes)))
+        return versions
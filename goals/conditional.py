@@ -0,0 +1,79 @@
+import hashlib
+from datetime import datetime
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import serializers, status
+
+from goals.permission import get_board_roles
+
+
+class ConditionalGetMixin:
+    """
+    Условные GET-запросы для представлений goals.
+    ETag вычисляется до сериализации: для списка - по max(updated) и количеству объектов выборки с учетом
+    фильтров, для объекта - по его полю updated. Поле updated вложенных объектов (например, автора в UserSerializer)
+    тоже учитывается. При совпадении с If-None-Match возвращается 304 без тела.
+    Last-Modified (и проверка If-Modified-Since) есть только у объекта: дата списка не меняется, когда объекты
+    выходят из выборки или вложенный автор изменен, и округляется до секунд, что дало бы ложный 304.
+    """
+
+    def get(self, request, *args, **kwargs):
+        last_modified, etag = self.get_validators()
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response.headers['ETag'] = etag
+            if timestamp is not None:
+                response.headers['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def get_object(self):
+        # Объект загружается один раз: для вычисления ETag и для ответа
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
+    def get_nested_paths(self) -> list[str]:
+        """
+        Метод получения путей к вложенным в ответ объектам с полем updated: их изменение меняет ответ,
+        хотя updated самого объекта остается прежним.
+        :return:
+        """
+        paths = []
+        for field in self.get_serializer().fields.values():
+            if isinstance(field, serializers.ModelSerializer):
+                if any(model_field.name == 'updated' for model_field in field.Meta.model._meta.fields):
+                    paths.append(field.source)
+        return paths
+
+    def get_validators(self) -> tuple[datetime | None, str]:
+        """
+        Метод вычисления даты последнего изменения и слабого ETag.
+        Дата изменения - наибольшая из updated объектов и вложенных в них объектов.
+        В ETag входят параметры запроса (фильтры, страница) и роли пользователя,
+        так как от них зависит набор объектов в ответе.
+        :return: Дата последнего изменения (None для списка) и ETag.
+        """
+        paths = self.get_nested_paths()
+        detail = self.kwargs.get(self.lookup_url_kwarg or self.lookup_field) is not None
+        if detail:
+            instance = self.get_object()
+            nested = (getattr(instance, path) for path in paths)
+            versions = [instance.updated, *(item.updated for item in nested if item is not None)]
+            count = 1
+        else:
+            state = self.filter_queryset(self.get_queryset()).order_by().aggregate(
+                last_modified=Max('updated'), count=Count('pk'),
+                **{f'nested_{index}': Max(f'{path}__updated') for index, path in enumerate(paths)},
+            )
+            versions = [state.pop('last_modified'), *(state.pop(f'nested_{index}') for index in range(len(paths)))]
+            count = state['count']
+        last_modified = max((version for version in versions if version is not None), default=None)
+
+        roles = sorted(get_board_roles(self.request).items())
+        key = f'{last_modified.isoformat() if last_modified else ""}|{count}|{self.request.get_full_path()}|{roles}'
+        return last_modified if detail else None, f'W/"{hashlib.md5(key.encode()).hexdigest()}"'
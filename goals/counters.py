@@ -0,0 +1,160 @@
+from collections import Counter
+from datetime import date
+from typing import Iterable, NamedTuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from goals.models import Board, CommentCounter, Goal, GoalCategory, GoalComment, GoalCounter
+
+COUNTER_FIELDS = ('category_id', 'status', 'priority', 'due_date')
+# Статусы, в которых цель с прошедшим сроком считается просроченной
+OVERDUE_STATUSES = (Goal.Status.to_do, Goal.Status.in_progress)
+
+
+class GoalKey(NamedTuple):
+    category_id: int
+    status: int
+    priority: int
+    due_date: date | None
+
+
+def goal_key(goal: Goal) -> GoalKey | None:
+    """
+    Метод получения ключа счетчика цели.
+    Отложенные поля (only/defer) не загружаются: для такой цели ключ неизвестен.
+    :param goal:
+    :return:
+    """
+    values = goal.__dict__
+    if any(field not in values for field in COUNTER_FIELDS):
+        return None
+    return GoalKey(*(values[field] for field in COUNTER_FIELDS))
+
+
+def remember_goal_key(goal: Goal) -> None:
+    """
+    Метод сохранения ключа счетчика, соответствующего состоянию цели в БД.
+    :param goal:
+    :return:
+    """
+    goal._counter_key = goal_key(goal) if goal.pk else None
+
+
+def update_goal_counters(changes: Iterable[tuple[GoalKey | None, GoalKey | None]]) -> None:
+    """
+    Метод применения изменений целей к счетчикам.
+    :param changes: Пары (ключ до изменения, ключ после). None - цели не было или она удалена.
+    :return:
+    """
+    deltas = Counter()
+    for old, new in changes:
+        if old == new:
+            continue
+        if old is not None:
+            deltas[old] -= 1
+        if new is not None:
+            deltas[new] += 1
+
+    for key, delta in deltas.items():
+        if delta:
+            increment(GoalCounter, key._asdict(), 'goals', delta)
+
+
+def update_comment_counters(deltas: dict[int, int]) -> None:
+    """
+    Метод изменения счетчиков комментариев.
+    :param deltas: Изменения по категориям {category_id: delta}.
+    :return:
+    """
+    for category_id, delta in deltas.items():
+        if delta:
+            increment(CommentCounter, {'category_id': category_id}, 'comments', delta)
+
+
+def increment(model, lookup: dict, field: str, delta: int) -> None:
+    """
+    Метод атомарного увеличения счетчика с созданием строки при ее отсутствии.
+    :param model:
+    :param lookup: Ключ строки счетчика.
+    :param field: Поле счетчика.
+    :param delta:
+    :return:
+    """
+    if model.objects.filter(**lookup).update(**{field: F(field) + delta}):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **{field: delta})
+    except IntegrityError:
+        # Строку одновременно создал другой запрос
+        model.objects.filter(**lookup).update(**{field: F(field) + delta})
+
+
+def rebuild_counters(category_ids: Iterable[int]) -> None:
+    """
+    Метод пересчета счетчиков категорий по данным целей и комментариев.
+    Используется после массовых изменений через QuerySet.update, которые не отправляют сигналы.
+    :param category_ids:
+    :return:
+    """
+    category_ids = set(category_ids)
+    with transaction.atomic():
+        GoalCounter.objects.filter(category_id__in=category_ids).delete()
+        GoalCounter.objects.bulk_create(
+            GoalCounter(**row)
+            for row in Goal.objects.filter(category_id__in=category_ids)
+            .values(*COUNTER_FIELDS)
+            .annotate(goals=Count('id'))
+            .order_by()
+        )
+        CommentCounter.objects.filter(category_id__in=category_ids).delete()
+        CommentCounter.objects.bulk_create(
+            CommentCounter(category_id=row['goal__category_id'], comments=row['comments'])
+            for row in GoalComment.objects.filter(goal__category_id__in=category_ids)
+            .values('goal__category_id')
+            .annotate(comments=Count('id'))
+            .order_by()
+        )
+
+
+def board_summary(board: Board) -> dict:
+    """
+    Метод получения сводки по доске из счетчиков: два запроса независимо от количества целей.
+    Архивные цели учитываются только в разбивке по статусам.
+    :param board:
+    :return:
+    """
+    today = timezone.localdate()
+    categories = {
+        category['id']: {**category, 'goals': 0, 'overdue': 0}
+        for category in GoalCategory.objects.filter(board=board, is_deleted=False)
+        .annotate(comments=Coalesce(F('comment_counter__comments'), Value(0)))
+        .order_by('title', 'id')
+        .values('id', 'title', 'comments')
+    }
+    by_status = {status: 0 for status in Goal.Status.values}
+    by_priority = {priority: 0 for priority in Goal.Priority.values}
+
+    counters = GoalCounter.objects.filter(category_id__in=categories.keys(), goals__gt=0).values_list(
+        *COUNTER_FIELDS, 'goals'
+    )
+    for category_id, status, priority, due_date, goals in counters:
+        by_status[status] += goals
+        if status == Goal.Status.archived:
+            continue
+        by_priority[priority] += goals
+        categories[category_id]['goals'] += goals
+        if due_date is not None and due_date < today and status in OVERDUE_STATUSES:
+            categories[category_id]['overdue'] += goals
+
+    return {
+        'board': board.id,
+        'goals': sum(category['goals'] for category in categories.values()),
+        'overdue': sum(category['overdue'] for category in categories.values()),
+        'by_status': by_status,
+        'by_priority': by_priority,
+        'categories': list(categories.values()),
+    }
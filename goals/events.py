@@ -0,0 +1,107 @@
+from datetime import datetime, timezone as dt_timezone
+from typing import Iterable
+
+from django.db import connection, transaction
+from django.db.models import F, Window
+from django.db.models.functions import Lead
+from django.utils import timezone
+
+from goals.counters import GoalKey
+from goals.models import Board, GoalEvent
+
+TABLE = GoalEvent._meta.db_table
+
+
+def record_goal_events(changes: Iterable[tuple[int, GoalKey | None, GoalKey | None]]) -> None:
+    """
+    Метод записи событий целей одним запросом.
+    Событие пишется при создании цели и при изменении статуса, приоритета или срока; перенос в другую категорию
+    событием не считается.
+    :param changes: Тройки (id цели, ключ до изменения, ключ после). None до изменения - цель создана.
+    :return:
+    """
+    GoalEvent.objects.bulk_create(
+        GoalEvent(goal_id=goal_id, due_date=new.due_date, status=new.status, priority=new.priority)
+        for goal_id, old, new in changes
+        if new is not None and (old is None or old[1:] != new[1:])
+    )
+
+
+def copy_goal_events(goal_ids: Iterable[int]) -> None:
+    """
+    Метод записи событий по текущему состоянию целей в БД: для изменений через QuerySet.update,
+    после которых состояние целей в памяти неизвестно.
+    :param goal_ids:
+    :return:
+    """
+    goal_ids = list(goal_ids)
+    if not goal_ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {TABLE} (at, goal_id, due_date, status, priority) '
+            'SELECT %s, id, due_date, status, priority FROM goals_goal WHERE id = ANY(%s)',
+            [timezone.now(), goal_ids],
+        )
+
+
+def month_start(year: int, month: int) -> datetime:
+    year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+    return datetime(year, month, 1, tzinfo=dt_timezone.utc)
+
+
+def create_partitions(months_ahead: int = 2, start: datetime | None = None) -> list[str]:
+    """
+    Метод создания месячных секций таблицы событий с месяца start по months_ahead месяцев вперед.
+    События, уже попавшие в секцию по умолчанию за эти месяцы, переносятся в новую секцию.
+    :param months_ahead:
+    :param start: По умолчанию текущий месяц.
+    :return: Имена созданных секций.
+    """
+    start = start or timezone.now()
+    created = []
+    for index in range(months_ahead + 1):
+        since, until = month_start(start.year, start.month + index), month_start(start.year, start.month + index + 1)
+        name = f'{TABLE}_{since:%Y_%m}'
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute('SELECT to_regclass(%s)', [name])
+            if cursor.fetchone()[0] is not None:
+                continue
+            cursor.execute(f'CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+            cursor.execute(
+                f'WITH moved AS (DELETE FROM {TABLE}_default WHERE at >= %s AND at < %s RETURNING *) '
+                f'INSERT INTO {name} SELECT * FROM moved',
+                [since, until],
+            )
+            cursor.execute(f'ALTER TABLE {TABLE} ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)', [since, until])
+        created.append(name)
+    return created
+
+
+def status_durations(board: Board, since: datetime, until: datetime) -> list[dict]:
+    """
+    Метод расчета времени, которое цели доски провели в каждом статусе.
+    Учитываются события за период [since, until): длительность - время до следующего события цели,
+    для последнего события - до конца периода или текущего момента.
+    Условие на at ограничивает чтение секциями за период.
+    :param board:
+    :param since:
+    :param until:
+    :return: Список {'status', 'transitions', 'avg_seconds'} по статусам.
+    """
+    events = (
+        GoalEvent.objects.filter(goal__category__board=board, at__gte=since, at__lt=until)
+        .annotate(next_at=Window(Lead('at'), partition_by=F('goal_id'), order_by=[F('at'), F('id')]))
+        .values('status', 'at', 'next_at')
+    )
+    sql, params = events.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT status, count(*), avg(extract(epoch FROM coalesce(next_at, %s) - at)) '
+            f'FROM ({sql}) events GROUP BY status ORDER BY status',
+            [min(until, timezone.now()), *params],
+        )
+        return [
+            {'status': status, 'transitions': transitions, 'avg_seconds': round(float(seconds), 1)}
+            for status, transitions, seconds in cursor.fetchall()
+        ]
@@ -0,0 +1,101 @@
+import json
+from typing import Iterator
+
+from django.conf import settings
+from django.db.models import QuerySet
+from rest_framework.utils.encoders import JSONEncoder
+
+from goals.models import Goal, GoalCategory, GoalComment
+from goals.readers import get_values_reader
+from goals.serializers import GoalCategoryWithUserSerializer, GoalCommentWithUserSerializer, GoalWithUserSerializer
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+}
+
+
+def export_sources(board_ids: list[int]) -> list[tuple[str, str, type, QuerySet]]:
+    """
+    Метод получения выгружаемых выборок: те же объекты, что отдают списки категорий, целей и комментариев.
+    Сортировка по id дает стабильный порядок без сортировки всей выборки по другим полям.
+    :param board_ids: Доски, доступные пользователю.
+    :return: Список (тип объекта, ключ в JSON, сериализатор, выборка).
+    """
+    return [
+        (
+            'category',
+            'categories',
+            GoalCategoryWithUserSerializer,
+            GoalCategory.objects.filter(board_id__in=board_ids, is_deleted=False).order_by('id'),
+        ),
+        (
+            'goal',
+            'goals',
+            GoalWithUserSerializer,
+            Goal.objects.filter(category__board_id__in=board_ids, category__is_deleted=False)
+            .exclude(status=Goal.Status.archived)
+            .order_by('id'),
+        ),
+        (
+            'comment',
+            'comments',
+            GoalCommentWithUserSerializer,
+            GoalComment.objects.filter(goal__category__board_id__in=board_ids).order_by('id'),
+        ),
+    ]
+
+
+def iter_rows(serializer_class: type, queryset: QuerySet, chunk_size: int) -> Iterator[dict]:
+    """
+    Метод чтения представлений объектов через серверный курсор: в памяти не больше chunk_size строк.
+    :param serializer_class:
+    :param queryset:
+    :param chunk_size:
+    :return:
+    """
+    reader = get_values_reader(serializer_class)
+    if reader is None:
+        for instance in queryset.iterator(chunk_size=chunk_size):
+            yield serializer_class(instance).data
+        return
+    for row in reader.values(queryset).iterator(chunk_size=chunk_size):
+        yield reader.to_representation(row)
+
+
+def export_goals(board_ids: list[int], export_format: str = 'ndjson', chunk_size: int | None = None) -> Iterator[str]:
+    """
+    Потоковая выгрузка категорий, целей и комментариев.
+    ndjson - по строке {"type": ..., "data": ...} на объект,
+    json - один объект {"categories": [...], "goals": [...], "comments": [...]}, отдаваемый частями.
+    Части объединяют до chunk_size объектов, чтобы не отправлять каждую строку отдельно.
+    :param board_ids: Доски, доступные пользователю.
+    :param export_format:
+    :param chunk_size:
+    :return:
+    """
+    chunk_size = chunk_size or settings.GOALS_EXPORT_CHUNK_SIZE
+    encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+    if export_format == 'json':
+        yield '{'
+    for index, (kind, key, serializer_class, queryset) in enumerate(export_sources(board_ids)):
+        if export_format == 'json':
+            yield f'{"," if index else ""}{json.dumps(key)}:['
+
+        buffer = []
+        for number, data in enumerate(iter_rows(serializer_class, queryset, chunk_size)):
+            if export_format == 'json':
+                buffer.append(f'{"," if number else ""}{encoder.encode(data)}')
+            else:
+                buffer.append(f'{encoder.encode({"type": kind, "data": data})}\n')
+            if len(buffer) >= chunk_size:
+                yield ''.join(buffer)
+                buffer = []
+        if buffer:
+            yield ''.join(buffer)
+
+        if export_format == 'json':
+            yield ']'
+    if export_format == 'json':
+        yield '}'
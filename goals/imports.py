@@ -0,0 +1,273 @@
+import csv
+import io
+import json
+import logging
+from pathlib import Path
+from typing import Callable, Iterator
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import close_old_connections, transaction
+from django.db.models import Model
+
+from goals.archive import get_executor
+from goals.counters import goal_key, update_goal_counters
+from goals.events import record_goal_events
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, ImportJob, ImportRef
+from goals.permission import invalidate_board_roles
+
+logger = logging.getLogger(__name__)
+
+# Поля моделей, которые читаются из строки файла. Кроме них в строке есть type, id и ссылка на родителя:
+# board у категории, category у цели - идентификаторы объектов из того же файла
+FIELDS = {
+    'board': (Board, ('title',)),
+    'category': (GoalCategory, ('title',)),
+    'goal': (Goal, ('title', 'description', 'due_date', 'status', 'priority')),
+}
+
+
+class ImportRowError(Exception):
+    pass
+
+
+def start_import(job: ImportJob) -> ImportJob:
+    """
+    Метод запуска импорта: небольшие файлы импортируются сразу, крупные - в фоновом потоке после фиксации транзакции.
+    :param job:
+    :return:
+    """
+    if job.size <= settings.GOALS_IMPORT_SYNC_LIMIT:
+        Importer(job).run()
+    else:
+        transaction.on_commit(lambda: get_executor().submit(run_import_in_background, job.id))
+    return job
+
+
+def run_import_in_background(job_id: int) -> None:
+    try:
+        Importer(ImportJob.objects.get(id=job_id)).run()
+    except Exception:
+        logger.exception('Import job %s failed', job_id)
+    finally:
+        close_old_connections()
+
+
+def read_rows(file: io.BufferedReader, file_format: str, position: int = 0) -> Iterator[tuple[int, dict | None]]:
+    """
+    Метод потокового чтения строк файла начиная с позиции position.
+    :param file: Файл, открытый в двоичном режиме.
+    :param file_format:
+    :param position: Смещение в байтах, с которого продолжается чтение.
+    :return: Пары (смещение конца строки, строка). None - строку не удалось разобрать.
+    """
+    offset = position
+
+    def lines() -> Iterator[str]:
+        nonlocal offset
+        for line in iter(file.readline, b''):
+            offset += len(line)
+            yield line.decode('utf-8-sig')
+
+    if file_format == ImportJob.Format.csv:
+        header = next(csv.reader([file.readline().decode('utf-8-sig')]), [])
+        if position:
+            file.seek(position)
+        else:
+            offset = file.tell()
+        # csv.reader читает следующую строку файла только когда нужна, поэтому offset - конец текущей записи
+        for values in csv.reader(lines()):
+            if values:
+                yield offset, dict(zip(header, values))
+        return
+
+    file.seek(position)
+    for line in lines():
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield offset, row if isinstance(row, dict) else None
+
+
+def clean_row(model: type[Model], row: dict, fields: tuple[str, ...]) -> dict:
+    """
+    Метод проверки и преобразования значений строки по полям модели.
+    Пустые значения заменяются значениями по умолчанию.
+    :param model:
+    :param row:
+    :param fields:
+    :return:
+    """
+    values = {}
+    for name in fields:
+        field = model._meta.get_field(name)
+        value = row.get(name)
+        if value in (None, ''):
+            if field.has_default() or field.null:
+                values[name] = field.get_default()
+                continue
+            value = ''
+        try:
+            values[name] = field.clean(value, None)
+        except ValidationError as error:
+            raise ImportRowError(f'{name}: {" ".join(error.messages)}')
+    return values
+
+
+class Importer:
+    """
+    Импорт досок, категорий и целей пакетами по GOALS_IMPORT_BATCH_SIZE строк.
+    Каждый пакет создается через bulk_create одной транзакцией вместе с прогрессом и ссылками
+    на созданные доски и категории, поэтому прерванный импорт продолжается с последнего пакета.
+    """
+
+    def __init__(self, job: ImportJob, progress: Callable[[ImportJob], None] | None = None):
+        self.job = job
+        self.progress = progress
+        self.refs: dict[int, dict[str, int]] = {kind: {} for kind in ImportRef.Kind}
+        for kind, external_id, object_id in job.refs.values_list('kind', 'external_id', 'object_id'):
+            self.refs[kind][external_id] = object_id
+
+    def run(self) -> None:
+        job = self.job
+        job.status = ImportJob.Status.running
+        job.save(update_fields=['status', 'updated'])
+        try:
+            with open(job.file, 'rb') as file:
+                batch = []
+                for offset, row in read_rows(file, job.format, job.position):
+                    batch.append(row)
+                    if len(batch) >= settings.GOALS_IMPORT_BATCH_SIZE:
+                        self.flush(batch, offset)
+                        batch = []
+                if batch:
+                    self.flush(batch, offset)
+        except Exception:
+            job.status = ImportJob.Status.failed
+            job.save(update_fields=['status', 'updated'])
+            raise
+
+        job.status = ImportJob.Status.done
+        job.save(update_fields=['status', 'updated'])
+        # Загруженные через API файлы больше не нужны, файлы команды импорта не удаляются
+        path = Path(job.file)
+        if path.parent == Path(settings.GOALS_IMPORT_DIR):
+            path.unlink(missing_ok=True)
+
+    def flush(self, rows: list[dict | None], offset: int) -> None:
+        """
+        Метод создания объектов пакета строк.
+        :param rows:
+        :param offset: Смещение конца последней строки пакета.
+        :return:
+        """
+        job = self.job
+        objects = {kind: [] for kind in FIELDS}
+        errors = []
+        for number, row in enumerate(rows, start=job.rows + 1):
+            try:
+                kind, instance, external_id, parent_id = self.parse(row)
+            except ImportRowError as error:
+                errors.append((number, str(error)))
+                continue
+            objects[kind].append((number, instance, external_id, parent_id))
+
+        with transaction.atomic():
+            boards = self.create(ImportRef.Kind.board, objects['board'], errors)
+            BoardParticipant.objects.bulk_create(
+                BoardParticipant(board=board, user_id=job.user_id, role=BoardParticipant.Role.owner) for board in boards
+            )
+            categories = self.create(
+                ImportRef.Kind.category, self.resolve(objects['category'], 'board', errors), errors
+            )
+            goals = Goal.objects.bulk_create(
+                instance for _, instance, _, _ in self.resolve(objects['goal'], 'category', errors)
+            )
+            # bulk_create не отправляет сигналы, поэтому счетчики и события обновляются явно
+            changes = [(goal.id, None, goal_key(goal)) for goal in goals]
+            update_goal_counters((old, new) for _, old, new in changes)
+            record_goal_events(changes)
+            if boards:
+                invalidate_board_roles(job.user_id)
+
+            job.position = offset
+            job.rows += len(rows)
+            job.imported += len(boards) + len(categories) + len(goals)
+            job.failed += len(errors)
+            free = settings.GOALS_IMPORT_MAX_ERRORS - len(job.errors)
+            job.errors += [{'row': number, 'error': error} for number, error in sorted(errors)[:max(free, 0)]]
+            job.save(update_fields=['position', 'rows', 'imported', 'failed', 'errors', 'updated'])
+
+        if self.progress:
+            self.progress(job)
+
+    def parse(self, row: dict | None) -> tuple[str, Model, str, str]:
+        """
+        Метод разбора строки в объект модели без сохранения.
+        :param row:
+        :return: Тип объекта, объект, идентификатор в файле и идентификатор родителя в файле.
+        """
+        if row is None:
+            raise ImportRowError('Строку не удалось разобрать')
+        kind = str(row.get('type') or '').strip()
+        if kind not in FIELDS:
+            raise ImportRowError(f'type: допустимые значения {", ".join(FIELDS)}')
+        model, fields = FIELDS[kind]
+        external_id = str(row.get('id') or '').strip()
+        if not external_id and kind != 'goal':
+            raise ImportRowError('id: обязательное поле')
+
+        instance = model(**clean_row(model, row, fields))
+        if kind != 'board':
+            instance.user_id = self.job.user_id
+        parent = {'category': 'board', 'goal': 'category'}.get(kind)
+        parent_id = str(row.get(parent) or '').strip() if parent else ''
+        if parent and not parent_id:
+            raise ImportRowError(f'{parent}: обязательное поле')
+        return kind, instance, external_id, parent_id
+
+    def resolve(self, items: list[tuple], parent: str, errors: list) -> list[tuple]:
+        """
+        Метод подстановки родительских объектов по идентификаторам из файла.
+        :param items:
+        :param parent: board или category.
+        :param errors: Список, в который добавляются строки с неизвестным родителем.
+        :return: Объекты, родитель которых найден.
+        """
+        refs = self.refs[ImportRef.Kind[parent]]
+        resolved = []
+        for number, instance, external_id, parent_id in items:
+            if parent_id not in refs:
+                errors.append((number, f'{parent}: объект {parent_id!r} не найден в файле'))
+                continue
+            setattr(instance, f'{parent}_id', refs[parent_id])
+            resolved.append((number, instance, external_id, parent_id))
+        return resolved
+
+    def create(self, kind: ImportRef.Kind, items: list[tuple], errors: list) -> list[Model]:
+        """
+        Метод создания досок или категорий и сохранения ссылок на них.
+        :param kind:
+        :param items:
+        :param errors: Список, в который добавляются строки с повторяющимся идентификатором.
+        :return: Созданные объекты.
+        """
+        refs = self.refs[kind]
+        unique = {}
+        for number, instance, external_id, _ in items:
+            if external_id in refs or external_id in unique:
+                errors.append((number, f'id: объект {external_id!r} уже есть в файле'))
+                continue
+            unique[external_id] = instance
+
+        model = FIELDS[kind.name][0]
+        created = model.objects.bulk_create(unique.values())
+        ImportRef.objects.bulk_create(
+            ImportRef(job=self.job, kind=kind, external_id=external_id, object_id=instance.id)
+            for external_id, instance in unique.items()
+        )
+        refs.update((external_id, instance.id) for external_id, instance in unique.items())
+        return created
@@ -0,0 +1,52 @@
+import logging
+from datetime import timedelta
+from typing import Iterator
+
+from django.db.models import Model
+from django.utils import timezone
+
+from goals.archive import run_job
+from goals.imports import Importer
+from goals.models import ArchiveJob, ImportJob
+
+logger = logging.getLogger(__name__)
+
+
+def claim_stale_jobs(model: type[Model], stale: timedelta) -> Iterator[Model]:
+    """
+    Метод выбора задач в очереди или выполняющихся, прогресс которых не менялся дольше stale:
+    их фоновый поток остановлен перезапуском процесса API.
+    Задача забирается атомарно обновлением updated, поэтому ее не продолжат одновременно два процесса.
+    :param model: ArchiveJob или ImportJob.
+    :param stale:
+    :return:
+    """
+    statuses = [ArchiveJob.Status.pending, ArchiveJob.Status.running]
+    threshold = timezone.now() - stale
+    stale_jobs = model.objects.filter(status__in=statuses, updated__lt=threshold)
+    for job_id in list(stale_jobs.order_by('id').values_list('id', flat=True)):
+        if stale_jobs.filter(id=job_id).update(updated=timezone.now()):
+            yield model.objects.get(id=job_id)
+
+
+def resume_stale_jobs(stale: timedelta) -> list[Model]:
+    """
+    Метод продолжения прерванных задач удаления и импорта.
+    Ошибка одной задачи не останавливает остальные: задача получает статус failed.
+    :param stale:
+    :return: Продолженные задачи.
+    """
+    resumed = []
+    for job in claim_stale_jobs(ArchiveJob, stale):
+        try:
+            run_job(job)
+        except Exception:
+            logger.exception('Archive job %s failed', job.id)
+        resumed.append(job)
+    for job in claim_stale_jobs(ImportJob, stale):
+        try:
+            Importer(job).run()
+        except Exception:
+            logger.exception('Import job %s failed', job.id)
+        resumed.append(job)
+    return resumed
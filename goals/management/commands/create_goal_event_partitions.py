@@ -0,0 +1,14 @@
+from django.core.management import BaseCommand
+
+from goals.events import create_partitions
+
+
+class Command(BaseCommand):
+    help = 'Create monthly partitions of the goal event log for the current and upcoming months (run monthly).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months', type=int, default=2, help='Number of months ahead to create partitions for.')
+
+    def handle(self, *args, **options):
+        for name in create_partitions(options['months']):
+            self.stdout.write(f'Created partition {name}')
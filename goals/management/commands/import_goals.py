@@ -0,0 +1,52 @@
+import os
+
+from django.core.management import BaseCommand, CommandError
+
+from core.models import User
+from goals.imports import Importer
+from goals.models import ImportJob
+
+
+class Command(BaseCommand):
+    help = 'Import boards, categories and goals from a CSV or NDJSON file, or resume an interrupted import.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', nargs='?', help='Path to the file.')
+        parser.add_argument('--user', help='Username of the owner of the imported boards.')
+        parser.add_argument('--type', choices=ImportJob.Format.values, help='File format, by default from extension.')
+        parser.add_argument('--resume', type=int, metavar='JOB_ID', help='Continue an interrupted import job.')
+
+    def handle(self, *args, **options):
+        if options['resume']:
+            job = ImportJob.objects.filter(id=options['resume']).exclude(status=ImportJob.Status.done).first()
+            if job is None:
+                raise CommandError(f'Unfinished import job {options["resume"]} not found')
+        else:
+            job = self.create_job(options)
+
+        self.stdout.write(f'Import job {job.id}: {job.file}')
+        Importer(job, progress=self.report).run()
+        self.report(job)
+
+    def create_job(self, options) -> ImportJob:
+        path = options['file']
+        if not path or not options['user']:
+            raise CommandError('Specify a file and --user, or --resume JOB_ID')
+        if not os.path.isfile(path):
+            raise CommandError(f'File {path} not found')
+        user = User.objects.filter(username=options['user']).first()
+        if user is None:
+            raise CommandError(f'User {options["user"]} not found')
+
+        file_format = options['type'] or (
+            ImportJob.Format.csv if path.lower().endswith('.csv') else ImportJob.Format.ndjson
+        )
+        return ImportJob.objects.create(
+            user=user, file=os.path.abspath(path), format=file_format, size=os.path.getsize(path)
+        )
+
+    def report(self, job: ImportJob) -> None:
+        percent = job.position * 100 // job.size if job.size else 100
+        self.stdout.write(
+            f'{percent:3d}% {job.rows} rows, {job.imported} objects imported, {job.failed} rows failed'
+        )
@@ -0,0 +1,37 @@
+import time
+from datetime import timedelta
+
+from django.core.management import BaseCommand
+from django.db import close_old_connections
+
+from goals.events import create_partitions
+from goals.jobs import resume_stale_jobs
+from goals.models import ArchiveJob
+
+
+class Command(BaseCommand):
+    help = (
+        'Resume pending or running archive and import jobs whose API process was restarted '
+        'and create goal event log partitions for the upcoming months.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stale', type=int, default=10, help='Minutes without progress after which a job is resumed.'
+        )
+        parser.add_argument(
+            '--interval', type=int, default=0, help='Check every INTERVAL seconds; 0 - check once and exit.'
+        )
+
+    def handle(self, *args, **options):
+        stale = timedelta(minutes=options['stale'])
+        while True:
+            for name in create_partitions():
+                self.stdout.write(f'Created partition {name}')
+            for job in resume_stale_jobs(stale):
+                kind = 'Archive' if isinstance(job, ArchiveJob) else 'Import'
+                self.stdout.write(f'{kind} job {job.id}: {job.get_status_display()}')
+            if not options['interval']:
+                return
+            close_old_connections()
+            time.sleep(options['interval'])
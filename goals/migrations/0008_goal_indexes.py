@@ -0,0 +1,41 @@
+# Generated by Django 4.2.2 on 2026-10-18 19:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0007_alter_goalcategory_board'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='board',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['title', 'id'], name='board_active_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='boardparticipant',
+            index=models.Index(fields=['user'], include=('board', 'role'), name='participant_user_roles_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status', 4), _negated=True), fields=['category', 'title', 'id'], name='goal_active_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status', 4), _negated=True), fields=['category', 'status', 'priority'], name='goal_active_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(condition=models.Q(models.Q(('status', 4), _negated=True), ('due_date__isnull', False)), fields=['due_date'], name='goal_active_due_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goalcategory',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['board', 'title', 'id'], name='category_active_board_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goalcomment',
+            index=models.Index(fields=['goal', '-created', '-id'], name='comment_goal_created_idx'),
+        ),
+    ]
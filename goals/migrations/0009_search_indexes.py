@@ -0,0 +1,25 @@
+# Generated by Django 4.2.2 on 2026-10-18 19:57
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+from goals.search import PostgresAddIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0008_goal_indexes'),
+    ]
+
+    operations = [
+        PostgresAddIndex(
+            model_name='goal',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('title', config='russian', weight='A'), '||', django.contrib.postgres.search.SearchVector('description', config='russian', weight='B'), django.contrib.postgres.search.SearchConfig('russian')), name='goal_search_idx'),
+        ),
+        PostgresAddIndex(
+            model_name='goalcategory',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('title', config='russian', weight='A'), name='category_search_idx'),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 4.2.2 on 2026-10-18 20:17
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def fill_counters(apps, schema_editor):
+    Goal = apps.get_model('goals', 'Goal')
+    GoalComment = apps.get_model('goals', 'GoalComment')
+    GoalCounter = apps.get_model('goals', 'GoalCounter')
+    CommentCounter = apps.get_model('goals', 'CommentCounter')
+
+    GoalCounter.objects.bulk_create(
+        GoalCounter(**row)
+        for row in Goal.objects.values('category_id', 'status', 'priority', 'due_date')
+        .annotate(goals=Count('id'))
+        .order_by()
+    )
+    CommentCounter.objects.bulk_create(
+        CommentCounter(category_id=row['goal__category_id'], comments=row['comments'])
+        for row in GoalComment.objects.values('goal__category_id').annotate(comments=Count('id')).order_by()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0010_archive_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GoalCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.PositiveSmallIntegerField(choices=[(1, 'К выполнению'), (2, 'В процессе'), (3, 'Выполнено'), (4, 'Архив')])),
+                ('priority', models.PositiveSmallIntegerField(choices=[(1, 'Низкий'), (2, 'Средний'), (3, 'Высокий'), (4, 'Критический')])),
+                ('due_date', models.DateField(blank=True, null=True)),
+                ('goals', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='goal_counters', to='goals.goalcategory')),
+            ],
+            options={
+                'verbose_name': 'Счетчик целей',
+                'verbose_name_plural': 'Счетчики целей',
+            },
+        ),
+        migrations.CreateModel(
+            name='CommentCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('comments', models.IntegerField(default=0)),
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='comment_counter', to='goals.goalcategory')),
+            ],
+            options={
+                'verbose_name': 'Счетчик комментариев',
+                'verbose_name_plural': 'Счетчики комментариев',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='goalcounter',
+            constraint=models.UniqueConstraint(condition=models.Q(('due_date__isnull', False)), fields=('category', 'status', 'priority', 'due_date'), name='goal_counter_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='goalcounter',
+            constraint=models.UniqueConstraint(condition=models.Q(('due_date__isnull', True)), fields=('category', 'status', 'priority'), name='goal_counter_no_due_date_unique'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.2 on 2026-10-18 20:37
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('goals', '0011_goal_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Дата последнего обновления')),
+                ('file', models.CharField(max_length=1024, verbose_name='Файл')),
+                ('format', models.CharField(choices=[('csv', 'CSV'), ('ndjson', 'NDJSON')], max_length=10, verbose_name='Формат')),
+                ('status', models.PositiveSmallIntegerField(choices=[(1, 'В очереди'), (2, 'Выполняется'), (3, 'Завершена'), (4, 'Ошибка')], default=1, verbose_name='Статус')),
+                ('size', models.PositiveBigIntegerField(default=0, verbose_name='Размер файла')),
+                ('position', models.PositiveBigIntegerField(default=0, verbose_name='Обработано байт')),
+                ('rows', models.PositiveIntegerField(default=0, verbose_name='Обработано строк')),
+                ('imported', models.PositiveIntegerField(default=0, verbose_name='Создано объектов')),
+                ('failed', models.PositiveIntegerField(default=0, verbose_name='Строк с ошибками')),
+                ('errors', models.JSONField(blank=True, default=list, verbose_name='Ошибки')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+            ],
+            options={
+                'verbose_name': 'Задача импорта',
+                'verbose_name_plural': 'Задачи импорта',
+            },
+        ),
+        migrations.CreateModel(
+            name='ImportRef',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.PositiveSmallIntegerField(choices=[(1, 'Доска'), (2, 'Категория')])),
+                ('external_id', models.CharField(max_length=255)),
+                ('object_id', models.BigIntegerField()),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='refs', to='goals.importjob')),
+            ],
+            options={
+                'verbose_name': 'Ссылка импорта',
+                'verbose_name_plural': 'Ссылки импорта',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='importref',
+            constraint=models.UniqueConstraint(fields=('job', 'kind', 'external_id'), name='import_ref_unique'),
+        ),
+    ]
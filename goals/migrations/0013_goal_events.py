@@ -0,0 +1,53 @@
+# Generated by Django 4.2.2 on 2026-10-18 20:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+# Колонки упорядочены по размеру (8, 8, 8, 4, 2, 2 байта), чтобы в строке не было выравнивания.
+# Первичный ключ секционированной таблицы должен включать ключ секционирования.
+# Внешнего ключа на goals_goal нет: запись события не проверяет цель, а события удаленных целей
+# удаляет сигнал post_delete.
+CREATE_TABLE = '''
+CREATE TABLE goals_goalevent (
+    id bigint GENERATED BY DEFAULT AS IDENTITY,
+    at timestamp with time zone NOT NULL,
+    goal_id bigint NOT NULL,
+    due_date date NULL,
+    status smallint NOT NULL CHECK (status >= 0),
+    priority smallint NOT NULL CHECK (priority >= 0),
+    PRIMARY KEY (at, id)
+) PARTITION BY RANGE (at);
+CREATE TABLE goals_goalevent_default PARTITION OF goals_goalevent DEFAULT;
+CREATE INDEX goal_event_goal_at_idx ON goals_goalevent (goal_id, at);
+INSERT INTO goals_goalevent (at, goal_id, due_date, status, priority)
+    SELECT updated, id, due_date, status, priority FROM goals_goal;
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0012_import_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GoalEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('goal', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='events', to='goals.goal')),
+                ('due_date', models.DateField(blank=True, null=True)),
+                ('status', models.PositiveSmallIntegerField(choices=[(1, 'К выполнению'), (2, 'В процессе'), (3, 'Выполнено'), (4, 'Архив')])),
+                ('priority', models.PositiveSmallIntegerField(choices=[(1, 'Низкий'), (2, 'Средний'), (3, 'Высокий'), (4, 'Критический')])),
+            ],
+            options={
+                'verbose_name': 'Событие цели',
+                'verbose_name_plural': 'События целей',
+                'db_table': 'goals_goalevent',
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(CREATE_TABLE, 'DROP TABLE goals_goalevent CASCADE;'),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+from goals.events import create_partitions
+
+
+def create_current_partitions(apps, schema_editor):
+    # Следующие месяцы добавляет сервис jobs (команда resume_jobs)
+    if schema_editor.connection.vendor == 'postgresql':
+        create_partitions(months_ahead=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0013_goal_events'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_current_partitions, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,9 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.utils import timezone
 
 from core.models import User
+from goals.search import build_search_vector
 from todolist.models import BaseModel
 
 
@@ -15,6 +18,9 @@ class Board(BaseModel):
     class Meta:
         verbose_name = "Доска"
         verbose_name_plural = "Доски"
+        indexes = [
+            models.Index(fields=["title", "id"], condition=models.Q(is_deleted=False), name="board_active_title_idx"),
+        ]
 
 
 class BoardParticipant(BaseModel):
@@ -40,6 +46,10 @@ class BoardParticipant(BaseModel):
         unique_together = ("board", "user")
         verbose_name = "Участник"
         verbose_name_plural = "Участники"
+        indexes = [
+            # Роли пользователя читаются только из индекса: {board_id: role}
+            models.Index(fields=["user"], include=["board", "role"], name="participant_user_roles_idx"),
+        ]
 
 
 class GoalCategory(BaseModel):
@@ -55,6 +65,12 @@ class GoalCategory(BaseModel):
     class Meta:
         verbose_name = "Категория"
         verbose_name_plural = "Категории"
+        indexes = [
+            models.Index(
+                fields=["board", "title", "id"], condition=models.Q(is_deleted=False), name="category_active_board_idx"
+            ),
+            GinIndex(build_search_vector("title"), name="category_search_idx"),
+        ]
 
 
 class Goal(BaseModel):
@@ -92,6 +108,25 @@ class Goal(BaseModel):
     class Meta:
         verbose_name = "Цель"
         verbose_name_plural = "Цели"
+        indexes = [
+            # Архивные цели (status=4) исключаются из всех списков, поэтому индексы частичные
+            models.Index(
+                fields=["category", "title", "id"],
+                condition=~models.Q(status=4),
+                name="goal_active_category_idx",
+            ),
+            models.Index(
+                fields=["category", "status", "priority"],
+                condition=~models.Q(status=4),
+                name="goal_active_status_idx",
+            ),
+            models.Index(
+                fields=["due_date"],
+                condition=~models.Q(status=4) & models.Q(due_date__isnull=False),
+                name="goal_active_due_date_idx",
+            ),
+            GinIndex(build_search_vector("title", "description"), name="goal_search_idx"),
+        ]
 
 
 class GoalComment(BaseModel):
@@ -106,3 +141,162 @@ class GoalComment(BaseModel):
     class Meta:
         verbose_name = "Комментарий"
         verbose_name_plural = "Комментарии"
+        indexes = [
+            models.Index(fields=["goal", "-created", "-id"], name="comment_goal_created_idx"),
+        ]
+
+
+class GoalEvent(models.Model):
+    """
+    Модель события изменения цели: состояние цели после создания или изменения статуса, приоритета или срока.
+    Таблица только пополняется и секционирована по месяцам поля at (goals.events), поэтому запросы
+    за период читают только нужные секции. Строка узкая: коды вместо текста, колонки упорядочены по размеру
+    без выравнивания.
+    Поля: at, goal, due_date, status, priority.
+    """
+    at = models.DateTimeField(default=timezone.now)
+    goal = models.ForeignKey(Goal, on_delete=models.DO_NOTHING, db_constraint=False, related_name="events")
+    due_date = models.DateField(null=True, blank=True)
+    status = models.PositiveSmallIntegerField(choices=Goal.Status.choices)
+    priority = models.PositiveSmallIntegerField(choices=Goal.Priority.choices)
+
+    class Meta:
+        # Секционированная таблица создается SQL в миграции 0013
+        managed = False
+        db_table = "goals_goalevent"
+        verbose_name = "Событие цели"
+        verbose_name_plural = "События целей"
+
+
+class ArchiveJob(BaseModel):
+    """
+    Модель задачи каскадного удаления доски или категории.
+    Поля: board, category, user(поле связанное с моделью User), status, total, processed.
+    """
+    class Status(models.IntegerChoices):
+        """
+        Класс статуса задачи.
+        """
+        pending = 1, "В очереди"
+        running = 2, "Выполняется"
+        done = 3, "Завершена"
+        failed = 4, "Ошибка"
+
+    board = models.ForeignKey(
+        Board, verbose_name="Доска", on_delete=models.PROTECT, null=True, blank=True, related_name="archive_jobs"
+    )
+    category = models.ForeignKey(
+        GoalCategory,
+        verbose_name="Категория",
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="archive_jobs",
+    )
+    user = models.ForeignKey(User, verbose_name="Автор", on_delete=models.PROTECT)
+    status = models.PositiveSmallIntegerField(verbose_name="Статус", choices=Status.choices, default=Status.pending)
+    total = models.PositiveIntegerField(verbose_name="Всего объектов", default=0)
+    processed = models.PositiveIntegerField(verbose_name="Обработано объектов", default=0)
+
+    class Meta:
+        verbose_name = "Задача удаления"
+        verbose_name_plural = "Задачи удаления"
+
+
+class ImportJob(BaseModel):
+    """
+    Модель задачи импорта досок, категорий и целей из файла CSV или NDJSON.
+    Поля: user(поле связанное с моделью User), file, format, status, size, position, rows, imported, failed, errors.
+    """
+    Status = ArchiveJob.Status
+
+    class Format(models.TextChoices):
+        """
+        Класс формата файла.
+        """
+        csv = "csv", "CSV"
+        ndjson = "ndjson", "NDJSON"
+
+    user = models.ForeignKey(User, verbose_name="Автор", on_delete=models.PROTECT)
+    file = models.CharField(verbose_name="Файл", max_length=1024)
+    format = models.CharField(verbose_name="Формат", max_length=10, choices=Format.choices)
+    status = models.PositiveSmallIntegerField(verbose_name="Статус", choices=Status.choices, default=Status.pending)
+    size = models.PositiveBigIntegerField(verbose_name="Размер файла", default=0)
+    position = models.PositiveBigIntegerField(verbose_name="Обработано байт", default=0)
+    rows = models.PositiveIntegerField(verbose_name="Обработано строк", default=0)
+    imported = models.PositiveIntegerField(verbose_name="Создано объектов", default=0)
+    failed = models.PositiveIntegerField(verbose_name="Строк с ошибками", default=0)
+    errors = models.JSONField(verbose_name="Ошибки", default=list, blank=True)
+
+    class Meta:
+        verbose_name = "Задача импорта"
+        verbose_name_plural = "Задачи импорта"
+
+
+class ImportRef(models.Model):
+    """
+    Модель соответствия идентификатора объекта в файле импорта и созданного объекта.
+    Нужна для продолжения прерванного импорта: ссылки на уже созданные доски и категории восстанавливаются из нее.
+    Поля: job, kind, external_id, object_id.
+    """
+    class Kind(models.IntegerChoices):
+        """
+        Класс типа объекта.
+        """
+        board = 1, "Доска"
+        category = 2, "Категория"
+
+    job = models.ForeignKey(ImportJob, on_delete=models.CASCADE, related_name="refs")
+    kind = models.PositiveSmallIntegerField(choices=Kind.choices)
+    external_id = models.CharField(max_length=255)
+    object_id = models.BigIntegerField()
+
+    class Meta:
+        verbose_name = "Ссылка импорта"
+        verbose_name_plural = "Ссылки импорта"
+        constraints = [
+            models.UniqueConstraint(fields=["job", "kind", "external_id"], name="import_ref_unique"),
+        ]
+
+
+class GoalCounter(models.Model):
+    """
+    Модель счетчика целей категории с одинаковыми статусом, приоритетом и сроком.
+    Поддерживается инкрементально при изменении целей (goals.counters).
+    Поля: category, status, priority, due_date, goals.
+    """
+    category = models.ForeignKey(GoalCategory, on_delete=models.CASCADE, related_name="goal_counters")
+    status = models.PositiveSmallIntegerField(choices=Goal.Status.choices)
+    priority = models.PositiveSmallIntegerField(choices=Goal.Priority.choices)
+    due_date = models.DateField(null=True, blank=True)
+    goals = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Счетчик целей"
+        verbose_name_plural = "Счетчики целей"
+        constraints = [
+            # NULL в уникальном ограничении не равен NULL, поэтому цели без срока ограничиваются отдельно
+            models.UniqueConstraint(
+                fields=["category", "status", "priority", "due_date"],
+                condition=models.Q(due_date__isnull=False),
+                name="goal_counter_unique",
+            ),
+            models.UniqueConstraint(
+                fields=["category", "status", "priority"],
+                condition=models.Q(due_date__isnull=True),
+                name="goal_counter_no_due_date_unique",
+            ),
+        ]
+
+
+class CommentCounter(models.Model):
+    """
+    Модель счетчика комментариев к целям категории.
+    Поля: category, comments.
+    """
+    category = models.OneToOneField(GoalCategory, on_delete=models.CASCADE, related_name="comment_counter")
+    comments = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Счетчик комментариев"
+        verbose_name_plural = "Счетчики комментариев"
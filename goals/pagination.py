@@ -0,0 +1,159 @@
+import json
+from base64 import b64decode, b64encode
+from collections import namedtuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.utils.urls import replace_query_param
+
+Keyset = namedtuple('Keyset', ['value', 'pk', 'reverse'])
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Пагинация по ключу (keyset).
+    Страница выбирается условием по полю сортировки и id, поэтому время выборки не зависит от глубины.
+    """
+    page_size = 20
+    page_size_query_param = 'limit'
+    max_page_size = 100
+    ordering = '-created'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+
+        ordering = self.get_ordering(request, queryset, view)[0]
+        self.field = ordering.lstrip('-')
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+
+        # Дубли значений поля сортировки разрешаются по id в том же направлении
+        descending = ordering.startswith('-') != reverse
+        lookup = 'lt' if descending else 'gt'
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(f'{prefix}{self.field}', f'{prefix}pk')
+
+        if self.cursor is not None:
+            value = self.to_field_value(queryset.model, self.cursor.value)
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}': value}) | Q(**{self.field: value, f'pk__{lookup}': self.cursor.pk})
+            )
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+
+        if self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_keyset(self.page[-1], reverse=False))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.get_keyset(self.page[0], reverse=True))
+
+    def get_keyset(self, instance, reverse: bool) -> Keyset:
+        """
+        Метод получения ключа страницы по граничному объекту.
+        :param instance: Объект или строка .values().
+        :param reverse:
+        :return:
+        """
+        # Страница может состоять из строк .values() (goals.readers)
+        if isinstance(instance, dict):
+            value, pk = instance[self.field], instance['id']
+        else:
+            value, pk = instance.serializable_value(self.field), instance.pk
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        return Keyset(value=value, pk=pk, reverse=reverse)
+
+    def to_field_value(self, model, value):
+        """
+        Метод приведения значения из курсора к типу поля сортировки.
+        :param model:
+        :param value:
+        :return:
+        """
+        try:
+            return model._meta.get_field(self.field).to_python(value)
+        except ValidationError:
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, keyset: Keyset) -> str:
+        data = json.dumps([keyset.value, keyset.pk, int(keyset.reverse)])
+        encoded = b64encode(data.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request) -> Keyset | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            value, pk, reverse = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+            return Keyset(value=value, pk=int(pk), reverse=bool(reverse))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class LimitOffsetKeysetPagination(LimitOffsetPagination):
+    """
+    Пагинация по смещению с включаемым режимом keyset (?pagination=cursor).
+    """
+    mode_query_param = 'pagination'
+    keyset_class = KeysetPagination
+    keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        keyset = self.keyset_class()
+        mode = request.query_params.get(self.mode_query_param)
+        if mode == 'cursor' or keyset.cursor_query_param in request.query_params:
+            self.keyset = keyset
+            page = keyset.paginate_queryset(queryset, request, view)
+            self.display_page_controls = keyset.display_page_controls
+            return page
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.keyset is not None:
+            return self.keyset.to_html()
+        return super().to_html()
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        return parameters + [
+            {
+                'name': self.mode_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Pagination mode: "cursor" switches to keyset pagination.',
+                'schema': {'type': 'string', 'enum': ['cursor']},
+            },
+            {
+                'name': self.keyset_class.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': self.keyset_class.cursor_query_description,
+                'schema': {'type': 'string'},
+            },
+        ]
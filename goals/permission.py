@@ -1,3 +1,6 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
 from rest_framework import permissions
 from rest_framework.generics import GenericAPIView
 from rest_framework.permissions import IsAuthenticated
@@ -5,6 +8,86 @@ from rest_framework.request import Request
 
 from goals.models import GoalCategory, Goal, GoalComment, Board, BoardParticipant
 
+EDIT_ROLES = (BoardParticipant.Role.owner, BoardParticipant.Role.writer)
+
+
+def board_roles_cache_key(user_id: int) -> str:
+    return f'board_roles:{user_id}'
+
+
+def get_user_board_roles(user_id: int) -> dict[int, int]:
+    """
+    Метод получения ролей пользователя на неудаленных досках из общего кеша.
+    При промахе словарь загружается одним запросом из основной БД (не с реплики, которая может отставать)
+    и сохраняется в кеш.
+    :param user_id:
+    :return:
+    """
+    key = board_roles_cache_key(user_id)
+    roles = cache.get(key)
+    if roles is None:
+        participants = BoardParticipant.objects.using(DEFAULT_DB_ALIAS)
+        roles = dict(
+            participants.filter(user_id=user_id, board__is_deleted=False).values_list('board_id', 'role')
+        )
+        cache.set(key, roles, settings.BOARD_ROLES_CACHE_TIMEOUT)
+    return roles
+
+
+def invalidate_board_roles(*user_ids: int) -> None:
+    """
+    Метод сброса ролей пользователей в общем кеше.
+    Кеш в памяти процесса (SHARED_CACHE = false) сбрасывается только в текущем процессе, в остальных роли
+    обновятся через BOARD_ROLES_CACHE_TIMEOUT.
+    Сброс выполняется сразу и повторно после фиксации транзакции, чтобы в кеш не попали незафиксированные данные.
+    :param user_ids:
+    :return:
+    """
+    keys = [board_roles_cache_key(user_id) for user_id in set(user_ids)]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def get_board_roles(request: Request) -> dict[int, int]:
+    """
+    Метод получения ролей пользователя на досках в виде словаря {board_id: role}.
+    Словарь берется из общего кеша и хранится на объекте запроса до его окончания.
+    :param request:
+    :return:
+    """
+    http_request = getattr(request, '_request', request)
+    roles = getattr(http_request, '_board_roles', None)
+    if roles is None:
+        roles = get_user_board_roles(request.user.id)
+        http_request._board_roles = roles
+    return roles
+
+
+def reset_board_roles(request: Request) -> None:
+    """
+    Метод сброса ролей пользователя, сохраненных на объекте запроса.
+    :param request:
+    :return:
+    """
+    http_request = getattr(request, '_request', request)
+    http_request._board_roles = None
+
+
+def has_board_role(request: Request, board_id: int, *roles: int) -> bool:
+    """
+    Метод проверки участия пользователя в доске.
+    :param request:
+    :param board_id:
+    :param roles: Допустимые роли. Если не переданы, достаточно любого участия.
+    :return:
+    """
+    role = get_board_roles(request).get(board_id)
+    if role is None:
+        return False
+    return not roles or role in roles
+
 
 class BoardPermission(IsAuthenticated):
     def has_object_permission(self, request: Request, view: GenericAPIView, obj: Board) -> bool:
@@ -18,8 +101,8 @@ class BoardPermission(IsAuthenticated):
         if not request.user.is_authenticated:
             return False
         if request.method in permissions.SAFE_METHODS:
-            return BoardParticipant.objects.filter(user=request.user, board=obj).exists()
-        return BoardParticipant.objects.filter(user=request.user, board=obj, role=BoardParticipant.Role.owner).exists()
+            return has_board_role(request, obj.id)
+        return has_board_role(request, obj.id, BoardParticipant.Role.owner)
 
 
 class GoalCategoryPermission(IsAuthenticated):
@@ -34,10 +117,8 @@ class GoalCategoryPermission(IsAuthenticated):
         if not request.user.is_authenticated:
             return False
         if request.method in permissions.SAFE_METHODS:
-            return BoardParticipant.objects.filter(user=request.user, board=obj.board).exists()
-        return BoardParticipant.objects.filter(
-            user=request.user, board=obj.board, role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer]
-        ).exists()
+            return has_board_role(request, obj.board_id)
+        return has_board_role(request, obj.board_id, *EDIT_ROLES)
 
 
 class GoalPermission(IsAuthenticated):
@@ -52,12 +133,8 @@ class GoalPermission(IsAuthenticated):
         if not request.user.is_authenticated:
             return False
         if request.method in permissions.SAFE_METHODS:
-            return BoardParticipant.objects.filter(user=request.user, board__categories=obj.category).exists()
-        return BoardParticipant.objects.filter(
-            user=request.user,
-            board__categories=obj.category,
-            role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer],
-        ).exists()
+            return has_board_role(request, obj.category.board_id)
+        return has_board_role(request, obj.category.board_id, *EDIT_ROLES)
 
 
 class GoalCommentPermission(IsAuthenticated):
@@ -72,6 +149,6 @@ class GoalCommentPermission(IsAuthenticated):
         if not request.user.is_authenticated:
             return False
         if request.method in permissions.SAFE_METHODS:
-            return BoardParticipant.objects.filter(user=request.user, board__categories__goals=obj.goal).exists()
+            return has_board_role(request, obj.goal.category.board_id)
         else:
             return request.user == obj.user
@@ -0,0 +1,153 @@
+from typing import Any, Callable
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from goals.cache import CachedRepresentationMixin, representation_cache
+
+# Поля, значение которых из .values() уже совпадает с результатом to_representation
+IDENTITY_FIELDS = (
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+class UnsupportedSerializer(Exception):
+    """
+    Сериализатор содержит поля, которые нельзя прочитать из .values().
+    """
+
+
+class ValuesReader:
+    """
+    Быстрое чтение списка: строки .values() преобразуются в словари по заранее вычисленным
+    описаниям полей сериализатора, без создания объектов моделей и обхода полей DRF.
+    Результат совпадает с выводом сериализатора.
+    """
+
+    def __init__(self, serializer: serializers.ModelSerializer, prefix: str = ''):
+        self.columns: list[tuple[str, str, Callable | None, 'ValuesReader | None']] = []
+        model = serializer.Meta.model
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            source = field.source
+            if '.' in source or source == '*':
+                raise UnsupportedSerializer(f'Unsupported source {source!r}')
+            try:
+                model_field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                if hasattr(model, source) or field.required:
+                    raise UnsupportedSerializer(f'Unsupported field {name!r}')
+                # Атрибута нет у объекта, а поле необязательное: сериализатор его пропускает (SkipField)
+                continue
+
+            if isinstance(field, serializers.ModelSerializer):
+                nested = ValuesReader(field, prefix=f'{prefix}{source}__')
+                self.columns.append((name, f'{prefix}{source}__{model_field.target_field.name}', None, nested))
+            elif isinstance(field, serializers.BaseSerializer):
+                raise UnsupportedSerializer(f'Unsupported nested field {name!r}')
+            else:
+                convert = None if isinstance(field, IDENTITY_FIELDS) else field.to_representation
+                self.columns.append((name, f'{prefix}{model_field.attname}', convert, None))
+
+        # Ключ кеша представлений строится так же, как в CachedRepresentationMixin: (класс сериализатора, pk,
+        # updated, значения вложенных объектов), поэтому строки списка и объекты делят записи кеша
+        self.cache_class = None
+        self.pk_path = f'{prefix}{model._meta.pk.attname}'
+        paths = {path for _, path, _, nested in self.columns if nested is None}
+        if isinstance(serializer, CachedRepresentationMixin) and {self.pk_path, f'{prefix}updated'} <= paths:
+            self.cache_class = type(serializer)
+
+    @property
+    def paths(self) -> list[str]:
+        paths = []
+        for _, path, _, nested in self.columns:
+            paths.extend(nested.paths if nested else [path])
+        return paths
+
+    def values(self, queryset: QuerySet) -> QuerySet:
+        return queryset.values(*self.paths)
+
+    def to_representation(self, row: dict[str, Any]) -> dict:
+        data = {}
+        for name, path, convert, nested in self.columns:
+            value = row[path]
+            if value is None:
+                data[name] = None
+            elif nested is not None:
+                data[name] = nested.to_representation(row)
+            else:
+                data[name] = convert(value) if convert else value
+        return data
+
+    def cached_representation(self, row: dict[str, Any]) -> dict:
+        """
+        Метод получения представления строки из кеша представлений (goals.cache), если сериализатор
+        использует CachedRepresentationMixin.
+        :param row:
+        :return:
+        """
+        if self.cache_class is None:
+            return self.to_representation(row)
+        key = (self.cache_class, row[self.pk_path], row['updated'], *self.nested_versions(row))
+        data = representation_cache.get(key)
+        if data is None:
+            data = self.to_representation(row)
+            representation_cache.set(key, data)
+        # Копия защищает закешированное представление от изменения вызывающим кодом
+        return data.copy()
+
+    def nested_versions(self, row: dict[str, Any]) -> list[tuple]:
+        versions = []
+        for name, path, _, nested in self.columns:
+            if nested is None:
+                continue
+            if row[path] is None:
+                versions.append((name,))
+            else:
+                versions.append((name, *(row[nested_path] for _, nested_path, _, _ in nested.columns)))
+        return versions
+
+
+_readers: dict[type, ValuesReader | None] = {}
+
+
+def get_values_reader(serializer_class: type[serializers.ModelSerializer]) -> ValuesReader | None:
+    """
+    Метод получения быстрого чтения для сериализатора. Описание полей вычисляется один раз на класс.
+    :param serializer_class:
+    :return: None, если сериализатор содержит поля, которые нельзя прочитать из .values().
+    """
+    if serializer_class not in _readers:
+        try:
+            _readers[serializer_class] = ValuesReader(serializer_class())
+        except UnsupportedSerializer:
+            _readers[serializer_class] = None
+    return _readers[serializer_class]
+
+
+class ValuesListMixin:
+    """
+    Примесь к ListAPIView: список читается через .values() и ValuesReader, представления строк
+    берутся из кеша представлений.
+    Если сериализатор не поддерживается, используется обычный list().
+    """
+
+    def list(self, request, *args, **kwargs):
+        reader = get_values_reader(self.get_serializer_class())
+        if reader is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = reader.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response([reader.cached_representation(row) for row in page])
+        return Response([reader.cached_representation(row) for row in rows])
+
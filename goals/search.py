@@ -0,0 +1,134 @@
+import re
+from collections import defaultdict
+from typing import Iterable
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import Case, FloatField, Value, When
+from django.db.migrations import AddIndex
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+WEIGHTS = ('A', 'B', 'C', 'D')
+# Веса ts_rank по умолчанию для A, B, C, D
+RANK_WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+TOKEN = re.compile(r'\w+')
+# Конфигурация полнотекстового поиска PostgreSQL. Входит в выражение GIN-индексов (миграция 0009_search_indexes),
+# поэтому при изменении нужна новая миграция индексов, иначе запросы перестанут использовать индекс
+SEARCH_CONFIG = 'russian'
+
+
+def build_search_vector(*fields: str) -> SearchVector:
+    """
+    Метод построения поискового вектора: первое поле получает вес A, второе B и т.д.
+    Используется и в GIN-индексе, и в запросе, поэтому выражения совпадают и индекс применяется.
+    :param fields:
+    :return:
+    """
+    vectors = [
+        SearchVector(field, weight=weight, config=SEARCH_CONFIG) for field, weight in zip(fields, WEIGHTS)
+    ]
+    vector = vectors[0]
+    for item in vectors[1:]:
+        vector = vector + item
+    return vector
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN.findall(text.lower())
+
+
+class InvertedIndex:
+    """
+    Инвертированный индекс в памяти для БД без полнотекстового поиска (например, SQLite).
+    Термы запроса сопоставляются с префиксами слов, все термы должны найтись.
+    """
+
+    def __init__(self, rows: Iterable[tuple[int, dict[str, str]]], weights: dict[str, float]):
+        self.postings: dict[str, dict[int, float]] = defaultdict(lambda: defaultdict(float))
+        for pk, fields in rows:
+            for field, text in fields.items():
+                for token in tokenize(text or ''):
+                    self.postings[token][pk] += weights[field]
+
+    def search(self, query: str) -> dict[int, float]:
+        """
+        Метод поиска по индексу.
+        :param query:
+        :return: Словарь {pk: score}.
+        """
+        scores = None
+        for term in tokenize(query):
+            matches = defaultdict(float)
+            for token, postings in self.postings.items():
+                if token.startswith(term):
+                    for pk, score in postings.items():
+                        matches[pk] += score
+            if scores is None:
+                scores = matches
+            else:
+                scores = {pk: scores[pk] + score for pk, score in matches.items() if pk in scores}
+        return dict(scores or {})
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    Полнотекстовый поиск по search_fields представления с сортировкой по релевантности.
+    На PostgreSQL используется websearch_to_tsquery и GIN-индекс, на остальных БД - InvertedIndex.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        query = request.query_params.get(self.search_param, '').strip()
+        if not search_fields or not query:
+            return queryset
+
+        if connections[queryset.db].vendor == 'postgresql':
+            search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+            vector = build_search_vector(*search_fields)
+            queryset = queryset.annotate(search_vector=vector, search_rank=SearchRank(vector, search_query)).filter(
+                search_vector=search_query
+            )
+        else:
+            weights = {field: RANK_WEIGHTS[weight] for field, weight in zip(search_fields, WEIGHTS)}
+            rows = ((row[0], dict(zip(search_fields, row[1:]))) for row in queryset.values_list('pk', *search_fields))
+            scores = InvertedIndex(rows, weights).search(query)
+            queryset = queryset.filter(pk__in=scores.keys()).annotate(
+                search_rank=Case(
+                    *(When(pk=pk, then=Value(score)) for pk, score in scores.items()),
+                    default=Value(0.0),
+                    output_field=FloatField(),
+                )
+            )
+
+        # Явно заданная клиентом сортировка важнее релевантности
+        if not request.query_params.get(self.get_ordering_param(view)):
+            queryset = queryset.order_by('-search_rank', *queryset.query.order_by)
+        return queryset
+
+
+    @staticmethod
+    def get_ordering_param(view) -> str:
+        """
+        Метод получения параметра сортировки: из OrderingFilter представления, иначе из настроек DRF.
+        :param view:
+        :return:
+        """
+        for backend in getattr(view, 'filter_backends', []):
+            if issubclass(backend, filters.OrderingFilter):
+                return backend.ordering_param
+        return api_settings.ORDERING_PARAM
+
+
+class PostgresAddIndex(AddIndex):
+    """
+    Добавление индекса только на PostgreSQL: GIN-индексы по tsvector на других БД не создаются.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
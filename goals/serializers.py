@@ -1,12 +1,17 @@
+from datetime import timedelta
+
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import models, transaction
+from django.utils import timezone
 from requests import Request
 from rest_framework import serializers
 from rest_framework.exceptions import PermissionDenied
 
 from core.models import User
 from core.serializers import UserSerializer
-from goals.models import GoalCategory, GoalComment, Goal, Board, BoardParticipant
+from goals.cache import CachedRepresentationMixin
+from goals.models import ArchiveJob, GoalCategory, GoalComment, Goal, GoalEvent, Board, BoardParticipant, ImportJob
+from goals.permission import EDIT_ROLES, has_board_role, invalidate_board_roles, reset_board_roles
 
 
 class BoardCreateSerializer(serializers.ModelSerializer):
@@ -34,17 +39,64 @@ class BoardCreateSerializer(serializers.ModelSerializer):
         return board
 
 
+class UsernameField(serializers.SlugRelatedField):
+    """
+    Поле пользователя по username. Для списка участников пользователи загружаются одним запросом через prefetch().
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('slug_field', 'username')
+        kwargs.setdefault('queryset', User.objects.all())
+        super().__init__(**kwargs)
+        self.prefetched: dict[str, User] | None = None
+
+    def prefetch(self, usernames) -> None:
+        """
+        Метод загрузки пользователей по списку username.
+        :param usernames:
+        :return:
+        """
+        usernames = {username for username in usernames if isinstance(username, str)}
+        self.prefetched = self.get_queryset().in_bulk(usernames, field_name=self.slug_field)
+
+    def to_internal_value(self, data):
+        if self.prefetched is None or not isinstance(data, str):
+            return super().to_internal_value(data)
+        if data not in self.prefetched:
+            self.fail('does_not_exist', slug_name=self.slug_field, value=data)
+        return self.prefetched[data]
+
+
+class BoardParticipantListSerializer(serializers.ListSerializer):
+    """
+    Сериализатор списка участников доски с постоянным числом запросов при чтении и записи.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.child.fields['user'].prefetch(item.get('user') for item in data if isinstance(item, dict))
+        return super().to_internal_value(data)
+
+    def to_representation(self, data):
+        participants = data.all() if isinstance(data, models.manager.BaseManager) else data
+        # Без prefetch_related (например, после обновления) пользователи загружаются тем же запросом
+        if isinstance(participants, models.QuerySet) and participants._result_cache is None:
+            participants = participants.select_related('user')
+        return super().to_representation(participants)
+
+
 class BoardParticipantSerializer(serializers.ModelSerializer):
     """
     Сериализатор доски с участниками.
     """
     role = serializers.ChoiceField(required=True, choices=BoardParticipant.editable_roles)
-    user = serializers.SlugRelatedField(slug_field="username", queryset=User.objects.all())
+    user = UsernameField()
 
     class Meta:
         model = BoardParticipant
         fields = "__all__"
         read_only_fields = ("id", "created", "updated", "board")
+        list_serializer_class = BoardParticipantListSerializer
 
 
 class BoardWithParticipantsSerializer(serializers.ModelSerializer):
@@ -60,7 +112,7 @@ class BoardWithParticipantsSerializer(serializers.ModelSerializer):
 
     def update(self, instance: Board, validated_data: dict):
         """
-        Метод обновления участников доски.
+        Метод обновления доски и ее участников.
         :param instance:
         :param validated_data:
         :return:
@@ -68,12 +120,9 @@ class BoardWithParticipantsSerializer(serializers.ModelSerializer):
         request: Request = self.context['request']
 
         with transaction.atomic():
-            BoardParticipant.objects.filter(board=instance).exclude(user=request.user).delete()
-            participants = [
-                BoardParticipant(user=participant['user'], role=participant['role'], board=instance)
-                for participant in validated_data.get('participants', [])
-            ]
-            BoardParticipant.objects.bulk_create(participants, ignore_conflicts=True)
+            if 'participants' in validated_data:
+                self.update_participants(instance, validated_data['participants'], request.user)
+                reset_board_roles(request)
 
             if title := validated_data.get("title"):
                 instance.title = title
@@ -82,6 +131,48 @@ class BoardWithParticipantsSerializer(serializers.ModelSerializer):
 
             return instance
 
+    @staticmethod
+    def update_participants(board: Board, participants: list[dict], user: User) -> None:
+        """
+        Метод синхронизации участников доски со списком: изменяются только добавленные, удаленные
+        и сменившие роль участники. Число запросов не зависит от размера доски.
+        Участие пользователя, выполняющего запрос, не изменяется.
+        :param board:
+        :param participants:
+        :param user: Пользователь, выполняющий запрос.
+        :return:
+        """
+        roles = {participant['user'].id: participant['role'] for participant in participants}
+        roles.pop(user.id, None)
+        current = BoardParticipant.objects.filter(board=board).exclude(user=user).only('id', 'user', 'role')
+        existing = {participant.user_id: participant for participant in current}
+
+        removed = [participant.id for user_id, participant in existing.items() if user_id not in roles]
+        added = [
+            BoardParticipant(board=board, user_id=user_id, role=role)
+            for user_id, role in roles.items()
+            if user_id not in existing
+        ]
+        changed = [
+            participant
+            for user_id, participant in existing.items()
+            if user_id in roles and participant.role != roles[user_id]
+        ]
+
+        now = timezone.now()
+        for participant in changed:
+            participant.role = roles[participant.user_id]
+            participant.updated = now
+
+        if removed:
+            BoardParticipant.objects.filter(id__in=removed).delete()
+        if added:
+            BoardParticipant.objects.bulk_create(added, ignore_conflicts=True)
+        if changed:
+            BoardParticipant.objects.bulk_update(changed, fields=['role', 'updated'])
+        # bulk_create и bulk_update не отправляют сигналы, поэтому кеш ролей сбрасываем явно
+        invalidate_board_roles(*(participant.user_id for participant in added + changed))
+
 
 class GoalCategorySerializer(serializers.ModelSerializer):
     """
@@ -98,11 +189,7 @@ class GoalCategorySerializer(serializers.ModelSerializer):
         if board.is_deleted:
             raise ValidationError('Board not exist!')
 
-        if not BoardParticipant.objects.filter(
-            board_id=board.id,
-            user_id=self.context['request'].user.id,
-            role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer]
-        ).exists():
+        if not has_board_role(self.context['request'], board.id, *EDIT_ROLES):
             raise PermissionDenied
 
         return board
@@ -113,7 +200,7 @@ class GoalCategorySerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class GoalCategoryWithUserSerializer(GoalCategorySerializer):
+class GoalCategoryWithUserSerializer(CachedRepresentationMixin, GoalCategorySerializer):
     user = UserSerializer(read_only=True)
 
 
@@ -136,20 +223,49 @@ class GoalSerializer(serializers.ModelSerializer):
         """
         if category.is_deleted:
             raise ValidationError('Category not exist!')
-        if not BoardParticipant.objects.filter(
-                board_id=category.board_id,
-                user_id=self.context['request'].user.id,
-                role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer]
-        ).exists():
+        if not has_board_role(self.context['request'], category.board_id, *EDIT_ROLES):
             raise PermissionDenied
 
         return category
 
 
-class GoalWithUserSerializer(GoalSerializer):
+class GoalWithUserSerializer(CachedRepresentationMixin, GoalSerializer):
     user = UserSerializer(read_only=True)
 
 
+class GoalBulkCreateSerializer(serializers.ModelSerializer):
+    """
+    Сериализатор цели в пакетном создании.
+    Категории загружаются и проверяются представлением один раз для всего пакета.
+    """
+    category = serializers.IntegerField()
+
+    class Meta:
+        model = Goal
+        fields = ("title", "description", "category", "due_date", "status", "priority")
+
+
+class GoalBulkUpdateSerializer(serializers.Serializer):
+    """
+    Сериализатор изменения статуса и приоритета цели в пакетном обновлении.
+    """
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Goal.Status.choices, required=False)
+    priority = serializers.ChoiceField(choices=Goal.Priority.choices, required=False)
+
+    def validate(self, attrs: dict):
+        if 'status' not in attrs and 'priority' not in attrs:
+            raise ValidationError('Nothing to update!')
+        return attrs
+
+
+class GoalBulkArchiveSerializer(serializers.Serializer):
+    """
+    Сериализатор пакетной архивации целей.
+    """
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+
 class GoalCommentSerializer(serializers.ModelSerializer):
     """
     Сериализатор комментария цели.
@@ -169,16 +285,73 @@ class GoalCommentSerializer(serializers.ModelSerializer):
         """
         if goal.status == Goal.Status.archived:
             raise ValidationError('Goal not found!')
-        if not BoardParticipant.objects.filter(
-                board_id=goal.category.board_id,
-                user_id=self.context['request'].user.id,
-                role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer]
-        ).exists():
+        if not has_board_role(self.context['request'], goal.category.board_id, *EDIT_ROLES):
             raise PermissionDenied
 
         return goal
 
 
-class GoalCommentWithUserSerializer(GoalCommentSerializer):
+class GoalCommentWithUserSerializer(CachedRepresentationMixin, GoalCommentSerializer):
     user = UserSerializer(read_only=True)
     goals = serializers.PrimaryKeyRelatedField(read_only=True)
+
+
+class ArchiveJobSerializer(serializers.ModelSerializer):
+    """
+    Сериализатор задачи удаления доски или категории.
+    """
+    class Meta:
+        model = ArchiveJob
+        fields = ("id", "board", "category", "status", "total", "processed", "created", "updated")
+        read_only_fields = fields
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """
+    Сериализатор задачи импорта.
+    """
+    class Meta:
+        model = ImportJob
+        fields = (
+            "id", "format", "status", "size", "position", "rows", "imported", "failed", "errors", "created", "updated"
+        )
+        read_only_fields = fields
+
+
+class ImportUploadSerializer(serializers.Serializer):
+    """
+    Сериализатор загрузки файла импорта. Формат по умолчанию определяется по расширению файла.
+    """
+    file = serializers.FileField()
+    type = serializers.ChoiceField(choices=ImportJob.Format.choices, required=False)
+
+    def validate(self, attrs):
+        if 'type' not in attrs:
+            suffix = attrs['file'].name.rsplit('.', 1)[-1].lower()
+            attrs['type'] = ImportJob.Format.csv if suffix == 'csv' else ImportJob.Format.ndjson
+        return attrs
+
+
+class GoalEventSerializer(serializers.ModelSerializer):
+    """
+    Сериализатор события цели.
+    """
+    class Meta:
+        model = GoalEvent
+        fields = ("at", "status", "priority", "due_date")
+        read_only_fields = fields
+
+
+class CycleTimeQuerySerializer(serializers.Serializer):
+    """
+    Сериализатор периода расчета времени в статусах. По умолчанию - последние 30 дней.
+    """
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        attrs.setdefault("until", timezone.now())
+        attrs.setdefault("since", attrs["until"] - timedelta(days=30))
+        if attrs["since"] >= attrs["until"]:
+            raise ValidationError({"since": "Начало периода должно быть раньше конца"})
+        return attrs
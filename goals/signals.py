@@ -0,0 +1,71 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from goals.counters import goal_key, rebuild_counters, remember_goal_key, update_comment_counters, update_goal_counters
+from goals.events import copy_goal_events, record_goal_events
+from goals.models import BoardParticipant, Goal, GoalComment, GoalEvent
+from goals.permission import invalidate_board_roles
+
+
+@receiver(post_save, sender=BoardParticipant)
+@receiver(post_delete, sender=BoardParticipant)
+def board_participant_changed(sender, instance: BoardParticipant, **kwargs) -> None:
+    """
+    Сброс кеша ролей пользователя при изменении состава участников доски.
+    """
+    invalidate_board_roles(instance.user_id)
+
+
+@receiver(post_init, sender=Goal)
+def goal_loaded(sender, instance: Goal, **kwargs) -> None:
+    remember_goal_key(instance)
+
+
+@receiver(post_save, sender=Goal)
+def goal_saved(sender, instance: Goal, created: bool, **kwargs) -> None:
+    """
+    Обновление счетчиков категорий и запись события при создании и изменении цели.
+    """
+    old, new = (None if created else instance._counter_key), goal_key(instance)
+    if new is None or (old is None and not created):
+        # Состояние цели известно не полностью: счетчики категории пересчитываются целиком
+        rebuild_counters([instance.category_id])
+        copy_goal_events([instance.id])
+    else:
+        record_goal_events([(instance.id, old, new)])
+        if old is not None and old.category_id != new.category_id:
+            comments = GoalComment.objects.filter(goal=instance).count()
+            update_comment_counters({old.category_id: -comments, new.category_id: comments})
+        update_goal_counters([(old, new)])
+    remember_goal_key(instance)
+
+
+@receiver(post_delete, sender=Goal)
+def goal_deleted(sender, instance: Goal, **kwargs) -> None:
+    update_goal_counters([(instance._counter_key, None)])
+    GoalEvent.objects.filter(goal_id=instance.id).delete()
+
+
+@receiver(post_init, sender=GoalComment)
+def comment_loaded(sender, instance: GoalComment, **kwargs) -> None:
+    instance._counter_goal_id = instance.__dict__.get('goal_id') if instance.pk else None
+
+
+@receiver(post_save, sender=GoalComment)
+def comment_saved(sender, instance: GoalComment, created: bool, **kwargs) -> None:
+    """
+    Обновление счетчиков комментариев при создании комментария или его переносе к другой цели.
+    """
+    old_goal_id, instance._counter_goal_id = instance._counter_goal_id, instance.goal_id
+    if created:
+        update_comment_counters({instance.goal.category_id: 1})
+    elif old_goal_id is not None and old_goal_id != instance.goal_id:
+        categories = dict(Goal.objects.filter(id__in=[old_goal_id, instance.goal_id]).values_list('id', 'category_id'))
+        old_category_id, new_category_id = categories[old_goal_id], categories[instance.goal_id]
+        if old_category_id != new_category_id:
+            update_comment_counters({old_category_id: -1, new_category_id: 1})
+
+
+@receiver(post_delete, sender=GoalComment)
+def comment_deleted(sender, instance: GoalComment, **kwargs) -> None:
+    update_comment_counters({instance.goal.category_id: -1})
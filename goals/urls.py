@@ -1,10 +1,15 @@
 from django.urls import path
 
 from goals.apps import GoalsConfig
-from goals.views.boards import BoardCreateView, BoardListView, BoardDetailView
-from goals.views.categories import CategoryCreateView, CategoryListView, CategoryDetailView
-from goals.views.goals import GoalListView, GoalCreateView, GoalDetailView
+from goals.views.boards import BoardCreateView, BoardListView, BoardDetailView, BoardSummaryView, BoardCycleTimeView
+from goals.views.categories import ArchiveJobView, CategoryCreateView, CategoryListView, CategoryDetailView
+from goals.views.goals import (
+    GoalListView, GoalCreateView, GoalDetailView, GoalHistoryView, GoalBulkCreateView, GoalBulkUpdateView,
+    GoalBulkArchiveView,
+)
 from goals.views.comments import GoalCommentCreateView, GoalCommentListView, GoalCommentDetailView
+from goals.views.export import GoalExportView
+from goals.views.imports import ImportCreateView, ImportJobView
 
 
 app_name = GoalsConfig.name
@@ -14,6 +19,8 @@ urlpatterns = [
     path("board/create", BoardCreateView.as_view(), name='create-board'),
     path("board/list", BoardListView.as_view(), name='board-list'),
     path("board/<int:pk>", BoardDetailView.as_view(), name='board-details'),
+    path("board/<int:pk>/summary", BoardSummaryView.as_view(), name='board-summary'),
+    path("board/<int:pk>/cycle_time", BoardCycleTimeView.as_view(), name='board-cycle-time'),
 
     # Categories
     path("goal_category/create", CategoryCreateView.as_view(), name='create-category'),
@@ -24,6 +31,18 @@ urlpatterns = [
     path("goal/create", GoalCreateView.as_view(), name='create-goal'),
     path("goal/list", GoalListView.as_view(), name='goals-list'),
     path("goal/<int:pk>", GoalDetailView.as_view(), name='goal-details'),
+    path("goal/<int:pk>/history", GoalHistoryView.as_view(), name='goal-history'),
+    path("goal/bulk_create", GoalBulkCreateView.as_view(), name='bulk-create-goals'),
+    path("goal/bulk_update", GoalBulkUpdateView.as_view(), name='bulk-update-goals'),
+    path("goal/bulk_archive", GoalBulkArchiveView.as_view(), name='bulk-archive-goals'),
+    path("goal/export", GoalExportView.as_view(), name='export-goals'),
+
+    # Archive jobs
+    path("archive_job/<int:pk>", ArchiveJobView.as_view(), name='archive-job'),
+
+    # Import
+    path("import", ImportCreateView.as_view(), name='import'),
+    path("import_job/<int:pk>", ImportJobView.as_view(), name='import-job'),
 
     # Comments
     path("goal_comment/create", GoalCommentCreateView.as_view(), name='create-comment'),
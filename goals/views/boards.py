@@ -1,11 +1,20 @@
-from django.db import transaction
-from rest_framework import permissions, filters
-from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework import permissions, filters, status
+from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
 
-from goals.models import Board, Goal, BoardParticipant
-from goals.permission import BoardPermission
-from goals.serializers import BoardCreateSerializer, BoardWithParticipantsSerializer
+from goals.archive import archive_board
+from goals.conditional import ConditionalGetMixin
+from goals.counters import board_summary
+from goals.events import status_durations
+from goals.models import ArchiveJob, Board
+from goals.permission import BoardPermission, get_board_roles
+from goals.serializers import (
+    ArchiveJobSerializer,
+    BoardCreateSerializer,
+    BoardWithParticipantsSerializer,
+    CycleTimeQuerySerializer,
+)
 
 
 class BoardCreateView(CreateAPIView):
@@ -16,7 +25,7 @@ class BoardCreateView(CreateAPIView):
     serializer_class = BoardCreateSerializer
 
 
-class BoardListView(ListAPIView):
+class BoardListView(ConditionalGetMixin, ListAPIView):
     """
     Представления списка досок.
     """
@@ -27,10 +36,10 @@ class BoardListView(ListAPIView):
     ordering = ['title']
 
     def get_queryset(self):
-        return Board.objects.filter(participants__user=self.request.user).exclude(is_deleted=True)
+        return Board.objects.filter(id__in=get_board_roles(self.request).keys()).exclude(is_deleted=True)
 
 
-class BoardDetailView(RetrieveUpdateDestroyAPIView):
+class BoardDetailView(ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
     """
     Представление одной доски.
     """
@@ -39,14 +48,49 @@ class BoardDetailView(RetrieveUpdateDestroyAPIView):
     serializer_class = BoardWithParticipantsSerializer
 
     def get_queryset(self):
-        return Board.objects.filter(participants__user=self.request.user, is_deleted=False)
-
-    def perform_destroy(self, instance: Board):
-        with transaction.atomic():
-            instance.is_deleted = True
-            instance.save()
-            instance.categories.update(is_deleted=True)
-            Goal.objects.filter(category__board=instance).update(
-                status=Goal.Status.archived
-            )
-        return instance
+        return Board.objects.prefetch_related('participants__user').filter(
+            id__in=get_board_roles(self.request).keys(), is_deleted=False
+        )
+
+    def destroy(self, request, *args, **kwargs):
+        job = self.perform_destroy(self.get_object())
+        if job.status == ArchiveJob.Status.done:
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        # Крупная доска архивируется в фоне, прогресс доступен по goals/archive_job/<id>
+        return Response(ArchiveJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    def perform_destroy(self, instance: Board) -> ArchiveJob:
+        return archive_board(instance, self.request.user)
+
+
+class BoardSummaryView(RetrieveAPIView):
+    """
+    Представление сводки по доске: количество целей по статусам, приоритетам, просроченные цели
+    и комментарии по категориям. Строится из счетчиков, без чтения самих целей.
+    """
+    permission_classes = [BoardPermission]
+
+    def get_queryset(self):
+        return Board.objects.filter(id__in=get_board_roles(self.request).keys(), is_deleted=False)
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(board_summary(self.get_object()))
+
+
+class BoardCycleTimeView(RetrieveAPIView):
+    """
+    Представление среднего времени, которое цели доски провели в каждом статусе за период since - until.
+    Строится по журналу событий целей.
+    """
+    permission_classes = [BoardPermission]
+
+    def get_queryset(self):
+        return Board.objects.filter(id__in=get_board_roles(self.request).keys(), is_deleted=False)
+
+    def retrieve(self, request, *args, **kwargs):
+        query = CycleTimeQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        since, until = query.validated_data['since'], query.validated_data['until']
+        return Response(
+            {'since': since, 'until': until, 'statuses': status_durations(self.get_object(), since, until)}
+        )
@@ -1,11 +1,15 @@
-from django.db import transaction
-from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveUpdateDestroyAPIView
-from rest_framework import permissions, filters
+from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework import permissions, filters, status
 from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
 
-from goals.models import GoalCategory, Goal
-from goals.permission import GoalCategoryPermission
-from goals.serializers import GoalCategorySerializer, GoalCategoryWithUserSerializer
+from goals.archive import archive_category
+from goals.conditional import ConditionalGetMixin
+from goals.models import ArchiveJob, GoalCategory
+from goals.permission import GoalCategoryPermission, get_board_roles
+from goals.readers import ValuesListMixin
+from goals.search import FullTextSearchFilter
+from goals.serializers import ArchiveJobSerializer, GoalCategorySerializer, GoalCategoryWithUserSerializer
 
 
 class CategoryCreateView(CreateAPIView):
@@ -17,7 +21,7 @@ class CategoryCreateView(CreateAPIView):
     serializer_class = GoalCategorySerializer
 
 
-class CategoryListView(ListAPIView):
+class CategoryListView(ConditionalGetMixin, ValuesListMixin, ListAPIView):
     """
     Представление списка категорий.
     """
@@ -27,17 +31,19 @@ class CategoryListView(ListAPIView):
     pagination_class = LimitOffsetPagination
     filter_backends = [
         filters.OrderingFilter,
-        filters.SearchFilter,
+        FullTextSearchFilter,
     ]
     ordering_fields = ["title", "created"]
     ordering = ["title"]
     search_fields = ["title"]
 
     def get_queryset(self):
-        return GoalCategory.objects.filter(board__participants__user=self.request.user).exclude(is_deleted=True)
+        return GoalCategory.objects.select_related('user').filter(
+            board_id__in=get_board_roles(self.request).keys()
+        ).exclude(is_deleted=True)
 
 
-class CategoryDetailView(RetrieveUpdateDestroyAPIView):
+class CategoryDetailView(ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
     """
     Представление одной категории.
     """
@@ -45,10 +51,24 @@ class CategoryDetailView(RetrieveUpdateDestroyAPIView):
     serializer_class = GoalCategoryWithUserSerializer
     pagination_class = LimitOffsetPagination
     permission_classes = [GoalCategoryPermission]
-    queryset = GoalCategory.objects.exclude(is_deleted=True)
+    queryset = GoalCategory.objects.select_related('user').exclude(is_deleted=True)
 
-    def perform_destroy(self, instance: GoalCategory):
-        with transaction.atomic():
-            instance.is_deleted = True
-            instance.save()
-            instance.goal_set.update(status=Goal.Status.archived)
+    def destroy(self, request, *args, **kwargs):
+        job = self.perform_destroy(self.get_object())
+        if job.status == ArchiveJob.Status.done:
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        return Response(ArchiveJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    def perform_destroy(self, instance: GoalCategory) -> ArchiveJob:
+        return archive_category(instance, self.request.user)
+
+
+class ArchiveJobView(RetrieveAPIView):
+    """
+    Представление прогресса удаления доски или категории.
+    """
+    serializer_class = ArchiveJobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return ArchiveJob.objects.filter(user=self.request.user)
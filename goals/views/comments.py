@@ -1,10 +1,12 @@
 from rest_framework import permissions, filters
 from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveUpdateDestroyAPIView
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.pagination import LimitOffsetPagination
 
+from goals.conditional import ConditionalGetMixin
 from goals.models import GoalComment
-from goals.permission import GoalCommentPermission
+from goals.pagination import LimitOffsetKeysetPagination
+from goals.permission import GoalCommentPermission, get_board_roles
+from goals.readers import ValuesListMixin
 from goals.serializers import GoalCommentSerializer, GoalCommentWithUserSerializer
 
 
@@ -16,31 +18,31 @@ class GoalCommentCreateView(CreateAPIView):
     serializer_class = GoalCommentSerializer
 
 
-class GoalCommentListView(ListAPIView):
+class GoalCommentListView(ConditionalGetMixin, ValuesListMixin, ListAPIView):
     """
     Представление списка комментариев.
     """
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = LimitOffsetPagination
+    pagination_class = LimitOffsetKeysetPagination
     serializer_class = GoalCommentWithUserSerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['goal']
     ordering = ['-created']
 
     def get_queryset(self):
-        return GoalComment.objects.filter(
-            goal__category__board__participants__user=self.request.user
+        return GoalComment.objects.select_related('user').filter(
+            goal__category__board_id__in=get_board_roles(self.request).keys()
         )
 
 
-class GoalCommentDetailView(RetrieveUpdateDestroyAPIView):
+class GoalCommentDetailView(ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
     """
     Представление одного комментария.
     """
-    permission_classes = GoalCommentPermission
+    permission_classes = [GoalCommentPermission]
     serializer_class = GoalCommentWithUserSerializer
 
     def get_queryset(self):
-        return GoalComment.objects.select_related('user').filter(
-            goal__category__board__participants__user=self.request.user
+        return GoalComment.objects.select_related('user', 'goal__category').filter(
+            goal__category__board_id__in=get_board_roles(self.request).keys()
         )
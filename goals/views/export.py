@@ -0,0 +1,28 @@
+from django.http import StreamingHttpResponse
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.views import APIView
+
+from goals.export import EXPORT_FORMATS, export_goals
+from goals.permission import get_board_roles
+
+
+class GoalExportView(APIView):
+    """
+    Представление выгрузки всех категорий, целей и комментариев пользователя.
+    Ответ формируется потоково из серверного курсора, поэтому память не зависит от объема данных.
+    Формат задается параметром type: ndjson (по умолчанию) или json.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.query_params.get('type', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError({'type': f'Допустимые значения: {", ".join(EXPORT_FORMATS)}'})
+
+        board_ids = list(get_board_roles(request).keys())
+        response = StreamingHttpResponse(
+            export_goals(board_ids, export_format), content_type=EXPORT_FORMATS[export_format]
+        )
+        response.headers['Content-Disposition'] = f'attachment; filename="goals.{export_format}"'
+        return response
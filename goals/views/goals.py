@@ -1,12 +1,31 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveUpdateDestroyAPIView
-from rest_framework import permissions, filters
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.generics import (
+    CreateAPIView, GenericAPIView, ListAPIView, RetrieveUpdateDestroyAPIView, get_object_or_404
+)
+from rest_framework import permissions, filters, status
+from rest_framework.response import Response
 
+from goals.conditional import ConditionalGetMixin
+from goals.counters import goal_key, update_goal_counters
+from goals.events import record_goal_events
 from goals.filters import GoalDateFilter
-from goals.models import Goal
-from goals.permission import GoalPermission
-from goals.serializers import GoalSerializer, GoalWithUserSerializer
+from goals.models import Goal, GoalCategory, GoalEvent
+from goals.pagination import LimitOffsetKeysetPagination
+from goals.permission import EDIT_ROLES, GoalPermission, get_board_roles, has_board_role
+from goals.readers import ValuesListMixin
+from goals.search import FullTextSearchFilter
+from goals.serializers import (
+    GoalBulkArchiveSerializer,
+    GoalBulkCreateSerializer,
+    GoalBulkUpdateSerializer,
+    GoalEventSerializer,
+    GoalSerializer,
+    GoalWithUserSerializer,
+)
 
 
 class GoalCreateView(CreateAPIView):
@@ -17,32 +36,215 @@ class GoalCreateView(CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class GoalListView(ListAPIView):
+class GoalListView(ConditionalGetMixin, ValuesListMixin, ListAPIView):
     """
     Представление списка целей.
     """
     serializer_class = GoalWithUserSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = LimitOffsetPagination
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
+    pagination_class = LimitOffsetKeysetPagination
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_class = GoalDateFilter
-    ordering_fields = ['title', 'description']
+    ordering_fields = ['title', 'description', 'created']
     ordering = ['title']
     search_fields = ['title', 'description']
 
     def get_queryset(self):
-        return Goal.objects.filter(category__board__participants__user=self.request.user, category__is_deleted=False
-                                   ).exclude(status=Goal.Status.archived)
+        return Goal.objects.select_related('user').filter(
+            category__board_id__in=get_board_roles(self.request).keys(), category__is_deleted=False
+        ).exclude(status=Goal.Status.archived)
 
 
-class GoalDetailView(RetrieveUpdateDestroyAPIView):
+class GoalDetailView(ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
     """
     Представление одной цели.
     """
     permission_classes = [GoalPermission]
     serializer_class = GoalWithUserSerializer
-    queryset = Goal.objects.exclude(status=Goal.Status.archived)
+    queryset = Goal.objects.select_related('user', 'category').exclude(status=Goal.Status.archived)
 
     def perform_destroy(self, instance: Goal):
         instance.status = Goal.Status.archived
         instance.save()
+
+
+class GoalHistoryView(ListAPIView):
+    """
+    Представление истории цели: события создания и изменения статуса, приоритета и срока.
+    Доступна и для архивных целей.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = GoalEventSerializer
+
+    def get_queryset(self):
+        goal = get_object_or_404(
+            Goal.objects.filter(category__board_id__in=get_board_roles(self.request).keys()), pk=self.kwargs['pk']
+        )
+        return GoalEvent.objects.filter(goal=goal).order_by('at', 'id')
+
+
+class GoalBulkMixin:
+    """
+    Общие методы пакетных операций с целями.
+    Права проверяются один раз на каждую доску пакета, ошибки возвращаются по индексу элемента.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def check_size(self, items) -> list:
+        """
+        Метод проверки размера пакета.
+        :param items:
+        :return:
+        """
+        if not isinstance(items, list) or not items:
+            raise ValidationError('Expected a non-empty list.')
+        if len(items) > settings.GOALS_BULK_MAX_SIZE:
+            raise ValidationError(f'Ensure this list has no more than {settings.GOALS_BULK_MAX_SIZE} elements.')
+        return items
+
+    def get_editable_goals(self, ids) -> tuple[dict[int, Goal], set[int]]:
+        """
+        Метод загрузки целей пакета одним запросом.
+        :param ids:
+        :return: Словарь доступных целей {id: goal} и множество целей только для чтения.
+        """
+        goals = (
+            Goal.objects.select_related('category')
+            .filter(id__in=set(ids), category__board_id__in=get_board_roles(self.request).keys())
+            .filter(category__is_deleted=False)
+            .exclude(status=Goal.Status.archived)
+            .in_bulk()
+        )
+        editable = self.get_editable_boards(goal.category.board_id for goal in goals.values())
+        forbidden = {goal_id for goal_id, goal in goals.items() if goal.category.board_id not in editable}
+        return {goal_id: goal for goal_id, goal in goals.items() if goal_id not in forbidden}, forbidden
+
+    def get_editable_boards(self, board_ids) -> set[int]:
+        return {board_id for board_id in set(board_ids) if has_board_role(self.request, board_id, *EDIT_ROLES)}
+
+    @staticmethod
+    def item_error(index: int, errors) -> dict:
+        return {'index': index, 'errors': errors}
+
+
+class GoalBulkCreateView(GoalBulkMixin, GenericAPIView):
+    """
+    Представление пакетного создания целей.
+    """
+    serializer_class = GoalBulkCreateSerializer
+
+    def post(self, request, *args, **kwargs):
+        items = self.check_size(request.data)
+        serializers = [self.get_serializer(data=item) for item in items]
+        valid = [serializer.is_valid() for serializer in serializers]
+
+        category_ids = {serializer.validated_data['category'] for serializer, ok in zip(serializers, valid) if ok}
+        categories = GoalCategory.objects.filter(id__in=category_ids, is_deleted=False).in_bulk()
+        editable = self.get_editable_boards(category.board_id for category in categories.values())
+
+        goals, errors = [], []
+        for index, (serializer, is_valid) in enumerate(zip(serializers, valid)):
+            if not is_valid:
+                errors.append(self.item_error(index, serializer.errors))
+                continue
+            data = dict(serializer.validated_data)
+            category = categories.get(data.pop('category'))
+            if category is None:
+                errors.append(self.item_error(index, {'category': ['Category not exist!']}))
+            elif category.board_id not in editable:
+                errors.append(self.item_error(index, {'category': [PermissionDenied.default_detail]}))
+            else:
+                goals.append(Goal(user=request.user, category=category, **data))
+
+        with transaction.atomic():
+            Goal.objects.bulk_create(goals)
+            # bulk_create и bulk_update не отправляют сигналы, поэтому счетчики и события обновляются явно
+            changes = [(goal.id, None, goal_key(goal)) for goal in goals]
+            update_goal_counters((old, new) for _, old, new in changes)
+            record_goal_events(changes)
+
+        return Response(
+            {'results': GoalSerializer(goals, many=True).data, 'errors': errors},
+            status=status.HTTP_201_CREATED if goals else status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class GoalBulkUpdateView(GoalBulkMixin, GenericAPIView):
+    """
+    Представление пакетного изменения статуса и приоритета целей.
+    """
+    serializer_class = GoalBulkUpdateSerializer
+
+    def patch(self, request, *args, **kwargs):
+        items = self.check_size(request.data)
+        serializers = [self.get_serializer(data=item) for item in items]
+        valid = [serializer.is_valid() for serializer in serializers]
+        goals, forbidden = self.get_editable_goals(
+            serializer.validated_data['id'] for serializer, ok in zip(serializers, valid) if ok
+        )
+
+        changed, fields, errors = {}, {'updated'}, []
+        now = timezone.now()
+        for index, (serializer, is_valid) in enumerate(zip(serializers, valid)):
+            if not is_valid:
+                errors.append(self.item_error(index, serializer.errors))
+                continue
+            data = dict(serializer.validated_data)
+            goal_id = data.pop('id')
+            if goal_id in forbidden:
+                errors.append(self.item_error(index, {'id': [PermissionDenied.default_detail]}))
+            elif goal_id not in goals:
+                errors.append(self.item_error(index, {'id': [NotFound.default_detail]}))
+            else:
+                goal = goals[goal_id]
+                for field, value in data.items():
+                    setattr(goal, field, value)
+                # bulk_update не заполняет auto_now поля
+                goal.updated = now
+                fields.update(data)
+                changed[goal_id] = goal
+
+        with transaction.atomic():
+            Goal.objects.bulk_update(changed.values(), fields=sorted(fields))
+            changes = [(goal.id, goal._counter_key, goal_key(goal)) for goal in changed.values()]
+            update_goal_counters((old, new) for _, old, new in changes)
+            record_goal_events(changes)
+
+        return Response(
+            {'results': GoalSerializer(changed.values(), many=True).data, 'errors': errors},
+            status=status.HTTP_200_OK if changed else status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class GoalBulkArchiveView(GoalBulkMixin, GenericAPIView):
+    """
+    Представление пакетной архивации целей.
+    """
+    serializer_class = GoalBulkArchiveSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = self.check_size(serializer.validated_data['ids'])
+        goals, forbidden = self.get_editable_goals(ids)
+
+        errors = []
+        for index, goal_id in enumerate(ids):
+            if goal_id in forbidden:
+                errors.append(self.item_error(index, {'id': [PermissionDenied.default_detail]}))
+            elif goal_id not in goals:
+                errors.append(self.item_error(index, {'id': [NotFound.default_detail]}))
+
+        with transaction.atomic():
+            Goal.objects.filter(id__in=goals.keys()).update(status=Goal.Status.archived, updated=timezone.now())
+            changes = [
+                (goal.id, goal._counter_key, goal._counter_key._replace(status=Goal.Status.archived))
+                for goal in goals.values()
+            ]
+            update_goal_counters((old, new) for _, old, new in changes)
+            record_goal_events(changes)
+
+        return Response(
+            {'results': sorted(goals), 'errors': errors},
+            status=status.HTTP_200_OK if goals else status.HTTP_400_BAD_REQUEST,
+        )
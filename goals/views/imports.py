@@ -0,0 +1,63 @@
+import logging
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from rest_framework import permissions, status
+from rest_framework.generics import CreateAPIView, RetrieveAPIView
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+
+from goals.imports import start_import
+from goals.models import ImportJob
+from goals.serializers import ImportJobSerializer, ImportUploadSerializer
+
+logger = logging.getLogger(__name__)
+
+
+class ImportCreateView(CreateAPIView):
+    """
+    Представление импорта досок, категорий и целей из файла CSV или NDJSON.
+    Файл сохраняется на диск по частям, небольшой импортируется в том же запросе, крупный - в фоне.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [MultiPartParser]
+    serializer_class = ImportUploadSerializer
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.validated_data['file']
+        file_format = serializer.validated_data['type']
+
+        path = Path(settings.GOALS_IMPORT_DIR).joinpath(f'{uuid.uuid4().hex}.{file_format}')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as file:
+            for chunk in upload.chunks():
+                file.write(chunk)
+
+        job = ImportJob.objects.create(user=request.user, file=str(path), format=file_format, size=upload.size)
+        try:
+            job = start_import(job)
+        except Exception as error:
+            # Ошибка не строки файла, а импорта целиком: задача завершается, файл удаляется, клиент получает ошибку
+            logger.exception('Import job %s failed', job.id)
+            job.status = ImportJob.Status.failed
+            job.errors = [*job.errors, {'row': None, 'error': str(error)}]
+            job.save(update_fields=['status', 'errors', 'updated'])
+            path.unlink(missing_ok=True)
+            return Response(ImportJobSerializer(job).data, status=status.HTTP_400_BAD_REQUEST)
+        # Крупный файл импортируется в фоне, прогресс доступен по goals/import_job/<id>
+        code = status.HTTP_201_CREATED if job.status == ImportJob.Status.done else status.HTTP_202_ACCEPTED
+        return Response(ImportJobSerializer(job).data, status=code)
+
+
+class ImportJobView(RetrieveAPIView):
+    """
+    Представление прогресса импорта.
+    """
+    serializer_class = ImportJobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return ImportJob.objects.filter(user=self.request.user)
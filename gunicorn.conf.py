@@ -0,0 +1,40 @@
+"""
+Настройки gunicorn для рабочего запуска API (читаются автоматически из текущего каталога).
+
+Параллельность: GUNICORN_WORKERS процессов по GUNICORN_THREADS потоков, всего workers * threads одновременных
+запросов. Потоки дешевле процессов и подходят, пока запросы в основном ждут БД; при загрузке CPU увеличивайте
+число процессов. Каждому потоку нужно свое соединение с PostgreSQL: workers * threads не должно превышать
+max_connections сервера БД с учетом бота и фоновых задач.
+
+Плавный перезапуск без потери запросов: сигнал HUP мастер-процессу (docker compose kill -s HUP api) -
+новые процессы запускаются с новым кодом и настройками, старые завершают текущие запросы за graceful_timeout.
+
+Процессы не делят память: сессии, роли на досках и отозванные токены должны храниться в общем кеше
+(CACHE_BACKEND - Redis в docker-compose). Фоновые задачи удаления и импорта, остановленные перезапуском процесса,
+продолжает сервис jobs (python manage.py resume_jobs).
+"""
+import multiprocessing
+
+from envparse import env
+
+bind = env.str('GUNICORN_BIND', default='0.0.0.0:8000')
+workers = env.int('GUNICORN_WORKERS', default=multiprocessing.cpu_count() * 2 + 1)
+threads = env.int('GUNICORN_THREADS', default=4)
+# gthread при threads > 1
+worker_class = env.str('GUNICORN_WORKER_CLASS', default='gthread' if threads > 1 else 'sync')
+
+# Перезапуск процесса после max_requests запросов ограничивает рост памяти; jitter разносит перезапуски во времени
+max_requests = env.int('GUNICORN_MAX_REQUESTS', default=2000)
+max_requests_jitter = env.int('GUNICORN_MAX_REQUESTS_JITTER', default=200)
+
+# Выгрузка и импорт могут идти дольше обычных запросов; nginx ждет ответа 120 секунд
+timeout = env.int('GUNICORN_TIMEOUT', default=120)
+graceful_timeout = env.int('GUNICORN_GRACEFUL_TIMEOUT', default=30)
+keepalive = env.int('GUNICORN_KEEPALIVE', default=5)
+
+# Перезапуск при изменении кода - только для разработки
+reload = env.bool('GUNICORN_RELOAD', default=False)
+
+# Пустое значение отключает журнал запросов
+accesslog = env.str('GUNICORN_ACCESS_LOG', default='-') or None
+errorlog = '-'
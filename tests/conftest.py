@@ -1,9 +1,25 @@
 import pytest
+from django.core.cache import cache
+from django.db import connections
 from django.test import Client
 from pytest_factoryboy import register
 
+from goals.cache import representation_cache
 from tests.factories import BoardFactory, BoardParticipantFactory, CategoryFactory, GoalFactory, UserFactory
 
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix):
+    """
+    Вторая тестовая БД replica для проверки маршрутизации чтения на реплики (tests/test_router.py).
+    """
+    from django.conf import settings
+
+    default = settings.DATABASES['default']
+    settings.DATABASES['replica'] = {**default, 'TEST': {'NAME': f'test_{default["NAME"]}_replica'}}
+    # Настройки соединений уже могли быть прочитаны: пересчитываются с новым псевдонимом
+    connections.__dict__.pop('settings', None)
+
+
 # Factories
 register(UserFactory)
 register(BoardFactory)
@@ -39,4 +55,21 @@ def create_instances_for_user(user) -> None:
     BoardParticipantFactory(user=user, board=board, role=1)
     categories = CategoryFactory.create_batch(2, user=user, board=board)
     for cat in categories:
-        GoalFactory.create(user=user, category=cat)
\ No newline at end of file
+        GoalFactory.create(user=user, category=cat)
+
+@pytest.fixture
+def shared_cache(settings):
+    """
+    Кеш default считается общим для процессов (SHARED_CACHE): в тестах все запросы выполняются в одном процессе.
+    """
+    settings.SHARED_CACHE = True
+    settings.SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    representation_cache.clear()
+    yield
+    cache.clear()
+    representation_cache.clear()
@@ -0,0 +1,70 @@
+import pytest
+from django.core.management import call_command
+
+from goals.models import ArchiveJob, Board, Goal, GoalCategory
+
+
+@pytest.mark.django_db
+class TestArchive:
+    def test_board_delete_sync(self, authenticated_user: dict):
+        """
+        Тест удаления небольшой доски: категории и цели архивируются в том же запросе.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        board = Board.objects.filter(participants__user=user).first()
+
+        response = client.delete(f'/goals/board/{board.id}')
+
+        assert response.status_code == 204
+        assert not GoalCategory.objects.filter(board=board, is_deleted=False).exists()
+        assert not Goal.objects.filter(category__board=board).exclude(status=Goal.Status.archived).exists()
+        assert ArchiveJob.objects.get(board=board).status == ArchiveJob.Status.done
+
+    def test_board_delete_background(self, authenticated_user: dict, settings):
+        """
+        Тест удаления крупной доски: доска скрывается сразу, цели архивируются фоновой задачей пакетами.
+        """
+        settings.GOALS_ARCHIVE_SYNC_LIMIT = 0
+        settings.GOALS_ARCHIVE_BATCH_SIZE = 1
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        board = Board.objects.filter(participants__user=user).first()
+
+        response = client.delete(f'/goals/board/{board.id}')
+
+        assert response.status_code == 202
+        assert response.data['status'] == ArchiveJob.Status.pending
+        assert response.data['total'] == 4
+        assert client.get('/goals/goal/list').data == []
+        assert client.get('/goals/goal_category/list').data == []
+
+        # Фоновый поток запускается после фиксации транзакции, которой в тесте нет, поэтому
+        # задача выполняется командой возобновления в текущем потоке
+        call_command('resume_jobs', stale=-1)
+
+        response = client.get(f'/goals/archive_job/{response.data["id"]}')
+        assert response.data['status'] == ArchiveJob.Status.done
+        assert response.data['processed'] == 4
+        assert not Goal.objects.filter(category__board=board).exclude(status=Goal.Status.archived).exists()
+
+    def test_category_delete_background(self, authenticated_user: dict, users: list, settings):
+        """
+        Тест удаления категории: задача видна только ее автору.
+        """
+        settings.GOALS_ARCHIVE_SYNC_LIMIT = 0
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        category = GoalCategory.objects.filter(user=user).first()
+
+        response = client.delete(f'/goals/goal_category/{category.id}')
+
+        assert response.status_code == 202
+        assert client.get(f'/goals/goal_category/{category.id}').status_code == 404
+        job = ArchiveJob.objects.get(id=response.data['id'])
+        assert job.category == category
+        assert job.user == user
+
+        job.user = users[0]
+        job.save()
+        assert client.get(f'/goals/archive_job/{job.id}').status_code == 404
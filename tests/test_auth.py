@@ -0,0 +1,76 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.auth import user_cache_key
+
+pytestmark = pytest.mark.usefixtures('shared_cache')
+
+
+def auth_queries(queries: CaptureQueriesContext) -> list[str]:
+    return [query['sql'] for query in queries if 'django_session' in query['sql'] or 'core_user' in query['sql']]
+
+
+@pytest.mark.django_db
+def test_session_and_user_served_from_cache(authenticated_user):
+    client = authenticated_user.get('client')
+    user = authenticated_user.get('user')
+
+    assert client.get('/core/profile').status_code == 200
+    assert cache.get(user_cache_key(user.id)) == user
+
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get('/core/profile').status_code == 200
+        assert client.get('/goals/board/list').status_code == 200
+    assert auth_queries(queries) == []
+
+
+@pytest.mark.django_db
+def test_profile_update_invalidates_cached_user(authenticated_user):
+    client = authenticated_user.get('client')
+    client.get('/core/profile')
+
+    response = client.patch('/core/profile', {'first_name': 'Changed'}, content_type='application/json')
+    assert response.status_code == 200
+    assert client.get('/core/profile').data['first_name'] == 'Changed'
+
+
+@pytest.mark.django_db
+def test_password_update_ends_cached_session(authenticated_user):
+    client = authenticated_user.get('client')
+    password = authenticated_user.get('password')
+    client.get('/core/profile')
+
+    response = client.put(
+        '/core/update_password',
+        {'old_password': password, 'new_password': 'new_password1234'},
+        content_type='application/json',
+    )
+    assert response.status_code == 200
+    assert client.get('/core/profile').status_code == 403
+
+
+@pytest.mark.django_db
+def test_logout_invalidates_cached_user(authenticated_user):
+    client = authenticated_user.get('client')
+    user = authenticated_user.get('user')
+    client.get('/core/profile')
+
+    assert client.delete('/core/profile').status_code == 204
+    assert cache.get(user_cache_key(user.id)) is None
+    assert client.get('/core/profile').status_code == 403
+
+
+@pytest.mark.django_db
+def test_without_shared_cache_user_loaded_from_db(authenticated_user, settings):
+    settings.SHARED_CACHE = False
+    settings.SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+    client = authenticated_user.get('client')
+    user = authenticated_user.get('user')
+
+    client.get('/core/profile')
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get('/core/profile').status_code == 200
+    assert cache.get(user_cache_key(user.id)) is None
+    assert len(auth_queries(queries)) == 2
@@ -0,0 +1,426 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+from django.core.cache import caches
+from django.db import connection
+
+from bot.dispatcher import ChatDispatcher
+from bot.management.commands.runbot import Command
+from bot.models import TgUser
+from bot.outbox import OutboundQueue
+from bot.state import MemoryStateStore, get_state_store
+from bot.tg.client import AsyncTgClient, TgClient
+from bot.tg.schemas import Chat, Message, ResponseParameters, SendMessageResponse
+from goals.models import Goal, GoalCategory
+
+
+def make_message(chat_id: int, message_id: int) -> Message:
+    return Message(message_id=message_id, chat=Chat(id=chat_id), text=str(message_id))
+
+
+class TestChatDispatcher:
+    def test_chat_order_preserved(self):
+        """
+        Тест сохранения порядка сообщений внутри чата при параллельной обработке.
+        """
+        handled: dict[int, list[int]] = {}
+        lock = threading.Lock()
+
+        def handler(message: Message) -> None:
+            time.sleep(random.random() / 200)
+            with lock:
+                handled.setdefault(message.chat.id, []).append(message.message_id)
+
+        dispatcher = ChatDispatcher(handler, workers=4)
+        for message_id in range(40):
+            dispatcher.submit(make_message(chat_id=message_id % 5, message_id=message_id))
+        dispatcher.shutdown()
+
+        assert handled == {chat_id: list(range(chat_id, 40, 5)) for chat_id in range(5)}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_stale_connection_recovered(self):
+        """
+        Тест повторной обработки сообщения с новым соединением, если соединение потока с БД разорвано.
+        """
+        backends = []
+
+        def handler(message: Message) -> None:
+            with connection.cursor() as cursor:
+                if not backends:
+                    cursor.execute('SELECT pg_backend_pid()')
+                    backends.append(cursor.fetchone()[0])
+                    # Сервер закрывает соединение, как при перезапуске PostgreSQL
+                    cursor.execute('SELECT pg_terminate_backend(pg_backend_pid())')
+                cursor.execute('SELECT pg_backend_pid()')
+                backends.append(cursor.fetchone()[0])
+            connection.close()
+
+        dispatcher = ChatDispatcher(handler, workers=1)
+        dispatcher.submit(make_message(chat_id=1, message_id=1))
+        dispatcher.shutdown()
+
+        assert len(backends) == 2
+        assert backends[0] != backends[1]
+
+    def test_chats_processed_in_parallel(self):
+        """
+        Тест параллельной обработки разных чатов: медленный чат не задерживает остальные.
+        """
+        release = threading.Event()
+        handled = []
+
+        def handler(message: Message) -> None:
+            if message.chat.id == 1:
+                release.wait(timeout=5)
+            handled.append(message.chat.id)
+            if message.chat.id == 2:
+                release.set()
+
+        dispatcher = ChatDispatcher(handler, workers=2)
+        dispatcher.submit(make_message(chat_id=1, message_id=1))
+        dispatcher.submit(make_message(chat_id=2, message_id=2))
+        dispatcher.shutdown()
+
+        assert handled == [2, 1]
+
+
+class FakeTelegramHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server: 'FakeTelegram'
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        self.server.requests += 1
+        if self.server.failures:
+            self.server.failures -= 1
+            self.reply(self.server.failure_status, {'ok': False})
+            return
+        if urlparse(self.path).path.endswith('/getUpdates'):
+            self.reply(200, {'ok': True, 'result': []})
+            return
+        chat_id = int(parse_qs(urlparse(self.path).query)['chat_id'][0])
+        self.reply(200, {'ok': True, 'result': {'message_id': 1, 'chat': {'id': chat_id}, 'text': 'ok'}})
+
+    def reply(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeTelegram(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), FakeTelegramHandler)
+        self.connections = 0
+        self.requests = 0
+        self.failures = 0
+        self.failure_status = 503
+
+
+@pytest.fixture
+def fake_telegram():
+    server = FakeTelegram()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestTgClient:
+    def test_connection_reused(self, fake_telegram: FakeTelegram):
+        """
+        Тест переиспользования keep-alive соединения для нескольких запросов.
+        """
+        client = TgClient(token='test', api_url=f'http://127.0.0.1:{fake_telegram.server_port}')
+
+        for chat_id in range(5):
+            assert client.send_message(chat_id=chat_id, text='text').result.chat.id == chat_id
+
+        assert fake_telegram.requests == 5
+        assert fake_telegram.connections == 1
+
+    def test_retry_on_server_error(self, fake_telegram: FakeTelegram, settings):
+        """
+        Тест повтора getUpdates при ответе 5xx.
+        """
+        settings.BOT_HTTP_BACKOFF = 0
+        fake_telegram.failures = 2
+        client = TgClient(token='test', api_url=f'http://127.0.0.1:{fake_telegram.server_port}', retries=3)
+
+        response = asyncio.run(AsyncTgClient(client).get_updates(timeout=0))
+
+        assert response.ok
+        assert fake_telegram.requests == 3
+
+    def test_send_message_not_retried_on_server_error(self, fake_telegram: FakeTelegram, settings):
+        """
+        Тест отправки сообщения: при 5xx сообщение могло быть принято, поэтому запрос не повторяется,
+        а при 429 повторяется.
+        """
+        settings.BOT_HTTP_BACKOFF = 0
+        fake_telegram.failures = 1
+        client = TgClient(token='test', api_url=f'http://127.0.0.1:{fake_telegram.server_port}', retries=3)
+
+        response = client.send_message(chat_id=1, text='text')
+        assert (response.ok, response.result) == (False, None)
+        assert fake_telegram.requests == 1
+
+        fake_telegram.failures = 2
+        fake_telegram.failure_status = 429
+        assert client.send_message(chat_id=1, text='text').ok
+        assert fake_telegram.requests == 4
+
+
+    def test_runbot_builds_client_once(self, monkeypatch):
+        """
+        Тест запуска runbot: клиент с пулом соединений создается один раз и закрывается при остановке.
+        """
+        created = []
+
+        class StoppingTgClient:
+            def __init__(self, **kwargs):
+                self.closed = False
+                created.append(self)
+
+            def get_updates(self, offset: int = 0):
+                raise KeyboardInterrupt
+
+            def close(self):
+                self.closed = True
+
+        monkeypatch.setattr('bot.management.commands.runbot.TgClient', StoppingTgClient)
+        with pytest.raises(KeyboardInterrupt):
+            Command().handle(workers=1)
+
+        assert len(created) == 1
+        assert created[0].closed
+
+
+class RecordingTgClient:
+    def __init__(self, failures: int = 0):
+        self.sent: list[tuple[int, str]] = []
+        self.failures = failures
+
+    def send_message(self, chat_id: int, text: str, **kwargs) -> SendMessageResponse:
+        if self.failures:
+            self.failures -= 1
+            raise requests.ConnectionError
+        self.sent.append((chat_id, text))
+        return SendMessageResponse(ok=True, result=Message(message_id=1, chat=Chat(id=chat_id), text=text))
+
+
+class TestDialogState:
+    def test_memory_store_bounds(self, monkeypatch):
+        """
+        Тест ограничений хранилища в памяти: вытеснение по LRU и истечение TTL.
+        """
+        store = MemoryStateStore(ttl=10, max_size=2)
+        store.set(1, {'next_handler': 'create_goal'})
+        store.set(2, {'next_handler': 'create_goal'})
+        store.get(1)
+        store.set(3, {'next_handler': 'create_goal'})
+
+        assert store.get(2) is None
+        assert store.get(1) is not None
+
+        now = time.monotonic()
+        monkeypatch.setattr(time, 'monotonic', lambda: now + 11)
+        assert store.get(1) is None
+
+    @pytest.mark.django_db
+    def test_create_goal_across_workers(self, authenticated_user: dict):
+        """
+        Тест создания цели через бота, когда шаги диалога обрабатывают разные экземпляры бота.
+        """
+        user = authenticated_user.get('user')
+        TgUser.objects.create(chat_id=42, username='chat', user=user)
+        category = GoalCategory.objects.filter(user=user).order_by('id').first()
+        workers = [Command(), Command()]
+        for worker in workers:
+            worker.tg_client = RecordingTgClient()
+            worker.outbox = OutboundQueue(worker.tg_client, chat_interval=0)
+
+        for worker, text in zip([*workers, workers[0]], ['/create', '1', 'Goal from bot']):
+            worker.handle_message(make_message(chat_id=42, message_id=1).copy(update={'text': text}))
+            worker.outbox.flush(timeout=5)
+
+        assert workers[0].tg_client.sent[-1] == (42, 'Goal "Goal from bot" added!')
+        assert Goal.objects.filter(title='Goal from bot', category__board=category.board).exists()
+        assert workers[1].state_store.get(42) is None
+
+    def test_state_store_selection(self, settings):
+        """
+        Тест выбора хранилища состояния: по умолчанию отдельная таблица кеша в БД, общая для процессов бота,
+        размер которой ограничен BOT_STATE_MAX_SIZE.
+        """
+        store = get_state_store()
+        assert store.cache is caches['bot_state']
+        assert store.cache._max_entries == settings.BOT_STATE_MAX_SIZE
+        settings.BOT_STATE_CACHE = 'default'
+        assert get_state_store().cache is caches['default']
+        settings.BOT_STATE_STORE = 'memory'
+        assert isinstance(get_state_store(), MemoryStateStore)
+
+
+class TestOutboundQueue:
+    def test_burst_coalesced(self):
+        """
+        Тест склейки сообщений одного чата, накопившихся за интервал между отправками.
+        """
+        client = RecordingTgClient()
+        outbox = OutboundQueue(client, chat_interval=0.2)
+
+        outbox.send(chat_id=1, text='0')
+        outbox.flush(timeout=5)
+        for index in range(1, 5):
+            outbox.send(chat_id=1, text=str(index))
+        outbox.send(chat_id=2, text='other')
+        outbox.close(timeout=5)
+
+        assert [text for chat_id, text in client.sent if chat_id == 1] == ['0', '1\n2\n3\n4']
+        assert (2, 'other') in client.sent
+
+    def test_chat_rate_limited(self):
+        """
+        Тест соблюдения интервала между сообщениями в один чат.
+        """
+        client = RecordingTgClient()
+        outbox = OutboundQueue(client, chat_interval=0.2)
+
+        start = time.monotonic()
+        outbox.send(chat_id=1, text='first')
+        outbox.flush(timeout=5)
+        outbox.send(chat_id=1, text='second')
+        outbox.close(timeout=5)
+
+        assert client.sent == [(1, 'first'), (1, 'second')]
+        assert time.monotonic() - start >= 0.2
+
+    def test_failed_send_retried(self):
+        """
+        Тест повтора отправки после ошибки.
+        """
+        client = RecordingTgClient(failures=2)
+        outbox = OutboundQueue(client, retries=3, backoff=0.01)
+
+        outbox.send(chat_id=1, text='text')
+        outbox.close(timeout=5)
+
+        assert client.sent == [(1, 'text')]
+
+    def test_close_bounded_by_timeout(self, caplog):
+        """
+        Тест остановки очереди, когда Telegram не отвечает: close не ждет дольше timeout,
+        а неотправленные сообщения попадают в лог.
+        """
+        started, release = threading.Event(), threading.Event()
+
+        class BlockingTgClient(RecordingTgClient):
+            def send_message(self, chat_id: int, text: str, **kwargs) -> SendMessageResponse:
+                started.set()
+                release.wait(timeout=5)
+                return super().send_message(chat_id, text, **kwargs)
+
+        outbox = OutboundQueue(BlockingTgClient())
+        outbox.send(chat_id=1, text='in flight')
+        assert started.wait(timeout=5)
+        outbox.send(chat_id=1, text='pending')
+
+        start = time.monotonic()
+        outbox.close(timeout=0.2)
+        release.set()
+
+        assert time.monotonic() - start < 1
+        assert 'Message to chat 1 is still being sent on close' in caplog.text
+        assert 'Dropped 1 pending messages to chat 1 on close' in caplog.text
+
+    @pytest.mark.parametrize('failure', [
+        SendMessageResponse(ok=False, error_code=403, description='Forbidden: bot was blocked by the user'),
+        SendMessageResponse(ok=False, error_code=502, description='Bad Gateway'),
+        requests.ReadTimeout(),
+    ])
+    def test_failed_send_not_retried(self, failure):
+        """
+        Тест отправки без повтора: после 4xx сообщение не будет принято, а после 5xx и таймаута чтения
+        могло быть доставлено, и повтор отправил бы его дважды.
+        """
+        class FailingTgClient(RecordingTgClient):
+            def send_message(self, chat_id: int, text: str, **kwargs) -> SendMessageResponse:
+                self.sent.append((chat_id, text))
+                if isinstance(failure, Exception):
+                    raise failure
+                return failure
+
+        client = FailingTgClient()
+        outbox = OutboundQueue(client, retries=3, backoff=0.01)
+
+        outbox.send(chat_id=1, text='text')
+        outbox.close(timeout=5)
+
+        assert client.sent == [(1, 'text')]
+
+    def test_rate_limited_send_retried_after(self):
+        """
+        Тест повтора отправки после 429 не раньше retry_after секунд.
+        """
+        class RateLimitedTgClient(RecordingTgClient):
+            def send_message(self, chat_id: int, text: str, **kwargs) -> SendMessageResponse:
+                self.at = [*getattr(self, 'at', []), time.monotonic()]
+                if len(self.at) == 1:
+                    return SendMessageResponse(ok=False, error_code=429, parameters=ResponseParameters(retry_after=1))
+                return super().send_message(chat_id, text, **kwargs)
+
+        client = RateLimitedTgClient()
+        outbox = OutboundQueue(client, retries=3, backoff=0.01)
+
+        outbox.send(chat_id=1, text='text')
+        outbox.close(timeout=5)
+
+        assert client.sent == [(1, 'text')]
+        assert client.at[1] - client.at[0] >= 1
+
+    @pytest.mark.django_db
+    def test_verify_does_not_wait_for_telegram(self, authenticated_user: dict, monkeypatch):
+        """
+        Тест верификации бота: ответ API не ждет отправки сообщения в Telegram.
+        """
+        release = threading.Event()
+
+        class BlockingTgClient(RecordingTgClient):
+            def send_message(self, chat_id: int, text: str, **kwargs) -> SendMessageResponse:
+                release.wait(timeout=5)
+                return super().send_message(chat_id, text, **kwargs)
+
+        tg_client = BlockingTgClient()
+        outbox = OutboundQueue(tg_client)
+        monkeypatch.setattr('bot.views.get_outbox', lambda: outbox)
+        TgUser.objects.create(chat_id=42, username='chat', verification_code='code')
+
+        response = authenticated_user.get('client').patch(
+            '/bot/verify', data={'verification_code': 'code'}, content_type='application/json'
+        )
+
+        assert response.status_code == 200
+        assert tg_client.sent == []
+        release.set()
+        outbox.close(timeout=5)
+        assert tg_client.sent == [(42, 'Bot has been verified')]
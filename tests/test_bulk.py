@@ -0,0 +1,75 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from goals.models import Board, BoardParticipant, Goal, GoalCategory
+
+
+@pytest.mark.django_db
+class TestGoalBulk:
+    def test_bulk_create(self, authenticated_user: dict, users: list):
+        """
+        Тест пакетного создания целей с ошибками в отдельных элементах.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        category = GoalCategory.objects.filter(user=user).first()
+        foreign_category = GoalCategory.objects.filter(user=users[0]).first()
+        BoardParticipant.objects.create(user=user, board=foreign_category.board, role=BoardParticipant.Role.reader)
+
+        items = [{'title': f'Goal {index}', 'category': category.id} for index in range(50)]
+        items += [{'category': category.id}, {'title': 'Foreign', 'category': foreign_category.id}]
+        with CaptureQueriesContext(connection) as context:
+            response = client.post('/goals/goal/bulk_create', items, content_type='application/json')
+
+        assert response.status_code == 201
+        assert len(response.data['results']) == 50
+        assert [error['index'] for error in response.data['errors']] == [50, 51]
+        assert 'title' in response.data['errors'][0]['errors']
+        assert Goal.objects.filter(category=category, title__startswith='Goal ').count() == 50
+        assert len(context.captured_queries) < 15
+
+    def test_bulk_update(self, authenticated_user: dict, users: list):
+        """
+        Тест пакетного изменения статуса и приоритета целей.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        goals = list(Goal.objects.filter(user=user))
+        foreign_goal = Goal.objects.filter(user=users[0]).first()
+
+        items = [{'id': goal.id, 'status': Goal.Status.done, 'priority': Goal.Priority.high} for goal in goals]
+        items += [{'id': foreign_goal.id, 'status': Goal.Status.done}, {'id': goals[0].id}]
+        response = client.patch('/goals/goal/bulk_update', items, content_type='application/json')
+
+        assert response.status_code == 200
+        assert len(response.data['results']) == len(goals)
+        assert [error['index'] for error in response.data['errors']] == [len(goals), len(goals) + 1]
+        assert set(Goal.objects.filter(user=user).values_list('status', 'priority')) == {
+            (Goal.Status.done, Goal.Priority.high)
+        }
+        foreign_goal.refresh_from_db()
+        assert foreign_goal.status == Goal.Status.to_do
+
+    def test_bulk_archive(self, authenticated_user: dict, users: list):
+        """
+        Тест пакетной архивации целей: цели доски с ролью читателя не архивируются.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        goal_ids = list(Goal.objects.filter(user=user).values_list('id', flat=True))
+        board = Board.objects.filter(participants__user=users[0]).first()
+        BoardParticipant.objects.create(user=user, board=board, role=BoardParticipant.Role.reader)
+        foreign_goal = Goal.objects.filter(category__board=board).first()
+
+        response = client.post(
+            '/goals/goal/bulk_archive', {'ids': [*goal_ids, foreign_goal.id]}, content_type='application/json'
+        )
+
+        assert response.status_code == 200
+        assert response.data['results'] == sorted(goal_ids)
+        assert response.data['errors'][0]['errors'] == {'id': ['You do not have permission to perform this action.']}
+        assert not Goal.objects.filter(id__in=goal_ids).exclude(status=Goal.Status.archived).exists()
+
+        response = client.post('/goals/goal/bulk_archive', {'ids': goal_ids}, content_type='application/json')
+        assert response.status_code == 400
@@ -0,0 +1,71 @@
+import pytest
+from django.utils import timezone
+
+from goals.cache import RepresentationCache, representation_cache
+from goals.models import Goal, GoalCategory
+from goals.serializers import GoalWithUserSerializer
+from tests.factories import GoalFactory
+
+
+class TestRepresentationCache:
+    def test_lru_eviction_and_hit_rate(self):
+        """
+        Тест вытеснения давно не использованных записей и подсчета попаданий.
+        """
+        cache = RepresentationCache(max_size=2)
+        cache.set('a', {'id': 1})
+        cache.set('b', {'id': 2})
+        cache.get('a')
+        cache.set('c', {'id': 3})
+
+        assert cache.get('b') is None
+        assert cache.get('a') == {'id': 1}
+        assert cache.stats()['size'] == 2
+        assert cache.hit_rate == pytest.approx(2 / 3)
+
+
+@pytest.mark.django_db
+class TestCachedRepresentation:
+    def test_goal_list_from_cache(self, authenticated_user: dict):
+        """
+        Тест сборки страницы списка целей из закешированных представлений.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        GoalFactory.create_batch(8, user=user, category=GoalCategory.objects.filter(user=user).first())
+
+        first = client.get('/goals/goal/list?limit=10').data
+        hits = representation_cache.hits
+        second = client.get('/goals/goal/list?limit=10').data
+
+        assert second == first
+        assert representation_cache.hits - hits == 10
+
+        # Строки списка и сериализатор объектов используют общие записи кеша
+        hits = representation_cache.hits
+        goals = Goal.objects.filter(user=user).select_related('user')
+        by_id = {goal['id']: goal for goal in GoalWithUserSerializer(goals, many=True).data}
+        assert [by_id[goal['id']] for goal in first['results']] == first['results']
+        assert representation_cache.hits - hits == 10
+
+        goal_id = first['results'][0]['id']
+        Goal.objects.filter(id=goal_id).update(title='Changed', updated=timezone.now())
+        results = client.get('/goals/goal/list?limit=10').data['results']
+        assert next(goal['title'] for goal in results if goal['id'] == goal_id) == 'Changed'
+
+    def test_changes_invalidate(self, authenticated_user: dict):
+        """
+        Тест обновления представления после изменения цели или ее автора.
+        """
+        user = authenticated_user.get('user')
+        goal = Goal.objects.filter(user=user).first()
+        assert GoalWithUserSerializer(goal).data['title'] == goal.title
+
+        goal.title = 'Changed'
+        goal.save()
+        assert GoalWithUserSerializer(goal).data['title'] == 'Changed'
+
+        user.first_name = 'Renamed'
+        user.save()
+        goal = Goal.objects.select_related('user').get(id=goal.id)
+        assert GoalWithUserSerializer(goal).data['user']['first_name'] == 'Renamed'
@@ -0,0 +1,101 @@
+import time
+
+import pytest
+from django.utils.http import http_date
+
+from goals.models import Board, Goal, GoalComment
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    @pytest.mark.parametrize(
+        'url', ['/goals/board/list', '/goals/goal_category/list', '/goals/goal/list', '/goals/goal_comment/list']
+    )
+    def test_list_not_modified(self, authenticated_user: dict, url: str):
+        """
+        Тест ответа 304 на повторный запрос списка с If-None-Match.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        GoalComment.objects.create(user=user, goal=Goal.objects.filter(user=user).first(), text='Comment')
+
+        response = client.get(url)
+        etag = response.headers['ETag']
+        assert response.status_code == 200
+        assert 'Last-Modified' not in response.headers
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response.content == b''
+        assert response.headers['ETag'] == etag
+
+        assert client.get(f'{url}?limit=1', HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_list_changes(self, authenticated_user: dict):
+        """
+        Тест смены ETag списка после изменения и удаления объектов.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        goal = Goal.objects.filter(user=user).first()
+        comment = GoalComment.objects.create(user=user, goal=goal, text='Comment')
+
+        etag = client.get('/goals/goal/list').headers['ETag']
+        client.patch(f'/goals/goal/{goal.id}', {'title': 'Changed'}, content_type='application/json')
+        assert client.get('/goals/goal/list', HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+        etag = client.get('/goals/goal_comment/list').headers['ETag']
+        client.delete(f'/goals/goal_comment/{comment.id}')
+        assert client.get('/goals/goal_comment/list', HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_list_ignores_if_modified_since(self, authenticated_user: dict):
+        """
+        Тест списка с If-Modified-Since: дата изменения списка не отражает выход объектов из выборки
+        и изменения в ту же секунду, поэтому список проверяется только по ETag. ETag меняется и после
+        изменения вложенного автора.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        goal = Goal.objects.filter(user=user).first()
+        since = http_date(time.time() + 60)
+
+        assert client.get('/goals/goal/list', HTTP_IF_MODIFIED_SINCE=since).status_code == 200
+
+        client.patch(f'/goals/goal/{goal.id}', {'status': Goal.Status.archived}, content_type='application/json')
+        response = client.get('/goals/goal/list', HTTP_IF_MODIFIED_SINCE=since)
+        assert response.status_code == 200
+        assert goal.id not in {item['id'] for item in response.data}
+
+        list_etag = client.get('/goals/goal/list').headers['ETag']
+        detail = client.get(f'/goals/goal/{Goal.objects.filter(user=user).exclude(id=goal.id).first().id}')
+        user.first_name = 'Renamed'
+        user.save()
+        response = client.get('/goals/goal/list', HTTP_IF_MODIFIED_SINCE=since)
+        assert response.status_code == 200
+        assert {item['user']['first_name'] for item in response.data} == {'Renamed'}
+
+        # ETag и дата изменения объекта учитывают вложенного автора
+        response = client.get('/goals/goal/list', HTTP_IF_NONE_MATCH=list_etag)
+        assert response.status_code == 200
+        assert {item['user']['first_name'] for item in response.data} == {'Renamed'}
+        response = client.get(f'/goals/goal/{detail.data["id"]}', HTTP_IF_NONE_MATCH=detail.headers['ETag'])
+        assert response.status_code == 200
+        assert response.data['user']['first_name'] == 'Renamed'
+        assert response.headers['Last-Modified'] == http_date(int(user.updated.timestamp()))
+
+    def test_detail_not_modified(self, authenticated_user: dict, users: list):
+        """
+        Тест условного запроса объекта: 304 по If-Modified-Since, недоступный объект - 404.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        board = Board.objects.filter(participants__user=user).first()
+
+        response = client.get(f'/goals/board/{board.id}')
+        assert response.status_code == 200
+
+        response = client.get(f'/goals/board/{board.id}', HTTP_IF_MODIFIED_SINCE=response.headers['Last-Modified'])
+        assert response.status_code == 304
+
+        foreign_board = Board.objects.filter(participants__user=users[0]).first()
+        assert client.get(f'/goals/board/{foreign_board.id}', HTTP_IF_NONE_MATCH='*').status_code == 404
@@ -0,0 +1,85 @@
+import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from goals.counters import rebuild_counters
+from goals.models import Board, CommentCounter, Goal, GoalCategory, GoalCounter
+from tests.factories import GoalFactory
+
+
+def counters_snapshot(board: Board) -> tuple[set, set]:
+    goals = set(
+        GoalCounter.objects.filter(category__board=board, goals__gt=0).values_list(
+            'category_id', 'status', 'priority', 'due_date', 'goals'
+        )
+    )
+    comments = set(
+        CommentCounter.objects.filter(category__board=board, comments__gt=0).values_list('category_id', 'comments')
+    )
+    return goals, comments
+
+
+@pytest.mark.django_db
+class TestBoardCounters:
+    def test_counters_follow_changes(self, authenticated_user: dict):
+        """
+        Тест инкрементального обновления счетчиков: после изменений целей и комментариев
+        они совпадают с пересчитанными заново.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        board = Board.objects.filter(participants__user=user).first()
+        first, second = GoalCategory.objects.filter(board=board).order_by('id')
+        goal = Goal.objects.filter(category=first).first()
+
+        client.post('/goals/goal/create', {'title': 'Goal', 'category': first.id}, content_type='application/json')
+        client.post('/goals/goal_comment/create', {'goal': goal.id, 'text': 'Text'}, content_type='application/json')
+        client.patch(
+            f'/goals/goal/{goal.id}',
+            {'category': second.id, 'status': Goal.Status.in_progress, 'due_date': '2020-01-01'},
+            content_type='application/json',
+        )
+        created = client.post(
+            '/goals/goal/bulk_create', [{'title': 'Bulk', 'category': first.id}], content_type='application/json'
+        ).data['results'][0]
+        client.patch(
+            '/goals/goal/bulk_update',
+            [{'id': created['id'], 'priority': Goal.Priority.critical}],
+            content_type='application/json',
+        )
+        client.post('/goals/goal/bulk_archive', {'ids': [created['id']]}, content_type='application/json')
+        client.delete(f'/goals/goal/{Goal.objects.filter(category=first).exclude(status=4).first().id}')
+
+        incremental = counters_snapshot(board)
+        rebuild_counters([first.id, second.id])
+        assert incremental == counters_snapshot(board)
+
+    def test_board_summary(self, authenticated_user: dict):
+        """
+        Тест сводки по доске: значения и постоянное количество запросов.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        board = Board.objects.filter(participants__user=user).first()
+        category = GoalCategory.objects.filter(board=board).order_by('id').first()
+        yesterday = datetime.date.today() - datetime.timedelta(days=1)
+
+        response = client.get(f'/goals/board/{board.id}/summary')
+        assert response.status_code == 200
+        assert response.data['goals'] == 2
+
+        GoalFactory.create_batch(5, user=user, category=category, due_date=yesterday, status=Goal.Status.to_do)
+        GoalFactory(user=user, category=category, status=Goal.Status.archived)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'/goals/board/{board.id}/summary')
+
+        assert not [query for query in context.captured_queries if 'FROM "goals_goal"' in query['sql']]
+        assert len(context.captured_queries) <= 5
+        assert response.data['goals'] == 7
+        assert response.data['overdue'] == 5
+        assert response.data['by_status'][Goal.Status.archived] == 1
+        categories = {item['id']: item for item in response.data['categories']}
+        assert categories[category.id]['overdue'] == 5
+        assert categories[category.id]['goals'] == 6
@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+from django.db import OperationalError, connection
+
+from todolist.db.base import DatabaseWrapper
+from todolist.db.pool import close_pool, get_pool
+
+
+@pytest.fixture()
+def pooled():
+    """
+    Подключения к тестовой БД через бэкенд с пулом из двух соединений.
+    """
+    settings_dict = {**connection.settings_dict, 'POOL_SIZE': 2, 'POOL_TIMEOUT': 0.2, 'CONN_MAX_AGE': 0}
+    wrappers = []
+
+    def make() -> DatabaseWrapper:
+        wrapper = DatabaseWrapper(settings_dict, alias='pool_test')
+        wrappers.append(wrapper)
+        return wrapper
+
+    yield make
+    for wrapper in wrappers:
+        if wrapper.connection is not None:
+            wrapper.close()
+    close_pool('pool_test')
+
+
+def backend_pid(wrapper: DatabaseWrapper) -> int:
+    with wrapper.cursor() as cursor:
+        cursor.execute('SELECT pg_backend_pid()')
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+class TestConnectionPool:
+    def test_reused_across_threads(self, pooled):
+        """
+        Тест передачи соединения, возвращенного в пул, другому потоку.
+        """
+        first = backend_pid(wrapper := pooled())
+        wrapper.close()
+
+        pids = []
+
+        def query() -> None:
+            other = pooled()
+            pids.append(backend_pid(other))
+            other.close()
+
+        thread = threading.Thread(target=query)
+        thread.start()
+        thread.join()
+
+        assert pids == [first]
+
+    def test_bounded(self, pooled):
+        """
+        Тест ограничения числа соединений: третий поток не получает соединение, пока два заняты.
+        """
+        first, second = pooled(), pooled()
+        assert backend_pid(first) != backend_pid(second)
+
+        with pytest.raises(OperationalError):
+            backend_pid(pooled())
+
+        second.close()
+        assert backend_pid(pooled()) is not None
+
+    def test_broken_connection_replaced(self, pooled):
+        """
+        Тест проверки соединения перед выдачей: закрытое сервером соединение заменяется новым.
+        """
+        wrapper = pooled()
+        pid = backend_pid(wrapper)
+        wrapper.close()
+        pool = get_pool('pool_test', wrapper.settings_dict)
+        pool.check_interval = -1
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_terminate_backend(%s)', [pid])
+
+        assert backend_pid(pooled()) not in (pid, None)
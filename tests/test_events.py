@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from goals.events import create_partitions, status_durations
+from goals.models import Board, Goal, GoalCategory, GoalEvent
+from tests.factories import GoalFactory
+
+
+@pytest.mark.django_db
+class TestGoalEvents:
+    def test_events_on_changes(self, authenticated_user: dict):
+        """
+        Тест записи событий при изменениях цели через API, пакетные операции и удаление категории.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        category = GoalCategory.objects.filter(user=user).first()
+
+        goal_id = client.post(
+            '/goals/goal/create', {'title': 'Goal', 'category': category.id}, content_type='application/json'
+        ).data['id']
+        client.patch(f'/goals/goal/{goal_id}', {'title': 'Renamed'}, content_type='application/json')
+        client.patch(f'/goals/goal/{goal_id}', {'status': Goal.Status.in_progress}, content_type='application/json')
+        client.patch(
+            '/goals/goal/bulk_update',
+            [{'id': goal_id, 'status': Goal.Status.done, 'priority': Goal.Priority.high}],
+            content_type='application/json',
+        )
+        client.delete(f'/goals/goal_category/{category.id}')
+
+        history = client.get(f'/goals/goal/{goal_id}/history').data
+        assert [(event['status'], event['priority']) for event in history] == [
+            (Goal.Status.to_do, Goal.Priority.medium),
+            (Goal.Status.in_progress, Goal.Priority.medium),
+            (Goal.Status.done, Goal.Priority.high),
+            (Goal.Status.archived, Goal.Priority.high),
+        ]
+
+        other = GoalFactory(user=user, category=GoalCategory.objects.filter(user=user, is_deleted=False).first())
+        with CaptureQueriesContext(connection) as context:
+            client.patch(f'/goals/goal/{other.id}', {'due_date': '2030-01-01'}, content_type='application/json')
+        assert len([query for query in context.captured_queries if 'goals_goalevent' in query['sql']]) == 1
+
+    def test_history_access(self, authenticated_user: dict, users: list):
+        """
+        Тест недоступности истории чужой цели.
+        """
+        client = authenticated_user.get('client')
+        foreign_goal = Goal.objects.filter(category__board__participants__user=users[0]).first()
+        assert client.get(f'/goals/goal/{foreign_goal.id}/history').status_code == 404
+
+    def test_partitions_and_cycle_time(self, authenticated_user: dict):
+        """
+        Тест переноса событий из секции по умолчанию в месячные секции и расчета времени в статусах.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        board = Board.objects.filter(participants__user=user).first()
+        goal = Goal.objects.filter(category__board=board).first()
+        start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        GoalEvent.objects.filter(goal__category__board=board).delete()
+        GoalEvent.objects.bulk_create([
+            GoalEvent(goal=goal, at=start, status=Goal.Status.to_do, priority=2),
+            GoalEvent(goal=goal, at=start + timedelta(days=2), status=Goal.Status.in_progress, priority=2),
+            GoalEvent(goal=goal, at=start + timedelta(days=33), status=Goal.Status.done, priority=2),
+        ])
+
+        assert create_partitions(1, start=start) == ['goals_goalevent_2020_01', 'goals_goalevent_2020_02']
+        assert create_partitions(1, start=start) == []
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT count(*) FROM goals_goalevent_2020_01')
+            assert cursor.fetchone()[0] == 2
+
+        assert status_durations(board, start, start + timedelta(days=40)) == [
+            {'status': Goal.Status.to_do, 'transitions': 1, 'avg_seconds': 2 * 86400.0},
+            {'status': Goal.Status.in_progress, 'transitions': 1, 'avg_seconds': 31 * 86400.0},
+            {'status': Goal.Status.done, 'transitions': 1, 'avg_seconds': 7 * 86400.0},
+        ]
+        response = client.get(
+            f'/goals/board/{board.id}/cycle_time', {'since': '2020-01-01T00:00:00Z', 'until': '2020-01-10T00:00:00Z'}
+        )
+        assert response.status_code == 200
+        assert [item['avg_seconds'] for item in response.data['statuses']] == [2 * 86400.0, 7 * 86400.0]
+
+        call_command('create_goal_event_partitions', months=0)
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from goals.export import export_goals
+from goals.models import Board, Goal, GoalCategory, GoalComment
+
+
+@pytest.mark.django_db
+class TestGoalExport:
+    def test_ndjson_matches_lists(self, authenticated_user: dict, users: list):
+        """
+        Тест выгрузки NDJSON: те же объекты и представления, что в списках, без чужих досок.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        for goal in Goal.objects.filter(user=user):
+            GoalComment.objects.create(user=user, goal=goal, text=f'Comment to {goal.title}')
+        Goal.objects.filter(user=user).update(status=Goal.Status.archived, title='Archived')
+
+        response = client.get('/goals/goal/export')
+        assert response.status_code == 200
+        assert response.streaming
+        assert response.headers['Content-Type'] == 'application/x-ndjson'
+
+        exported = {'category': [], 'goal': [], 'comment': []}
+        for line in b''.join(response.streaming_content).decode().splitlines():
+            item = json.loads(line)
+            exported[item['type']].append(item['data'])
+
+        for kind, url in (
+            ('category', '/goals/goal_category/list'),
+            ('goal', '/goals/goal/list'),
+            ('comment', '/goals/goal_comment/list'),
+        ):
+            listed = json.loads(client.get(url).content)
+            assert sorted(exported[kind], key=lambda data: data['id']) == sorted(listed, key=lambda data: data['id'])
+        assert all(goal['title'] != 'Archived' for goal in exported['goal'])
+
+        foreign_boards = Board.objects.filter(participants__user=users[0])
+        foreign_categories = set(GoalCategory.objects.filter(board__in=foreign_boards).values_list('id', flat=True))
+        assert not foreign_categories & {category['id'] for category in exported['category']}
+
+    def test_json(self, authenticated_user: dict):
+        """
+        Тест выгрузки одним JSON-объектом и проверки формата.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+
+        response = client.get('/goals/goal/export?type=json')
+        data = json.loads(b''.join(response.streaming_content))
+        assert set(data) == {'categories', 'goals', 'comments'}
+        assert len(data['goals']) == Goal.objects.filter(user=user).count()
+
+        assert client.get('/goals/goal/export?type=xml').status_code == 400
+
+    def test_chunks(self, authenticated_user: dict):
+        """
+        Тест отдачи выгрузки частями не больше chunk_size объектов.
+        """
+        user = authenticated_user.get('user')
+        board_ids = list(Board.objects.filter(participants__user=user).values_list('id', flat=True))
+        goals = Goal.objects.filter(category__board_id__in=board_ids).count()
+
+        chunks = [chunk for chunk in export_goals(board_ids, chunk_size=1) if '"type":"goal"' in chunk]
+        assert len(chunks) == goals
+        assert json.loads(''.join(export_goals(board_ids, 'json', chunk_size=1)))['goals']
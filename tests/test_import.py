@@ -0,0 +1,162 @@
+import json
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connections
+
+from goals.counters import rebuild_counters
+from goals.archive import get_executor
+from goals.imports import Importer, run_import_in_background
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalCounter, ImportJob
+from goals.permission import get_user_board_roles
+
+CSV = '''type,id,board,category,title,description,due_date,status,priority
+board,b1,,,Imported board,,,,
+category,c1,b1,,Backlog,,,,
+goal,,,c1,First,"Описание
+в две строки",2030-01-01,2,4
+goal,,,c1,Second,,,,
+goal,,,missing,Orphan,,,,
+board,b2,,,Second board,,,,
+category,c2,b2,,Done,,,,
+goal,,,c2,Third,,,3,
+goal,,,c2,Bad status,,,9,
+'''
+
+
+@pytest.mark.django_db
+class TestImport:
+    def test_csv_upload(self, authenticated_user: dict, tmp_path, settings):
+        """
+        Тест импорта CSV: доски с владельцем, ссылки по идентификаторам из файла, ошибки по номерам строк.
+        """
+        settings.GOALS_IMPORT_DIR = str(tmp_path)
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+
+        response = client.post('/goals/import', {'file': SimpleUploadedFile('tracker.csv', CSV.encode())})
+
+        assert response.status_code == 201
+        assert response.data['status'] == ImportJob.Status.done
+        assert response.data['rows'] == 9
+        assert response.data['imported'] == 7
+        assert not list(tmp_path.iterdir())
+        errors = response.data['errors']
+        assert [error['row'] for error in errors] == [5, 9]
+        assert errors[0]['error'] == "category: объект 'missing' не найден в файле"
+        assert errors[1]['error'].startswith('status:')
+
+        boards = Board.objects.filter(title__in=['Imported board', 'Second board'])
+        assert set(get_user_board_roles(user)) >= set(boards.values_list('id', flat=True))
+        assert all(role == BoardParticipant.Role.owner for role in get_user_board_roles(user).values())
+        first = Goal.objects.get(title='First')
+        assert first.description == 'Описание\nв две строки'
+        assert (first.status, first.priority, first.category.title) == (2, 4, 'Backlog')
+        assert Goal.objects.get(title='Second').priority == Goal.Priority.medium
+
+        titles = {goal['title'] for goal in client.get('/goals/goal/list').data}
+        assert {'First', 'Second', 'Third'} <= titles
+
+        categories = GoalCategory.objects.filter(board__in=boards).values_list('id', flat=True)
+        counters = set(GoalCounter.objects.filter(category__in=categories).values_list('category', 'goals'))
+        rebuild_counters(categories)
+        assert counters == set(GoalCounter.objects.filter(category__in=categories).values_list('category', 'goals'))
+
+    def test_resume(self, authenticated_user: dict, tmp_path, settings, monkeypatch):
+        """
+        Тест продолжения прерванного импорта NDJSON: созданные пакеты не повторяются,
+        ссылки на объекты из предыдущих пакетов восстанавливаются.
+        """
+        settings.GOALS_IMPORT_BATCH_SIZE = 2
+        user = authenticated_user.get('user')
+        rows = [
+            {'type': 'board', 'id': 'b', 'title': 'Board'},
+            {'type': 'category', 'id': 'c', 'board': 'b', 'title': 'C'},
+        ]
+        rows += [{'type': 'goal', 'category': 'c', 'title': f'Goal {index}'} for index in range(5)]
+        path = tmp_path.joinpath('goals.ndjson')
+        path.write_text('\n'.join(json.dumps(row) for row in rows) + '\n')
+
+        flush = Importer.flush
+        calls = []
+
+        def interrupted_flush(importer, batch, offset):
+            calls.append(offset)
+            if len(calls) == 3:
+                raise RuntimeError('Interrupted')
+            flush(importer, batch, offset)
+
+        monkeypatch.setattr(Importer, 'flush', interrupted_flush)
+        with pytest.raises(RuntimeError):
+            call_command('import_goals', str(path), user=user.username)
+        job = ImportJob.objects.get(user=user)
+        assert (job.status, job.rows, job.imported) == (ImportJob.Status.failed, 4, 4)
+
+        monkeypatch.setattr(Importer, 'flush', flush)
+        call_command('import_goals', resume=job.id)
+        job.refresh_from_db()
+
+        assert (job.status, job.rows, job.imported, job.position) == (ImportJob.Status.done, 7, 7, job.size)
+        assert Goal.objects.filter(category__title='C', category__board__title='Board').count() == 5
+        assert path.exists()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_background(self, authenticated_user: dict, users: list, tmp_path, settings):
+        """
+        Тест импорта крупного файла в фоновом потоке: задача видна только ее автору.
+        """
+        settings.GOALS_IMPORT_DIR = str(tmp_path)
+        settings.GOALS_IMPORT_SYNC_LIMIT = 0
+        client = authenticated_user.get('client')
+
+        response = client.post('/goals/import', {'file': SimpleUploadedFile('goals.json', b'not json\n')})
+
+        assert response.status_code == 202
+        job = ImportJob.objects.get(id=response.data['id'])
+
+        # Без транзакции задача сразу передается в пул из одного потока: дожидаемся ее и закрываем соединение потока
+        get_executor().submit(connections.close_all).result(timeout=10)
+        response = client.get(f'/goals/import_job/{job.id}')
+        assert response.data['status'] == ImportJob.Status.done
+        assert response.data['failed'] == 1
+        assert not list(tmp_path.iterdir())
+
+        job.user = users[0]
+        job.save()
+        assert client.get(f'/goals/import_job/{job.id}').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_background_failure(self, authenticated_user: dict, tmp_path):
+        """
+        Тест ошибки фонового импорта: задача получает статус failed, исключение не выходит из потока.
+        """
+        job = ImportJob.objects.create(
+            user=authenticated_user.get('user'), file=str(tmp_path.joinpath('missing.ndjson')),
+            format=ImportJob.Format.ndjson, size=1,
+        )
+
+        run_import_in_background(job.id)
+
+        job.refresh_from_db()
+        assert job.status == ImportJob.Status.failed
+
+    def test_sync_failure(self, authenticated_user: dict, tmp_path, settings, monkeypatch):
+        """
+        Тест ошибки импорта в запросе: клиент получает задачу со статусом failed и ошибкой, файл удаляется.
+        """
+        settings.GOALS_IMPORT_DIR = str(tmp_path)
+
+        def broken_flush(importer, batch, offset):
+            raise RuntimeError('Broken')
+
+        monkeypatch.setattr(Importer, 'flush', broken_flush)
+        response = authenticated_user.get('client').post(
+            '/goals/import', {'file': SimpleUploadedFile('tracker.csv', CSV.encode())}
+        )
+
+        assert response.status_code == 400
+        assert response.data['status'] == ImportJob.Status.failed
+        assert response.data['errors'] == [{'row': None, 'error': 'Broken'}]
+        assert ImportJob.objects.get(id=response.data['id']).status == ImportJob.Status.failed
+        assert not list(tmp_path.iterdir())
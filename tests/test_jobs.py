@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from goals.events import TABLE, month_start
+from goals.models import ArchiveJob, Goal, GoalCategory, GoalEvent, ImportJob
+
+
+@pytest.mark.django_db
+def test_resume_stale_jobs(authenticated_user: dict, tmp_path):
+    """
+    Тест продолжения задач, фоновый поток которых остановлен перезапуском процесса API:
+    продолжаются только задачи в очереди или выполняющиеся без прогресса дольше --stale минут.
+    """
+    user = authenticated_user.get('user')
+    category = GoalCategory.objects.filter(user=user).first()
+    GoalCategory.objects.filter(id=category.id).update(is_deleted=True)
+    archive = ArchiveJob.objects.create(category=category, user=user, total=1, status=ArchiveJob.Status.running)
+    path = tmp_path.joinpath('boards.ndjson')
+    path.write_text('{"type": "board", "id": "b1", "title": "Resumed"}\n')
+    stale_import = ImportJob.objects.create(
+        user=user, file=str(path), format=ImportJob.Format.ndjson, size=path.stat().st_size
+    )
+    fresh_import = ImportJob.objects.create(
+        user=user, file=str(path), format=ImportJob.Format.ndjson, size=path.stat().st_size,
+        status=ImportJob.Status.running,
+    )
+    failed = ArchiveJob.objects.create(category=category, user=user, total=1, status=ArchiveJob.Status.failed)
+    past = timezone.now() - timedelta(minutes=30)
+    ArchiveJob.objects.filter(id__in=[archive.id, failed.id]).update(updated=past)
+    ImportJob.objects.filter(id=stale_import.id).update(updated=past)
+
+    call_command('resume_jobs', stale=10)
+
+    archive.refresh_from_db()
+    stale_import.refresh_from_db()
+    assert archive.status == ArchiveJob.Status.done
+    assert not Goal.objects.filter(category=category).exclude(status=Goal.Status.archived).exists()
+    assert (stale_import.status, stale_import.imported) == (ImportJob.Status.done, 1)
+    assert ImportJob.objects.get(id=fresh_import.id).status == ImportJob.Status.running
+    assert ArchiveJob.objects.get(id=failed.id).status == ArchiveJob.Status.failed
+
+
+@pytest.mark.django_db
+def test_goal_event_partitions_created(authenticated_user: dict):
+    """
+    Тест секций журнала событий: секции текущего и следующего месяцев создает миграция,
+    секцию на два месяца вперед - resume_jobs, и новые события не попадают в секцию по умолчанию.
+    """
+    now = timezone.now()
+
+    def partition(months: int) -> str | None:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT to_regclass(%s)', [f'{TABLE}_{month_start(now.year, now.month + months):%Y_%m}'])
+            return cursor.fetchone()[0]
+
+    assert partition(0) and partition(1)
+    assert partition(2) is None
+    call_command('resume_jobs')
+    assert partition(2)
+
+    goal = Goal.objects.filter(user=authenticated_user.get('user')).first()
+    GoalEvent.objects.create(goal=goal, status=goal.status, priority=goal.priority)
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT count(*) FROM {TABLE}_default WHERE at >= %s', [month_start(now.year, now.month)])
+        assert cursor.fetchone()[0] == 0
@@ -0,0 +1,67 @@
+import pytest
+
+from goals.models import Goal, GoalCategory, GoalComment
+
+
+def collect_pages(client, url: str) -> tuple[list[int], list[dict]]:
+    ids, pages = [], []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        pages.append(response.data)
+        ids += [item['id'] for item in response.data['results']]
+        url = response.data['next']
+    return ids, pages
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    @pytest.mark.parametrize('ordering', ['title', '-title', 'created', '-created'])
+    def test_goals_cursor_pages(self, authenticated_user: dict, ordering: str):
+        """
+        Тест обхода списка целей по курсору с повторяющимися значениями поля сортировки.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        category = GoalCategory.objects.filter(user=user).first()
+        for index in range(7):
+            Goal.objects.create(title=f'Goal {index % 3}', user=user, category=category)
+
+        tie_breaker = '-id' if ordering.startswith('-') else 'id'
+        expected = list(Goal.objects.filter(user=user).order_by(ordering, tie_breaker).values_list('id', flat=True))
+        ids, pages = collect_pages(client, f'/goals/goal/list?pagination=cursor&limit=2&ordering={ordering}')
+
+        assert ids == expected
+        assert len(pages) == 5
+        assert pages[0]['previous'] is None
+
+        response = client.get(pages[2]['previous'])
+        assert [item['id'] for item in response.data['results']] == expected[2:4]
+
+    def test_comments_cursor_pages(self, authenticated_user: dict):
+        """
+        Тест обхода списка комментариев по курсору в порядке -created.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        goal = Goal.objects.filter(user=user).first()
+        for index in range(5):
+            GoalComment.objects.create(user=user, goal=goal, text=f'Comment {index}')
+
+        expected = list(GoalComment.objects.order_by('-created', '-id').values_list('id', flat=True))
+        ids, _ = collect_pages(client, f'/goals/goal_comment/list?goal={goal.id}&pagination=cursor&limit=2')
+
+        assert ids == expected
+
+    def test_offset_pagination_unchanged(self, authenticated_user: dict):
+        """
+        Тест сохранения пагинации по смещению по умолчанию.
+        """
+        client = authenticated_user.get('client')
+
+        response = client.get('/goals/goal/list?limit=1&offset=1')
+        assert response.data['count'] == 2
+        assert len(response.data['results']) == 1
+
+        response = client.get('/goals/goal/list?cursor=invalid')
+        assert response.status_code == 404
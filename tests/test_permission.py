@@ -0,0 +1,109 @@
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from goals.models import Board, BoardParticipant, Goal, GoalComment
+
+
+def participant_queries(context: CaptureQueriesContext) -> list[str]:
+    table = BoardParticipant._meta.db_table
+    return [query['sql'] for query in context.captured_queries if f'FROM "{table}"' in query['sql']]
+
+
+@pytest.mark.django_db
+class TestBoardRoles:
+    def test_goal_update_loads_roles_once(self, authenticated_user: dict):
+        """
+        Тест однократной загрузки ролей пользователя при обновлении цели.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        goal = Goal.objects.filter(user=user).first()
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.patch(
+                f'/goals/goal/{goal.id}',
+                {'title': 'Updated', 'category': goal.category_id},
+                content_type='application/json',
+            )
+
+        assert response.status_code == 200
+        assert len(participant_queries(context)) <= 1
+
+    def test_comment_create_and_get(self, authenticated_user: dict, users: list):
+        """
+        Тест проверки доступа к комментарию участника и постороннего пользователя.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        goal = Goal.objects.filter(user=user).first()
+
+        response = client.post(
+            '/goals/goal_comment/create', {'goal': goal.id, 'text': 'Comment'}, content_type='application/json'
+        )
+        assert response.status_code == 201
+
+        comment_id = response.data.get('id')
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'/goals/goal_comment/{comment_id}')
+
+        assert response.status_code == 200
+        assert len(participant_queries(context)) <= 1
+
+        foreign_goal = Goal.objects.filter(user=users[0]).first()
+        comment = GoalComment.objects.create(user=users[0], goal=foreign_goal, text='Foreign')
+        response = client.get(f'/goals/goal_comment/{comment.id}')
+        assert response.status_code == 404
+
+        BoardParticipant.objects.create(
+            user=user, board=foreign_goal.category.board, role=BoardParticipant.Role.reader
+        )
+        response = client.patch(
+            f'/goals/goal_comment/{comment.id}', {'text': 'Changed'}, content_type='application/json'
+        )
+        assert response.status_code == 403
+
+    def test_roles_cached_between_requests(self, authenticated_user: dict):
+        """
+        Тест повторного использования ролей из общего кеша в следующих запросах.
+        """
+        client = authenticated_user.get('client')
+
+        client.get('/goals/board/list')
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/goals/goal/list')
+
+        assert response.status_code == 200
+        assert participant_queries(context) == []
+
+    def test_roles_invalidated_on_participants_change(self, authenticated_user: dict, users: list):
+        """
+        Тест сброса кеша ролей при добавлении участников, в том числе через обновление доски.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        other_client = Client()
+        other_client.force_login(users[0])
+
+        board = Board.objects.filter(participants__user=user).first()
+        foreign_board = Board.objects.filter(participants__user=users[0]).first()
+
+        assert client.get(f'/goals/board/{foreign_board.id}').status_code == 404
+        BoardParticipant.objects.create(user=user, board=foreign_board, role=BoardParticipant.Role.reader)
+        assert client.get(f'/goals/board/{foreign_board.id}').status_code == 200
+
+        assert other_client.get(f'/goals/board/{board.id}').status_code == 404
+        response = client.put(
+            f'/goals/board/{board.id}',
+            {'title': board.title, 'participants': [{'role': 2, 'user': users[0].username}]},
+            content_type='application/json',
+        )
+        assert response.status_code == 200
+        assert other_client.get(f'/goals/board/{board.id}').status_code == 200
+
+        response = client.put(
+            f'/goals/board/{board.id}', {'title': board.title, 'participants': []}, content_type='application/json'
+        )
+        assert response.status_code == 200
+        assert other_client.get(f'/goals/board/{board.id}').status_code == 404
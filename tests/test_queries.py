@@ -0,0 +1,108 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+from tests.factories import BoardFactory, CategoryFactory, GoalFactory, UserFactory
+
+
+def count_queries(client, url: str) -> int:
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+def add_boards(user, board: Board, size: int) -> None:
+    for _ in range(size):
+        BoardParticipant.objects.create(user=user, board=BoardFactory(), role=BoardParticipant.Role.owner)
+
+
+def add_categories(user, board: Board, size: int) -> None:
+    for _ in range(size):
+        CategoryFactory(user=UserFactory(), board=board)
+
+
+def add_goals(user, board: Board, size: int) -> None:
+    category = GoalCategory.objects.filter(board=board).first()
+    for _ in range(size):
+        GoalFactory(user=UserFactory(), category=category)
+
+
+def add_comments(user, board: Board, size: int) -> None:
+    goal = Goal.objects.filter(category__board=board).first()
+    for index in range(size):
+        GoalComment.objects.create(user=UserFactory(), goal=goal, text=f'Comment {index}')
+
+
+def add_participants(user, board: Board, size: int) -> None:
+    for _ in range(size):
+        BoardParticipant.objects.create(user=UserFactory(), board=board, role=BoardParticipant.Role.reader)
+
+
+@pytest.mark.django_db
+class TestQueryCount:
+    @pytest.mark.parametrize(
+        'url, add_rows',
+        [
+            ('/goals/board/list?limit=100', add_boards),
+            ('/goals/goal_category/list?limit=100', add_categories),
+            ('/goals/goal/list?limit=100', add_goals),
+            ('/goals/goal_comment/list?limit=100', add_comments),
+            ('/goals/board/{board_id}', add_participants),
+        ],
+    )
+    def test_query_count_does_not_grow(self, authenticated_user: dict, url: str, add_rows):
+        """
+        Тест неизменности количества запросов к БД при росте размера страницы.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        board = Board.objects.filter(participants__user=user).first()
+        url = url.format(board_id=board.id)
+
+        add_rows(user, board, 2)
+        count_queries(client, url)
+        expected = count_queries(client, url)
+
+        add_rows(user, board, 10)
+        count_queries(client, url)
+        assert count_queries(client, url) == expected
+
+    def test_board_update_touches_only_changed_participants(self, authenticated_user: dict):
+        """
+        Тест обновления участников доски: неизмененные участники не пересоздаются,
+        а количество запросов не зависит от размера доски.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        board = Board.objects.filter(participants__user=user).first()
+
+        def put(participants: list) -> int:
+            payload = {'title': 'Board', 'participants': [
+                {'user': participant.user.username, 'role': participant.role} for participant in participants
+            ]}
+            with CaptureQueriesContext(connection) as context:
+                response = client.put(f'/goals/board/{board.id}', payload, content_type='application/json')
+            assert response.status_code == 200
+            return len(context.captured_queries)
+
+        add_participants(user, board, 3)
+        participants = list(BoardParticipant.objects.filter(board=board).exclude(user=user).select_related('user'))
+        put(participants)
+        expected = put(participants)
+
+        add_participants(user, board, 20)
+        participants = list(BoardParticipant.objects.filter(board=board).exclude(user=user).select_related('user'))
+        created = {participant.id: participant.created for participant in participants}
+        assert put(participants) == expected
+
+        participants[0].role = BoardParticipant.Role.writer
+        new_participant = BoardParticipant(user=UserFactory(), role=BoardParticipant.Role.reader)
+        put(participants[:-1] + [new_participant])
+
+        rows = {participant.user_id: participant for participant in BoardParticipant.objects.filter(board=board)}
+        assert rows[participants[0].user_id].role == BoardParticipant.Role.writer
+        assert participants[-1].user_id not in rows
+        assert new_participant.user.id in rows
+        assert all(rows[p.user_id].created == created[p.id] for p in participants[:-1])
@@ -0,0 +1,46 @@
+import datetime
+
+import pytest
+
+from goals.models import Goal, GoalCategory, GoalComment
+from tests.factories import GoalFactory
+
+
+@pytest.mark.django_db
+class TestValuesReader:
+    @pytest.mark.parametrize(
+        'url',
+        [
+            '/goals/goal/list',
+            '/goals/goal/list?limit=3&offset=1&ordering=-created',
+            '/goals/goal/list?pagination=cursor&limit=2',
+            '/goals/goal/list?search=report',
+            '/goals/goal_category/list?limit=10',
+            '/goals/goal_comment/list',
+            '/goals/goal_comment/list?pagination=cursor&limit=1',
+        ],
+    )
+    def test_output_matches_serializer(self, authenticated_user: dict, monkeypatch, url: str):
+        """
+        Тест побайтового совпадения быстрого чтения списка с выводом сериализатора.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        category = GoalCategory.objects.filter(user=user).first()
+        GoalFactory(
+            user=user,
+            category=category,
+            title='Quarterly report',
+            description='Текст с "кавычками"',
+            due_date=datetime.date(2024, 2, 29),
+            status=Goal.Status.in_progress,
+        )
+        for goal in Goal.objects.filter(user=user):
+            GoalComment.objects.create(user=user, goal=goal, text=f'Comment to {goal.title}')
+
+        fast = client.get(url)
+        monkeypatch.setattr('goals.readers.get_values_reader', lambda serializer_class: None)
+        expected = client.get(url)
+
+        assert fast.status_code == 200
+        assert fast.content == expected.content
@@ -0,0 +1,80 @@
+import pytest
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from goals.models import Goal, GoalCategory
+from todolist.db.middleware import PIN_COOKIE
+from todolist.db.router import ReplicaRouter, read_from_replicas
+
+
+@pytest.fixture
+def replica(settings):
+    settings.DATABASE_REPLICAS = ['replica']
+    return connections['replica']
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+def test_reads_from_replica_until_own_write(authenticated_user, replica):
+    client = authenticated_user.get('client')
+    user = authenticated_user.get('user')
+    # На реплику скопированы только пользователь и его сессия, целей на ней нет
+    user.save(using='replica')
+    Session.objects.get(session_key=client.session.session_key).save(using='replica')
+
+    with CaptureQueriesContext(replica) as replica_queries:
+        response = client.get('/goals/goal/list')
+    assert response.status_code == 200
+    assert response.json() == []
+    assert replica_queries
+
+    category = GoalCategory.objects.filter(user=user).first()
+    response = client.post(
+        '/goals/goal/create', {'title': 'New goal', 'category': category.id}, content_type='application/json'
+    )
+    assert response.status_code == 201
+    goal_id = response.json()['id']
+
+    # После своего изменения клиент читает из основной БД и сразу видит новую цель
+    with CaptureQueriesContext(replica) as replica_queries:
+        response = client.get('/goals/goal/list')
+    assert not replica_queries
+    assert goal_id in {goal['id'] for goal in response.json()}
+    assert len(response.json()) == Goal.objects.filter(user=user).count()
+
+    # Закрепление хранится в подписанной cookie, а не в кеше процесса: другой процесс API его тоже видит
+    cache.clear()
+    assert goal_id in {goal['id'] for goal in client.get('/goals/goal/list').json()}
+
+    # Подделанная или истекшая cookie не закрепляет клиента, чтение снова идет с реплики
+    client.cookies[PIN_COOKIE] = '1'
+    assert client.get('/goals/goal/list').json() == []
+    del client.cookies[PIN_COOKIE]
+    assert client.get('/goals/goal/list').json() == []
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+def test_authorization_pin_in_shared_cache(authenticated_user, replica, settings):
+    settings.SHARED_CACHE = True
+    client = authenticated_user.get('client')
+    # Запросы аутентифицированы сессией, заголовок Authorization только определяет ключ закрепления
+    client.post('/goals/goal/create', {}, content_type='application/json', HTTP_AUTHORIZATION='Basic dGVzdDp0ZXN0')
+    client.cookies.pop(PIN_COOKIE)
+
+    with CaptureQueriesContext(replica) as replica_queries:
+        client.get('/goals/goal/list', HTTP_AUTHORIZATION='Basic dGVzdDp0ZXN0')
+    assert not replica_queries
+    # Клиент с другим заголовком не закреплен
+    with CaptureQueriesContext(replica) as replica_queries:
+        client.get('/goals/goal/list', HTTP_AUTHORIZATION='Basic b3RoZXI6b3RoZXI=')
+    assert replica_queries
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+def test_router_reads_from_replicas_only_in_context(replica):
+    router = ReplicaRouter()
+    assert router.db_for_read(Goal) is None
+    with read_from_replicas():
+        assert router.db_for_read(Goal) == 'replica'
+        assert router.db_for_write(Goal) == 'default'
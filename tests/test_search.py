@@ -0,0 +1,86 @@
+import pytest
+from django.db import connection
+from django.test import RequestFactory
+from rest_framework import filters
+from rest_framework.request import Request
+
+from goals.models import Goal, GoalCategory
+from goals.search import FullTextSearchFilter, InvertedIndex
+from goals.views.goals import GoalListView
+
+
+@pytest.mark.django_db
+class TestFullTextSearch:
+    def test_goal_search_ranked(self, authenticated_user: dict, monkeypatch):
+        """
+        Тест поиска целей: совпадение в названии выше совпадения в описании.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        category = GoalCategory.objects.filter(user=user).first()
+        in_description = Goal.objects.create(title='Buy food', description='after running', user=user, category=category)
+        in_title = Goal.objects.create(title='Running shoes', user=user, category=category)
+        Goal.objects.create(title='Read a book', user=user, category=category)
+
+        response = client.get('/goals/goal/list?search=run')
+
+        assert response.status_code == 200
+        assert [item['id'] for item in response.data] == [in_title.id, in_description.id]
+
+        # Сортировка по названию отличается от сортировки по релевантности
+        response = client.get('/goals/goal/list?search=run&ordering=title')
+        assert [item['id'] for item in response.data] == [in_description.id, in_title.id]
+
+        # Параметр сортировки берется из OrderingFilter представления
+        monkeypatch.setattr(filters.OrderingFilter, 'ordering_param', 'sort')
+        response = client.get('/goals/goal/list?search=run&sort=title')
+        assert [item['id'] for item in response.data] == [in_description.id, in_title.id]
+
+    def test_category_search(self, authenticated_user: dict):
+        """
+        Тест поиска категорий по названию.
+        """
+        client = authenticated_user.get('client')
+        user = authenticated_user.get('user')
+        category = GoalCategory.objects.filter(user=user).first()
+        category.title = 'Домашние дела'
+        category.save()
+
+        response = client.get('/goals/goal_category/list?search=дело')
+
+        assert response.status_code == 200
+        assert [item['id'] for item in response.data] == [category.id]
+
+    def test_search_uses_gin_index(self, authenticated_user: dict):
+        """
+        Тест совпадения выражения поиска с выражением GIN-индекса.
+        """
+        user = authenticated_user.get('user')
+        request = Request(RequestFactory().get('/goals/goal/list', {'search': 'goal'}))
+        request.user = user
+        view = GoalListView(request=request)
+        queryset = FullTextSearchFilter().filter_queryset(request, Goal.objects.all(), view)
+
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+            plan = queryset.explain()
+            cursor.execute('SET enable_seqscan = on')
+
+        assert 'goal_search_idx' in plan
+
+
+class TestInvertedIndex:
+    def test_search(self):
+        """
+        Тест инвертированного индекса, используемого на БД без полнотекстового поиска.
+        """
+        rows = [
+            (1, {'title': 'Running shoes', 'description': ''}),
+            (2, {'title': 'Buy food', 'description': 'after running'}),
+            (3, {'title': 'Running club', 'description': 'running every day'}),
+        ]
+        index = InvertedIndex(rows, {'title': 1.0, 'description': 0.4})
+
+        assert index.search('run') == {1: 1.0, 2: 0.4, 3: 1.4}
+        assert index.search('running day') == {3: 1.4 + 0.4}
+        assert index.search('swim') == {}
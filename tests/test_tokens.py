@@ -0,0 +1,155 @@
+import jwt
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import AuthenticationFailed
+
+from core import tokens as token_module
+from core.tokens import TokenRevoked, decode_token, issue_tokens, refresh_tokens, revoke_token, revoked_token_key
+
+
+@pytest.fixture
+def tokens(authenticated_user) -> dict:
+    response = Client().post(
+        '/core/token',
+        {'username': authenticated_user['user'].username, 'password': authenticated_user['password']},
+        content_type='application/json',
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def bearer(token: str) -> dict:
+    return {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+
+
+@pytest.mark.django_db
+def test_access_token_verified_without_db(shared_cache, authenticated_user, tokens):
+    client = Client()
+    assert client.get('/core/profile', **bearer(tokens['access'])).data['id'] == authenticated_user['user'].id
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get('/core/profile', **bearer(tokens['access']))
+    assert response.status_code == 200
+    assert len(queries) == 0
+
+    assert client.get('/core/profile', **bearer(tokens['refresh'])).status_code == 401
+    assert client.get('/core/profile', **bearer('broken')).status_code == 401
+
+
+@pytest.mark.django_db
+def test_invalid_credentials(authenticated_user):
+    response = Client().post(
+        '/core/token',
+        {'username': authenticated_user['user'].username, 'password': 'wrong_password'},
+        content_type='application/json',
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_expired_access_token(settings, authenticated_user):
+    settings.JWT_ACCESS_LIFETIME = -1
+    response = Client().post(
+        '/core/token',
+        {'username': authenticated_user['user'].username, 'password': authenticated_user['password']},
+        content_type='application/json',
+    )
+    response = Client().get('/core/profile', **bearer(response.json()['access']))
+    assert response.status_code == 401
+    assert response.data['detail'] == 'Token has expired'
+
+
+@pytest.mark.django_db
+def test_refresh_rotation_and_reuse(tokens):
+    client = Client()
+    response = client.post('/core/token/refresh', {'refresh': tokens['refresh']}, content_type='application/json')
+    assert response.status_code == 200
+    rotated = response.json()
+    assert client.get('/core/profile', **bearer(rotated['access'])).status_code == 200
+
+    # Повторное использование старого refresh-токена отзывает все токены пользователя
+    response = client.post('/core/token/refresh', {'refresh': tokens['refresh']}, content_type='application/json')
+    assert response.status_code == 401
+    response = client.post('/core/token/refresh', {'refresh': rotated['refresh']}, content_type='application/json')
+    assert response.status_code == 401
+    assert client.get('/core/profile', **bearer(rotated['access'])).status_code == 401
+
+
+@pytest.mark.django_db
+def test_refresh_twice_with_same_token(tokens):
+    first = refresh_tokens(tokens['refresh'])
+    with pytest.raises(TokenRevoked):
+        refresh_tokens(tokens['refresh'])
+    with pytest.raises(AuthenticationFailed):
+        refresh_tokens(first['refresh'])
+
+
+@pytest.mark.django_db
+def test_concurrent_refresh_detected_as_reuse(tokens, monkeypatch):
+    # Оба запроса проверили токен до того, как один из них его отозвал
+    monkeypatch.setattr(
+        token_module, 'decode_token',
+        lambda token, token_type: jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[token_module.ALGORITHM]),
+    )
+    first = refresh_tokens(tokens['refresh'])
+    with pytest.raises(TokenRevoked):
+        refresh_tokens(tokens['refresh'])
+    monkeypatch.undo()
+
+    response = Client().get('/core/profile', **bearer(first['access']))
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_revocations_stored_in_db_cache_without_shared_cache(tokens):
+    # Кеш в памяти процесса не общий для процессов API, поэтому отозванные токены хранятся в таблице кеша в БД
+    jti = jwt.decode(tokens['refresh'], options={'verify_signature': False})['jti']
+    refresh_tokens(tokens['refresh'])
+    assert caches['revocations'].get(revoked_token_key(jti))
+    assert caches['default'].get(revoked_token_key(jti)) is None
+
+
+@pytest.mark.django_db
+def test_revocations_not_evicted(authenticated_user):
+    # Отзывов больше, чем MAX_ENTRIES кеша Django по умолчанию (300): ранние записи не вытесняются
+    user = authenticated_user['user']
+    refresh = [issue_tokens(user)['refresh'] for _ in range(20)]
+    for token in refresh:
+        revoke_token(decode_token(token, 'refresh'))
+    for _ in range(400):
+        revoke_token(decode_token(issue_tokens(user)['access'], 'access'))
+
+    for token in refresh:
+        with pytest.raises(TokenRevoked):
+            decode_token(token, 'refresh')
+
+
+@pytest.mark.django_db
+def test_revoke(tokens):
+    client = Client()
+    response = client.post(
+        '/core/token/revoke', {'refresh': tokens['refresh']}, content_type='application/json', **bearer(tokens['access'])
+    )
+    assert response.status_code == 204
+    assert client.get('/core/profile', **bearer(tokens['access'])).status_code == 401
+    response = client.post('/core/token/refresh', {'refresh': tokens['refresh']}, content_type='application/json')
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_password_update_revokes_tokens(authenticated_user, tokens):
+    client = Client()
+    response = client.put(
+        '/core/update_password',
+        {'old_password': authenticated_user['password'], 'new_password': 'new_password1234'},
+        content_type='application/json',
+        **bearer(tokens['access']),
+    )
+    assert response.status_code == 200
+    assert client.get('/core/profile', **bearer(tokens['access'])).status_code == 401
+    response = client.post('/core/token/refresh', {'refresh': tokens['refresh']}, content_type='application/json')
+    assert response.status_code == 401
@@ -9,6 +9,7 @@ from goals.models import Board, BoardParticipant, Goal, GoalCategory
 
 @pytest.mark.django_db
 class TestCoreAuthentication:
+    @pytest.mark.django_db(reset_sequences=True)
     def test_core_signup(self):
         """
         Тест представления регистрации пользователя
@@ -0,0 +1,27 @@
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from todolist.db.pool import get_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Бэкенд PostgreSQL с пулом соединений (ENGINE = 'todolist.db').
+    Соединение берется из пула при первом запросе потока и возвращается в него при закрытии,
+    то есть после каждого HTTP-запроса или сообщения бота, поэтому потоки процесса делят POOL_SIZE соединений.
+    """
+
+    def get_new_connection(self, conn_params):
+        connection = get_pool(self.alias, self.settings_dict).acquire(
+            lambda: super(DatabaseWrapper, self).get_new_connection(conn_params)
+        )
+        # Для соединения из пула уровень изоляции заполняется так же, как при создании нового
+        if not hasattr(self, 'isolation_level'):
+            self.isolation_level = IsolationLevel(
+                self.settings_dict['OPTIONS'].get('isolation_level', IsolationLevel.READ_COMMITTED)
+            )
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            get_pool(self.alias, self.settings_dict).release(self.connection)
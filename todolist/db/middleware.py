@@ -0,0 +1,63 @@
+import hashlib
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+
+from todolist.db.router import read_from_replicas
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_COOKIE = 'replica_pin'
+PIN_SALT = 'todolist.db.middleware'
+
+
+def pin_key(request: HttpRequest) -> str | None:
+    """
+    Метод получения ключа закрепления в общем кеше для клиентов с заголовком Authorization, которые могут
+    не сохранять cookie.
+    :param request:
+    :return:
+    """
+    authorization = request.headers.get('Authorization')
+    if not authorization:
+        return None
+    return f'replica_pin:{hashlib.md5(authorization.encode()).hexdigest()}'
+
+
+class ReplicaMiddleware:
+    """
+    Безопасные запросы (GET, HEAD, OPTIONS) читают данные с реплик.
+    После изменяющего запроса клиент на REPLICA_PIN_SECONDS читает из основной БД, поэтому видит свои изменения,
+    даже если реплика еще отстает. Закрепление хранится в подписанной cookie, поэтому его видят все процессы API,
+    а при общем кеше (SHARED_CACHE) - также в кеше по заголовку Authorization.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        if request.method not in SAFE_METHODS:
+            response = self.get_response(request)
+            response.set_signed_cookie(
+                PIN_COOKIE, '1', salt=PIN_SALT, max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax'
+            )
+            key = pin_key(request)
+            if key and settings.SHARED_CACHE:
+                cache.set(key, True, settings.REPLICA_PIN_SECONDS)
+            return response
+
+        if self.pinned(request):
+            return self.get_response(request)
+        with read_from_replicas():
+            return self.get_response(request)
+
+    @staticmethod
+    def pinned(request: HttpRequest) -> bool:
+        if request.get_signed_cookie(PIN_COOKIE, default=None, salt=PIN_SALT, max_age=settings.REPLICA_PIN_SECONDS):
+            return True
+        key = pin_key(request)
+        return bool(key and settings.SHARED_CACHE and cache.get(key))
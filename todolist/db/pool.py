@@ -0,0 +1,147 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from django.db import OperationalError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, connection as Connection
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """
+    Пул соединений с PostgreSQL, общий для потоков процесса.
+    Одновременно открыто не больше max_size соединений: остальные потоки ждут освобождения до timeout секунд.
+    Соединение, простоявшее в пуле дольше check_interval секунд, перед выдачей проверяется запросом SELECT 1,
+    простоявшее дольше max_idle - закрывается.
+    """
+
+    def __init__(self, max_size: int, timeout: float = 30, check_interval: float = 10, max_idle: float = 600):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self.max_idle = max_idle
+        self.idle: deque[tuple[Connection, float]] = deque()
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(max_size)
+
+    @property
+    def stats(self) -> dict:
+        with self.lock:
+            idle = len(self.idle)
+        return {'max_size': self.max_size, 'idle': idle}
+
+    def acquire(self, connect: Callable[[], Connection]) -> Connection:
+        """
+        Метод получения соединения: последнего возвращенного в пул исправного или нового.
+        :param connect: Функция открытия нового соединения.
+        :return:
+        """
+        if not self.slots.acquire(timeout=self.timeout):
+            raise OperationalError(f'No free database connection in pool of {self.max_size} for {self.timeout}s')
+        try:
+            while True:
+                with self.lock:
+                    if not self.idle:
+                        break
+                    connection, released = self.idle.pop()
+                if self.is_usable(connection, time.monotonic() - released):
+                    return connection
+                self.discard(connection)
+            return connect()
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def release(self, connection: Connection) -> None:
+        """
+        Метод возврата соединения в пул. Незавершенная транзакция откатывается, сломанное соединение закрывается.
+        :param connection:
+        :return:
+        """
+        try:
+            if not connection.closed and connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+        except Exception:
+            logger.warning('Discarding database connection that failed to roll back', exc_info=True)
+            self.discard(connection)
+        else:
+            if connection.closed:
+                self.discard(connection)
+            else:
+                with self.lock:
+                    self.idle.append((connection, time.monotonic()))
+        finally:
+            self.slots.release()
+
+    def is_usable(self, connection: Connection, idle_for: float) -> bool:
+        if connection.closed or idle_for > self.max_idle:
+            return False
+        if idle_for <= self.check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def discard(connection: Connection) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close_all(self) -> None:
+        """
+        Метод закрытия свободных соединений пула.
+        :return:
+        """
+        with self.lock:
+            idle, self.idle = self.idle, deque()
+        for connection, _ in idle:
+            self.discard(connection)
+
+
+_pools: dict[str, tuple[tuple, ConnectionPool]] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias: str, settings_dict: dict) -> ConnectionPool:
+    """
+    Метод получения пула подключения alias. При смене параметров подключения (например, переключении
+    на тестовую БД) свободные соединения старого пула закрываются и создается новый.
+    :param alias:
+    :param settings_dict: Настройки подключения: POOL_SIZE, POOL_TIMEOUT, POOL_CHECK_INTERVAL, POOL_MAX_IDLE.
+    :return:
+    """
+    key = tuple(settings_dict.get(name) for name in ('NAME', 'USER', 'HOST', 'PORT'))
+    with _pools_lock:
+        current = _pools.get(alias)
+        if current is not None and current[0] == key:
+            return current[1]
+        if current is not None:
+            current[1].close_all()
+        pool = ConnectionPool(
+            max_size=settings_dict['POOL_SIZE'],
+            timeout=settings_dict.get('POOL_TIMEOUT', 30),
+            check_interval=settings_dict.get('POOL_CHECK_INTERVAL', 10),
+            max_idle=settings_dict.get('POOL_MAX_IDLE', 600),
+        )
+        _pools[alias] = (key, pool)
+        return pool
+
+
+def close_pool(alias: str) -> None:
+    """
+    Метод закрытия свободных соединений и удаления пула подключения alias.
+    :param alias:
+    :return:
+    """
+    with _pools_lock:
+        current = _pools.pop(alias, None)
+    if current is not None:
+        current[1].close_all()
@@ -0,0 +1,43 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_use_replicas: ContextVar[bool] = ContextVar('use_replicas', default=False)
+
+
+@contextmanager
+def read_from_replicas(enabled: bool = True) -> Iterator[None]:
+    """
+    Контекст, в котором чтение моделей идет с реплик (DATABASE_REPLICAS).
+    Вне контекста все запросы идут в основную БД.
+    :param enabled: False - чтение из основной БД внутри контекста реплик, например для заполнения кеша.
+    """
+    token = _use_replicas.set(enabled)
+    try:
+        yield
+    finally:
+        _use_replicas.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Маршрутизация запросов: запись - всегда в основную БД, чтение - на случайную реплику,
+    если оно выполняется в контексте read_from_replicas.
+    """
+
+    def db_for_read(self, model, **hints) -> str | None:
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas or not _use_replicas.get():
+            return None
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints) -> str:
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        # Реплики содержат те же данные, что и основная БД
+        return True
@@ -33,14 +33,30 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'core.tokens.JWTAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
+    ],
 }
 
+# Токены для мобильных клиентов и скриптов (core/token): подписываются JWT_SECRET_KEY, время жизни в секундах
+JWT_SECRET_KEY = env.str('JWT_SECRET_KEY', default=SECRET_KEY)
+JWT_ACCESS_LIFETIME = env.int('JWT_ACCESS_LIFETIME', default=5 * 60)
+JWT_REFRESH_LIFETIME = env.int('JWT_REFRESH_LIFETIME', default=14 * 24 * 60 * 60)
+# Псевдоним кеша отозванных токенов; по умолчанию default при общем кеше, иначе revocations (core.tokens.revocations)
+JWT_REVOCATION_CACHE = env.str('JWT_REVOCATION_CACHE', default='')
+# Размер таблицы revocations: должен превышать число отзывов за JWT_REFRESH_LIFETIME, иначе при переполнении
+# Django удалит и действующие записи. Истекшие записи удаляются первыми
+JWT_REVOCATION_MAX_ENTRIES = env.int('JWT_REVOCATION_MAX_ENTRIES', default=1000000)
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'todolist.db.middleware.ReplicaMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.auth.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -74,9 +90,67 @@ DATABASES = {
         'PASSWORD': env.str('POSTGRES_PASSWORD'),
         'HOST': env.str('POSTGRES_HOST', default='127.0.0.1'),
         'PORT': '5432',
-
+        # Соединение потока переиспользуется между запросами и проверяется перед повторным использованием
+        'CONN_MAX_AGE': env.int('POSTGRES_CONN_MAX_AGE', default=60),
+        'CONN_HEALTH_CHECKS': True,
+        # Пул соединений, общий для потоков процесса (todolist.db): 0 - пул выключен
+        'POOL_SIZE': env.int('POSTGRES_POOL_SIZE', default=0),
+        'POOL_TIMEOUT': env.int('POSTGRES_POOL_TIMEOUT', default=30),
     }
 }
+if DATABASES['default']['POOL_SIZE']:
+    # Соединения возвращаются в пул после каждого запроса, а не держатся потоком
+    DATABASES['default'].update(ENGINE='todolist.db', CONN_MAX_AGE=0)
+
+# Реплики только для чтения: безопасные HTTP-запросы читают с них (todolist.db.router), запись идет в default.
+# В тестах реплики указывают на тестовую БД default
+DATABASE_REPLICAS = []
+for index, host in enumerate(env.list('POSTGRES_REPLICA_HOSTS', default=[])):
+    DATABASES[f'replica_{index}'] = {**DATABASES['default'], 'HOST': host, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(f'replica_{index}')
+DATABASE_ROUTERS = ['todolist.db.router.ReplicaRouter']
+# Сколько секунд после изменяющего запроса клиент читает из основной БД, чтобы видеть свои изменения
+REPLICA_PIN_SECONDS = env.int('REPLICA_PIN_SECONDS', default=10)
+
+# В docker-compose кеш default - Redis, общий для всех процессов API и бота.
+# LocMemCache (по умолчанию при локальном запуске) у каждого процесса свой
+CACHES = {
+    'default': {
+        'BACKEND': env.str('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': env.str('CACHE_LOCATION', default=''),
+    },
+    # Отозванные токены: отдельная таблица, чтобы записи не вытеснялись другими данными кеша до истечения токенов
+    'revocations': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'todolist_revocations',
+        'OPTIONS': {'MAX_ENTRIES': JWT_REVOCATION_MAX_ENTRIES},
+    },
+}
+SHARED_CACHE = env.bool('SHARED_CACHE', default='LocMemCache' not in CACHES['default']['BACKEND'])
+
+# Сессии читаются из общего кеша и записываются также в БД, поэтому переживают очистку кеша.
+# Кеш в памяти процесса не видит выхода и смены пароля в других процессах: сессии и пользователи тогда не кешируются
+SESSION_ENGINE = env.str(
+    'SESSION_ENGINE',
+    default='django.contrib.sessions.backends.cached_db' if SHARED_CACHE else 'django.contrib.sessions.backends.db',
+)
+USER_CACHE_TIMEOUT = env.int('USER_CACHE_TIMEOUT', default=15 * 60)
+
+# Сброс ролей при изменении участников виден другим процессам только через общий кеш,
+# с кешем в памяти процесса устаревшие роли живут не дольше нескольких секунд
+BOARD_ROLES_CACHE_TIMEOUT = env.int('BOARD_ROLES_CACHE_TIMEOUT', default=60 * 60 if SHARED_CACHE else 10)
+
+REPRESENTATION_CACHE_SIZE = env.int('REPRESENTATION_CACHE_SIZE', default=10000)
+REPRESENTATION_CACHE_LOG_EVERY = env.int('REPRESENTATION_CACHE_LOG_EVERY', default=10000)
+
+GOALS_BULK_MAX_SIZE = env.int('GOALS_BULK_MAX_SIZE', default=500)
+GOALS_ARCHIVE_BATCH_SIZE = env.int('GOALS_ARCHIVE_BATCH_SIZE', default=1000)
+GOALS_ARCHIVE_SYNC_LIMIT = env.int('GOALS_ARCHIVE_SYNC_LIMIT', default=1000)
+GOALS_EXPORT_CHUNK_SIZE = env.int('GOALS_EXPORT_CHUNK_SIZE', default=2000)
+GOALS_IMPORT_DIR = env.str('GOALS_IMPORT_DIR', default=str(BASE_DIR.joinpath('imports')))
+GOALS_IMPORT_BATCH_SIZE = env.int('GOALS_IMPORT_BATCH_SIZE', default=5000)
+GOALS_IMPORT_SYNC_LIMIT = env.int('GOALS_IMPORT_SYNC_LIMIT', default=1024 * 1024)
+GOALS_IMPORT_MAX_ERRORS = env.int('GOALS_IMPORT_MAX_ERRORS', default=100)
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -149,6 +223,28 @@ LOGGING = {
 }
 
 BOT_TOKEN = env('BOT_TOKEN')
+BOT_API_URL = env.str('BOT_API_URL', default='https://api.telegram.org')
+BOT_WORKERS = env.int('BOT_WORKERS', default=8)
+BOT_STATE_STORE = env.str('BOT_STATE_STORE', default='cache')
+# Псевдоним кеша состояния диалогов; по умолчанию bot_state - отдельная таблица в БД, общая для процессов бота
+BOT_STATE_CACHE = env.str('BOT_STATE_CACHE', default='bot_state')
+BOT_STATE_TTL = env.int('BOT_STATE_TTL', default=60 * 60)
+BOT_STATE_MAX_SIZE = env.int('BOT_STATE_MAX_SIZE', default=10000)
+# Отдельная таблица, чтобы состояние диалогов не вытеснялось другими данными кеша
+CACHES['bot_state'] = {
+    'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+    'LOCATION': 'todolist_bot_state',
+    'TIMEOUT': BOT_STATE_TTL,
+    'OPTIONS': {'MAX_ENTRIES': BOT_STATE_MAX_SIZE},
+}
+BOT_HTTP_POOL_SIZE = env.int('BOT_HTTP_POOL_SIZE', default=BOT_WORKERS)
+BOT_HTTP_RETRIES = env.int('BOT_HTTP_RETRIES', default=3)
+BOT_HTTP_BACKOFF = env.float('BOT_HTTP_BACKOFF', default=0.5)
+BOT_HTTP_TIMEOUT = env.float('BOT_HTTP_TIMEOUT', default=10)
+BOT_OUTBOX_WORKERS = env.int('BOT_OUTBOX_WORKERS', default=BOT_WORKERS)
+BOT_OUTBOX_GLOBAL_RATE = env.float('BOT_OUTBOX_GLOBAL_RATE', default=30)
+BOT_OUTBOX_CHAT_INTERVAL = env.float('BOT_OUTBOX_CHAT_INTERVAL', default=1)
+BOT_OUTBOX_RETRIES = env.int('BOT_OUTBOX_RETRIES', default=3)
 
 SPECTACULAR_SETTINGS = {
     'TITLE': 'ToDoList API',